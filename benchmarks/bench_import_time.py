@@ -0,0 +1,113 @@
+"""
+导入耗时检查
+
+用 python -X importtime 在子进程中导入 main（或指定模块），统计累计导入耗时，
+并检查是否提前加载了应当延迟导入的模块（requests、yaml、pytz、smtplib 等）。
+超出耗时预算或提前加载了延迟模块时以非零状态退出，可用于 CI。
+
+用法：
+    python benchmarks/bench_import_time.py [--module main] [--budget-ms 50] [--repeat 5]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# 导入 main 时不应加载的模块（只在爬取、发送通知或读取配置时才需要）
+DEFERRED_MODULES = ("requests", "yaml", "pytz", "smtplib", "email.mime.text", "webbrowser")
+
+
+def measure(module: str) -> Tuple[Dict[str, int], List[str]]:
+    """
+    在子进程中导入模块并解析 -X importtime 输出
+
+    Args:
+        module: 模块名
+
+    Returns:
+        ({模块名: 累计耗时(微秒)}, 已加载的延迟模块列表)，
+        耗时只包含该模块本身及由它导入的模块（不含解释器启动时导入的 site 等）
+    """
+    code = (
+        f"import sys, {module}\n"
+        f"print(','.join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))"
+    )
+    # 允许写入字节码缓存，测量的是定时任务反复启动时的常规情况
+    env = {k: v for k, v in os.environ.items() if k != "PYTHONDONTWRITEBYTECODE"}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    # 输出按导入完成顺序排列，子模块在父模块之前且缩进更深；
+    # 顶层模块之前、上一个顶层模块之后的行都是它导入的模块
+    cumulative = {}
+    pending = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or line.count("|") != 2:
+            continue
+        _, cum, name = line.split("|")
+        if not cum.strip().isdigit():
+            continue
+        if name.startswith("  "):
+            pending[name.strip()] = int(cum)
+            continue
+        if name.strip() == module:
+            cumulative = dict(pending, **{module: int(cum)})
+        pending = {}
+
+    loaded = proc.stdout.strip().splitlines()[-1] if proc.stdout.strip() else ""
+    return cumulative, [m for m in loaded.split(",") if m]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="导入耗时检查")
+    parser.add_argument("--module", default="main", help="要导入的模块，默认 main")
+    parser.add_argument("--budget-ms", type=float, default=50.0, help="累计导入耗时预算（毫秒）")
+    parser.add_argument("--repeat", type=int, default=5, help="重复次数（取最快一次）")
+    parser.add_argument("--top", type=int, default=10, help="显示耗时最多的模块数")
+    args = parser.parse_args()
+
+    # 预热一次，生成字节码缓存
+    measure(args.module)
+
+    best = None
+    for _ in range(args.repeat):
+        cumulative, loaded = measure(args.module)
+        total = cumulative.get(args.module, 0)
+        if best is None or total < best[0]:
+            best = (total, cumulative, loaded)
+
+    total, cumulative, loaded = best
+    print(f"import {args.module}: {total / 1000:.1f} ms（预算 {args.budget_ms:g} ms，{args.repeat} 次取最快）\n")
+
+    top = sorted(
+        ((name, us) for name, us in cumulative.items() if name != args.module),
+        key=lambda item: -item[1]
+    )[:args.top]
+    for name, us in top:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+
+    failed = False
+    if total / 1000 > args.budget_ms:
+        print(f"\n超出预算: {total / 1000:.1f} ms > {args.budget_ms:g} ms")
+        failed = True
+    if loaded:
+        print(f"\n提前加载了延迟导入的模块: {', '.join(loaded)}")
+        failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
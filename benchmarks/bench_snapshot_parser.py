@@ -0,0 +1,138 @@
+"""
+快照解析基准测试
+
+对比旧的整文件读取 + split 解析方式与 trendradar_core 的流式解析，
+数据为 output/ 下的全部快照文件。
+
+用法：
+    python benchmarks/bench_snapshot_parser.py [--project-root .] [--repeat 5]
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import trendradar_core.snapshot as snapshot  # noqa: E402
+from trendradar_core import parse_snapshot  # noqa: E402
+
+
+class _Item:
+    __slots__ = ("ranks", "url", "mobile_url")
+
+    def __init__(self, ranks, url, mobile_url):
+        self.ranks = ranks
+        self.url = url
+        self.mobile_url = mobile_url
+
+
+def legacy_parse(file_path: Path):
+    """旧实现：read() 整个文件后按空行切分，每行多次 split/rsplit"""
+    titles_by_id = {}
+    id_to_name = {}
+
+    with open(file_path, "r", encoding="utf-8") as f:
+        content = f.read()
+        sections = content.split("\n\n")
+
+        for section in sections:
+            if not section.strip() or "==== 以下ID请求失败 ====" in section:
+                continue
+
+            lines = section.strip().split("\n")
+            if len(lines) < 2:
+                continue
+
+            header_line = lines[0].strip()
+            if " | " in header_line:
+                parts = header_line.split(" | ", 1)
+                source_id = parts[0].strip()
+                id_to_name[source_id] = parts[1].strip()
+            else:
+                source_id = header_line
+                id_to_name[source_id] = source_id
+
+            titles_by_id[source_id] = {}
+
+            for line in lines[1:]:
+                if not line.strip():
+                    continue
+                title_part = line.strip()
+                rank = None
+
+                if ". " in title_part and title_part.split(". ")[0].isdigit():
+                    rank_str, title_part = title_part.split(". ", 1)
+                    rank = int(rank_str)
+
+                mobile_url = ""
+                if " [MOBILE:" in title_part:
+                    title_part, mobile_part = title_part.rsplit(" [MOBILE:", 1)
+                    if mobile_part.endswith("]"):
+                        mobile_url = mobile_part[:-1]
+
+                url = ""
+                if " [URL:" in title_part:
+                    title_part, url_part = title_part.rsplit(" [URL:", 1)
+                    if url_part.endswith("]"):
+                        url = url_part[:-1]
+
+                title = re.sub(r"\s+", " ", title_part.strip()).strip()
+                ranks = [rank] if rank is not None else [1]
+                titles_by_id[source_id][title] = _Item(ranks, url, mobile_url)
+
+    return titles_by_id, id_to_name
+
+
+def streaming_parse(file_path: Path):
+    return parse_snapshot(file_path, _Item)
+
+
+def run(name, parse, files, repeat):
+    best = None
+    titles = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        titles = 0
+        for file_path in files:
+            titles_by_id, _ = parse(file_path)
+            titles += sum(len(items) for items in titles_by_id.values())
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    print(f"{name:<20} {best * 1000:9.1f} ms  {titles / best:12,.0f} titles/s")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="快照解析基准测试")
+    parser.add_argument("--project-root", default=".", help="项目根目录（包含 output/）")
+    parser.add_argument("--repeat", type=int, default=5, help="重复次数（取最快一次）")
+    args = parser.parse_args()
+
+    files = sorted(Path(args.project_root).glob("output/*/txt/*.txt"))
+    if not files:
+        print("output/ 下没有快照文件")
+        return 1
+
+    size = sum(f.stat().st_size for f in files)
+    print(f"{len(files)} 个快照文件，共 {size / 1024 / 1024:.1f} MB，重复 {args.repeat} 次取最快\n")
+
+    legacy = run("legacy split", legacy_parse, files, args.repeat)
+    streaming = run("streaming", streaming_parse, files, args.repeat)
+
+    threshold = snapshot.MMAP_THRESHOLD
+    snapshot.MMAP_THRESHOLD = 1
+    try:
+        mmapped = run("streaming (mmap)", streaming_parse, files, args.repeat)
+    finally:
+        snapshot.MMAP_THRESHOLD = threshold
+
+    print(f"\nstreaming: {legacy / streaming:.2f}x, mmap: {legacy / mmapped:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
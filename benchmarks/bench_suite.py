@@ -0,0 +1,373 @@
+"""
+热点路径基准测试套件
+
+用合成数据（见 synthetic.py）测量爬虫和 MCP 服务器的主要热点路径：
+
+- main.py: parse_file_titles、read_all_today_titles、detect_latest_new_titles、
+  count_word_frequency（三种模式）、render_html_content、各推送格式的 split_content_into_batches
+- MCP: ParserService 读取日数据（冷启动 / 磁盘缓存 / 内存缓存）、SearchTools 搜索、AnalyticsTools 分析
+
+结果写入 JSON（默认 benchmarks/results/<时间>.json），可用 --compare 与之前的结果对比。
+
+用法：
+    python benchmarks/bench_suite.py [--platforms 11] [--snapshots 24] [--days 3] [--titles 50] [--word-groups 20]
+    python benchmarks/bench_suite.py --data /tmp/trendradar-synthetic --repeat 10 --compare benchmarks/results/上次.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager, redirect_stdout
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from synthetic import generate_dataset  # noqa: E402
+
+
+RESULTS_DIR = PROJECT_ROOT / "benchmarks" / "results"
+
+# 结果文件格式版本
+RESULT_VERSION = 1
+
+SPLIT_FORMATS = ("feishu", "dingtalk", "wework", "telegram", "ntfy", "bark", "slack")
+
+QUERY = "华为"
+FUZZY_QUERY = "华为发布新款手机"
+
+
+@contextmanager
+def quiet():
+    """丢弃 with 块内的标准输出（被测函数会打印进度日志）"""
+    with open(os.devnull, "w", encoding="utf-8") as devnull, redirect_stdout(devnull):
+        yield
+
+
+class Suite:
+    """基准测试集合：逐项计时并收集结果"""
+
+    def __init__(self, repeat: int, only: Optional[str] = None):
+        self.repeat = repeat
+        self.only = only
+        self.results: List[Dict] = []
+
+    def bench(
+        self,
+        name: str,
+        func: Callable,
+        setup: Optional[Callable] = None,
+        items: Optional[int] = None,
+    ) -> None:
+        """
+        重复执行并记录耗时（被测函数的输出被丢弃）
+
+        Args:
+            name: 测试项名称
+            func: 被测函数
+            setup: 每次执行前调用（不计入耗时）
+            items: 每次执行处理的条目数（用于计算吞吐量）
+        """
+        if self.only and self.only not in name:
+            return
+
+        times = []
+        error = None
+        with quiet():
+            for _ in range(self.repeat):
+                if setup:
+                    setup()
+                start = time.perf_counter()
+                try:
+                    check(func())
+                except Exception as e:
+                    error = f"{type(e).__name__}: {e}"
+                    break
+                times.append((time.perf_counter() - start) * 1000)
+
+        result = {"name": name, "runs": len(times)}
+        if times:
+            result.update(
+                first_ms=round(times[0], 3),
+                min_ms=round(min(times), 3),
+                median_ms=round(statistics.median(times), 3),
+                mean_ms=round(statistics.mean(times), 3),
+            )
+            if items:
+                result["items"] = items
+                result["items_per_second"] = round(items / (min(times) / 1000), 1)
+        if error:
+            result["error"] = error
+
+        self.results.append(result)
+        if error:
+            print(f"  {name:<58} 失败: {error}")
+        else:
+            print(
+                f"  {name:<58} {result['first_ms']:>10.2f} {result['min_ms']:>10.2f} "
+                f"{result['median_ms']:>10.2f}"
+            )
+
+
+def check(result):
+    """MCP 工具以 success=False 返回错误，视为测试失败"""
+    if isinstance(result, dict) and result.get("success") is False:
+        error = result.get("error") or {}
+        raise RuntimeError(error.get("message", error) if isinstance(error, dict) else error)
+    return result
+
+
+def bench_main(suite: Suite, root: Path, dates: List[str]) -> None:
+    """main.py 的热点路径（在数据目录下运行，当前时间模拟为最后一个快照的时间）"""
+    import pytz
+
+    with quiet():
+        import main
+
+        main.CONFIG.load()
+
+    last_date = datetime.strptime(dates[-1], "%Y-%m-%d")
+    files = sorted((root / "output" / last_date.strftime("%Y年%m月%d日") / "txt").glob("*.txt"))
+    last_time = datetime.strptime(files[-1].stem, "%H时%M分")
+    main.SIMULATED_TIME = pytz.timezone("Asia/Shanghai").localize(
+        last_date.replace(hour=last_time.hour, minute=last_time.minute)
+    )
+
+    platform_ids = [p["id"] for p in main.CONFIG["PLATFORMS"]]
+    rank_threshold = main.CONFIG["RANK_THRESHOLD"]
+
+    suite.bench(
+        "main.parse_file_titles",
+        lambda: [main.parse_file_titles(f) for f in files],
+        items=len(files),
+    )
+    suite.bench("main.read_all_today_titles", lambda: main.read_all_today_titles(platform_ids))
+    suite.bench("main.detect_latest_new_titles", lambda: main.detect_latest_new_titles(platform_ids))
+
+    with quiet():
+        all_results, id_to_name, title_info = main.read_all_today_titles(platform_ids)
+        new_titles = main.detect_latest_new_titles(platform_ids)
+        word_groups, filter_words, global_filters = main.load_frequency_words()
+
+    def count(mode):
+        return main.count_word_frequency(
+            all_results, word_groups, filter_words, id_to_name, title_info,
+            rank_threshold, new_titles, mode=mode, global_filters=global_filters,
+        )
+
+    for mode in ("daily", "current", "incremental"):
+        suite.bench(f"main.count_word_frequency[{mode}]", lambda mode=mode: count(mode))
+
+    with quiet():
+        stats, total_titles = count("daily")
+        report_data = main.prepare_report_data(stats, [], new_titles, id_to_name, "daily")
+
+    suite.bench(
+        "main.render_html_content",
+        lambda: main.render_html_content(report_data, total_titles, True, "daily", None),
+    )
+    for format_type in SPLIT_FORMATS:
+        suite.bench(
+            f"main.split_content_into_batches[{format_type}]",
+            lambda format_type=format_type: main.split_content_into_batches(
+                report_data, format_type, None, mode="daily"
+            ),
+        )
+
+
+def bench_mcp(suite: Suite, root: Path, dates: List[str]) -> None:
+    """MCP 服务器的解析服务和工具"""
+    from mcp_server.services.cache_service import get_cache
+    from mcp_server.services.parser_service import ParserService
+    from mcp_server.tools.analytics import AnalyticsTools
+    from mcp_server.tools.search_tools import SearchTools
+
+    parser = ParserService(str(root))
+    date_range = {"start": dates[0], "end": dates[-1]}
+
+    def clear_memory():
+        get_cache().clear()
+
+    def clear_all():
+        get_cache().clear()
+        shutil.rmtree(parser.parse_cache_dir, ignore_errors=True)
+
+    # 最后一天为今天时不写磁盘缓存，用前一天测量磁盘缓存
+    cached_date = datetime.strptime(dates[-2] if len(dates) > 1 else dates[-1], "%Y-%m-%d")
+    suite.bench(
+        "mcp.ParserService.read_all_titles_for_date[cold]",
+        lambda: parser.read_all_titles_for_date(cached_date),
+        setup=clear_all,
+    )
+    suite.bench(
+        "mcp.ParserService.read_all_titles_for_date[disk_cache]",
+        lambda: parser.read_all_titles_for_date(cached_date),
+        setup=clear_memory,
+    )
+    suite.bench(
+        "mcp.ParserService.read_all_titles_for_date[memory]",
+        lambda: parser.read_all_titles_for_date(cached_date),
+    )
+
+    clear_all()
+    search = SearchTools(str(root))
+    analytics = AnalyticsTools(str(root))
+
+    suite.bench(
+        "mcp.SearchTools.search_news_unified[keyword]",
+        lambda: search.search_news_unified(query=QUERY, date_range=date_range),
+    )
+    suite.bench(
+        "mcp.SearchTools.search_news_unified[fuzzy]",
+        lambda: search.search_news_unified(
+            query=FUZZY_QUERY, search_mode="fuzzy", date_range=date_range, threshold=0.4
+        ),
+    )
+    suite.bench(
+        "mcp.AnalyticsTools.analyze_topic_trend_unified[trend]",
+        lambda: analytics.analyze_topic_trend_unified(topic=QUERY, date_range=date_range),
+    )
+    suite.bench(
+        "mcp.AnalyticsTools.analyze_topic_trend_unified[lifecycle]",
+        lambda: analytics.analyze_topic_trend_unified(
+            topic=QUERY, analysis_type="lifecycle", date_range=date_range
+        ),
+    )
+    suite.bench(
+        "mcp.AnalyticsTools.analyze_data_insights_unified[platform_compare]",
+        lambda: analytics.analyze_data_insights_unified(topic=QUERY, date_range=date_range),
+    )
+    suite.bench(
+        "mcp.AnalyticsTools.analyze_data_insights_unified[keyword_cooccur]",
+        lambda: analytics.analyze_data_insights_unified(insight_type="keyword_cooccur"),
+    )
+
+
+def describe_data(root: Path) -> Dict:
+    """已有数据目录的描述（日期列表、文件数和大小）"""
+    day_dirs = sorted(p for p in (root / "output").glob("*/txt") if p.is_dir())
+    dates = [datetime.strptime(p.parent.name, "%Y年%m月%d日").strftime("%Y-%m-%d") for p in day_dirs]
+    files = [f for p in day_dirs for f in p.glob("*.txt")]
+    return {
+        "root": str(root),
+        "dates": dates,
+        "files": len(files),
+        "bytes": sum(f.stat().st_size for f in files),
+    }
+
+
+def git_commit() -> Optional[str]:
+    """当前代码版本（非 git 仓库时为 None）"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(previous_path: str, results: List[Dict]) -> None:
+    """与之前的结果对比中位数耗时"""
+    with open(previous_path, "r", encoding="utf-8") as f:
+        previous = {item["name"]: item for item in json.load(f)["results"]}
+
+    print(f"\n与 {previous_path} 对比（中位数，毫秒）:")
+    for item in results:
+        old = previous.get(item["name"])
+        if not old or "median_ms" not in old or "median_ms" not in item:
+            continue
+        ratio = item["median_ms"] / old["median_ms"] if old["median_ms"] else float("inf")
+        print(f"  {item['name']:<58} {old['median_ms']:>10.2f} → {item['median_ms']:>10.2f}  {ratio:6.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="热点路径基准测试套件")
+    parser.add_argument("--data", help="使用已有的数据目录（包含 output/ 和 config/），默认生成临时合成数据")
+    parser.add_argument("--platforms", type=int, default=11, help="平台数")
+    parser.add_argument("--snapshots", type=int, default=24, help="每天快照数")
+    parser.add_argument("--days", type=int, default=3, help="天数")
+    parser.add_argument("--titles", type=int, default=50, help="每个平台每次快照的标题数")
+    parser.add_argument("--word-groups", type=int, default=20, help="频率词组数")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    parser.add_argument("--repeat", type=int, default=5, help="每项重复次数")
+    parser.add_argument("--only", help="只运行名称包含该字符串的测试项")
+    parser.add_argument("--output", help="结果文件路径，默认 benchmarks/results/<时间>.json")
+    parser.add_argument("--compare", help="与之前的结果文件对比")
+    args = parser.parse_args()
+
+    temp_dir = None
+    if args.data:
+        root = Path(args.data).resolve()
+        dataset = describe_data(root)
+    else:
+        temp_dir = tempfile.mkdtemp(prefix="trendradar-bench-")
+        root = Path(temp_dir)
+        dataset = generate_dataset(
+            temp_dir,
+            platforms=args.platforms,
+            snapshots=args.snapshots,
+            days=args.days,
+            titles=args.titles,
+            word_groups=args.word_groups,
+            seed=args.seed,
+        )
+    if not dataset["dates"]:
+        print(f"数据目录中没有快照: {root / 'output'}")
+        return 1
+
+    print(
+        f"数据: {dataset['files']} 个快照文件（{dataset['bytes'] / 1024 / 1024:.1f} MB），"
+        f"日期 {dataset['dates'][0]} ~ {dataset['dates'][-1]}，每项重复 {args.repeat} 次\n"
+    )
+    print(f"  {'测试项':<55} {'首次':>8} {'最快':>8} {'中位数':>7}  (毫秒)")
+
+    suite = Suite(args.repeat, args.only)
+    cwd = os.getcwd()
+    try:
+        # main.py 使用相对路径（config/、output/），在数据目录下运行
+        os.chdir(root)
+        bench_main(suite, root, dataset["dates"])
+        bench_mcp(suite, root, dataset["dates"])
+    finally:
+        os.chdir(cwd)
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    report = {
+        "version": RESULT_VERSION,
+        "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "repeat": args.repeat,
+        "dataset": dataset,
+        "results": suite.results,
+    }
+
+    output_path = Path(args.output) if args.output else (
+        RESULTS_DIR / f"{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n结果已写入: {output_path}")
+
+    if args.compare:
+        compare(args.compare, suite.results)
+
+    return 1 if any("error" in item for item in suite.results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+"""
+newsnow 接口模拟服务器
+
+在本地模拟 https://newsnow.busiyi.world/api/s?id=<平台ID>&latest，数据来自
+output/<日期>/txt 下的快照：每个平台的第 k 次请求返回包含该平台的第 k 个快照
+（按时间顺序，播放完后从头循环），因此连续爬取时榜单会像真实接口一样变化。
+
+可注入的故障：
+- 延迟：每个请求等待 latency ± jitter 毫秒
+- 5xx：按概率返回 500/502/503
+- 超时：按概率等待 timeout-seconds 秒后才响应（应大于爬虫的请求超时）
+- 缓存：按概率返回 status: cache（数据与 success 相同）
+
+各类响应的计数可通过 GET /stats 查看，退出时也会打印。
+
+用法：
+    python benchmarks/mock_newsnow.py [--date 2025-11-15] [--port 8765] [--latency-ms 50] [--error-rate 0.1]
+    CRAWLER_API_URL=http://127.0.0.1:8765/api/s python main.py
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from trendradar_core import read_snapshot_records  # noqa: E402
+
+
+def load_boards(txt_dir: Path) -> Dict[str, List[List[Dict]]]:
+    """
+    读取一天的快照，按平台整理为榜单序列
+
+    Args:
+        txt_dir: 快照目录（output/<日期>/txt）
+
+    Returns:
+        {平台ID: [每个快照的条目列表（按排名排序）]}
+    """
+    boards: Dict[str, List[List[Dict]]] = {}
+    for file_path in sorted(txt_dir.glob("*.txt")):
+        sections: Dict[str, List] = {}
+        current_section = None
+        for section, source_id, _, title, rank, url, mobile_url in read_snapshot_records(file_path):
+            if section != current_section:
+                # 同一文件中同一平台出现多个段落时，以后一个为准
+                current_section = section
+                sections[source_id] = []
+            sections[source_id].append((rank, title, url, mobile_url))
+
+        for source_id, records in sections.items():
+            records.sort(key=lambda record: record[0])
+            boards.setdefault(source_id, []).append([
+                {"id": url or title, "title": title, "url": url, "mobileUrl": mobile_url}
+                for _, title, url, mobile_url in records
+            ])
+    return boards
+
+
+class MockNewsnow:
+    """模拟接口的数据和故障注入配置"""
+
+    def __init__(
+        self,
+        boards: Dict[str, List[List[Dict]]],
+        latency_ms: float = 0,
+        jitter_ms: float = 0,
+        error_rate: float = 0,
+        timeout_rate: float = 0,
+        timeout_seconds: float = 15,
+        cache_rate: float = 0,
+        seed: Optional[int] = None,
+    ):
+        self.boards = boards
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.timeout_rate = timeout_rate
+        self.timeout_seconds = timeout_seconds
+        self.cache_rate = cache_rate
+        self.rng = random.Random(seed)
+        self.cursors = Counter()
+        self.stats = Counter()
+        self._lock = Lock()
+
+    def respond(self, platform_id: str):
+        """
+        决定一次请求的结果
+
+        Returns:
+            (HTTP 状态码, 响应体字典, 响应前的等待秒数)
+        """
+        with self._lock:
+            roll = self.rng.random()
+            delay = max(0.0, self.latency_ms + self.rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+
+            if platform_id not in self.boards:
+                self.stats["not_found"] += 1
+                return 404, {"status": "error", "message": f"unknown source: {platform_id}"}, delay
+
+            if roll < self.timeout_rate:
+                self.stats["timeout"] += 1
+                return 504, {"status": "error", "message": "timeout"}, self.timeout_seconds
+            roll -= self.timeout_rate
+
+            if roll < self.error_rate:
+                self.stats["error"] += 1
+                code = self.rng.choice((500, 502, 503))
+                return code, {"status": "error", "message": f"injected {code}"}, delay
+            roll -= self.error_rate
+
+            status = "cache" if roll < self.cache_rate else "success"
+            self.stats[status] += 1
+
+            snapshots = self.boards[platform_id]
+            items = snapshots[self.cursors[platform_id] % len(snapshots)]
+            self.cursors[platform_id] += 1
+
+        body = {
+            "status": status,
+            "id": platform_id,
+            "updatedTime": int(time.time() * 1000),
+            "items": items,
+        }
+        return 200, body, delay
+
+
+class Handler(BaseHTTPRequestHandler):
+    """处理 /api/s 和 /stats 请求"""
+
+    mock: MockNewsnow = None
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        if parsed.path == "/stats":
+            with self.mock._lock:
+                body = {"stats": dict(self.mock.stats), "requests": dict(self.mock.cursors)}
+            self._send(200, body)
+            return
+
+        if parsed.path != "/api/s":
+            self._send(404, {"status": "error", "message": "not found"})
+            return
+
+        platform_id = parse_qs(parsed.query).get("id", [""])[0]
+        code, body, delay = self.mock.respond(platform_id)
+        if delay:
+            time.sleep(delay)
+        try:
+            self._send(code, body)
+        except (BrokenPipeError, ConnectionResetError):
+            # 客户端已超时断开
+            pass
+
+    def _send(self, code: int, body: Dict) -> None:
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="newsnow 接口模拟服务器")
+    parser.add_argument("--output-dir", default="output", help="数据目录，默认 output")
+    parser.add_argument("--date", help="回放的日期 YYYY-MM-DD，默认最新一天")
+    parser.add_argument("--host", default="127.0.0.1", help="监听地址")
+    parser.add_argument("--port", type=int, default=8765, help="监听端口")
+    parser.add_argument("--latency-ms", type=float, default=0, help="平均响应延迟（毫秒）")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="延迟抖动（毫秒）")
+    parser.add_argument("--error-rate", type=float, default=0, help="返回 5xx 的概率")
+    parser.add_argument("--timeout-rate", type=float, default=0, help="超时的概率")
+    parser.add_argument("--timeout-seconds", type=float, default=15, help="超时请求的等待时间（秒）")
+    parser.add_argument("--cache-rate", type=float, default=0, help="返回 status: cache 的概率")
+    parser.add_argument("--seed", type=int, help="随机种子")
+    args = parser.parse_args()
+
+    output_dir = Path(args.output_dir)
+    if args.date:
+        day_dir = output_dir / datetime.strptime(args.date, "%Y-%m-%d").strftime("%Y年%m月%d日")
+    else:
+        day_dirs = sorted(p.parent for p in output_dir.glob("*/txt") if p.is_dir())
+        if not day_dirs:
+            print(f"{output_dir} 下没有快照数据")
+            return 1
+        day_dir = day_dirs[-1]
+
+    boards = load_boards(day_dir / "txt")
+    if not boards:
+        print(f"{day_dir / 'txt'} 下没有快照数据")
+        return 1
+
+    Handler.mock = MockNewsnow(
+        boards,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        timeout_rate=args.timeout_rate,
+        timeout_seconds=args.timeout_seconds,
+        cache_rate=args.cache_rate,
+        seed=args.seed,
+    )
+    server = ThreadingHTTPServer((args.host, args.port), Handler)
+    server.daemon_threads = True
+
+    print(f"回放 {day_dir.name}，{len(boards)} 个平台")
+    print(f"接口地址: http://{args.host}:{server.server_port}/api/s（CRAWLER_API_URL）")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"\n响应统计: {dict(Handler.mock.stats)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
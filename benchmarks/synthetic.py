@@ -0,0 +1,279 @@
+"""
+合成数据生成器
+
+按 平台数 × 每天快照数 × 天数 × 每个平台的标题数 生成与爬虫输出格式一致的数据目录：
+
+    <root>/output/YYYY年MM月DD日/txt/HH时MM分.txt
+    <root>/config/config.yaml            （复制项目配置，平台列表替换为合成平台）
+    <root>/config/frequency_words.txt    （按词汇表生成的频率词组）
+
+标题由中文主体、动作、对象和后缀组合而成，每次快照有一部分标题被替换、
+相邻排名随机交换，模拟真实榜单的更替；同样的种子生成完全相同的数据。
+
+用法：
+    python benchmarks/synthetic.py --root /tmp/trendradar-synthetic [--platforms 11] [--snapshots 24] [--days 3] [--titles 50]
+"""
+
+import argparse
+import random
+import sys
+import zlib
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import yaml
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+SUBJECTS = [
+    "华为", "小米", "苹果", "特斯拉", "比亚迪", "理想汽车", "蔚来", "腾讯", "阿里巴巴", "字节跳动",
+    "京东", "拼多多", "美团", "百度", "大疆", "宇树", "DeepSeek", "OpenAI", "英伟达", "台积电",
+    "央行", "证监会", "教育部", "国家统计局", "外交部", "北京", "上海", "深圳", "杭州", "成都",
+    "国足", "中国女排", "湖人", "梅西", "樊振东", "郑钦文", "刘慈欣", "黑神话", "哪吒", "胖东来",
+]
+
+ACTIONS = [
+    "发布", "宣布", "回应", "推出", "下调", "上调", "官宣", "曝光", "启动", "暂停",
+    "辟谣", "确认", "公布", "完成", "签约", "上线", "开启", "迎来", "刷新", "突破",
+]
+
+OBJECTS = [
+    "新款手机", "存款利率", "房贷政策", "年度财报", "自动驾驶功能", "人工智能大模型", "新能源车型",
+    "降价计划", "招聘计划", "海外市场", "芯片产能", "世界杯预选赛", "季后赛", "总决赛名单",
+    "新版操作系统", "暑期档票房", "双十一销量", "春运安排", "高考改革方案", "医保目录",
+    "退税政策", "消费券", "地铁新线", "机器人量产", "卫星发射", "游戏版号", "电影定档",
+]
+
+SUFFIXES = [
+    "", "", "", "网友热议", "最新进展", "官方回应来了", "背后原因曝光", "引发关注",
+    "股价大涨", "多地跟进", "专家解读", "现场视频", "评论区炸了",
+]
+
+DETAILS = [
+    "", "", "第{n}季度", "同比增长{p}%", "环比下降{p}%", "首日{n}万人", "涉及{n}个城市", "{n}年来首次",
+]
+
+# 合成平台（与项目默认配置的平台相同，数量更多时追加 synthetic-N）
+DEFAULT_PLATFORMS = [
+    ("toutiao", "今日头条"), ("baidu", "百度热搜"), ("wallstreetcn-hot", "华尔街见闻"),
+    ("thepaper", "澎湃新闻"), ("bilibili-hot-search", "bilibili 热搜"), ("cls-hot", "财联社热门"),
+    ("ifeng", "凤凰网"), ("tieba", "贴吧"), ("weibo", "微博"), ("douyin", "抖音"), ("zhihu", "知乎"),
+]
+
+
+class TitleFactory:
+    """生成不重复的合成标题"""
+
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+        self.used = set()
+
+    def make(self) -> str:
+        rng = self.rng
+        while True:
+            detail = rng.choice(DETAILS).format(n=rng.randint(2, 99), p=rng.randint(1, 60))
+            parts = [rng.choice(SUBJECTS), rng.choice(ACTIONS), rng.choice(OBJECTS)]
+            if detail:
+                parts.append(detail)
+            suffix = rng.choice(SUFFIXES)
+            title = "".join(parts)
+            if suffix:
+                title = f"{title}，{suffix}"
+            if title not in self.used:
+                self.used.add(title)
+                return title
+
+
+def make_platforms(count: int) -> List[tuple]:
+    """合成平台列表 [(id, name)]"""
+    platforms = list(DEFAULT_PLATFORMS[:count])
+    for i in range(len(platforms), count):
+        platforms.append((f"synthetic-{i + 1}", f"合成平台{i + 1}"))
+    return platforms
+
+
+def make_word_groups(count: int, rng: random.Random) -> str:
+    """生成频率词配置文件内容（词组之间空一行，末尾是全局过滤区）"""
+    groups = []
+    for i in range(count):
+        words = rng.sample(SUBJECTS + OBJECTS, rng.randint(1, 3))
+        if i % 5 == 1:
+            words.append("+" + rng.choice(ACTIONS))
+        if i % 7 == 2:
+            words.append("!" + rng.choice(OBJECTS))
+        if i % 6 == 3:
+            words.append(f"@{rng.randint(3, 10)}")
+        groups.append("\n".join(words))
+
+    groups.append("[GLOBAL_FILTER]\n广告\n推广")
+    return "\n\n".join(groups) + "\n"
+
+
+def snapshot_times(count: int, rng: random.Random) -> List[str]:
+    """一天内均匀分布的快照时间（HH时MM分，不重复）"""
+    names = []
+    used = set()
+    for i in range(count):
+        minute = i * 1440 // count + rng.randint(0, max(0, 1440 // count - 1))
+        minute = min(minute, 1439)
+        while minute in used and minute < 1439:
+            minute += 1
+        used.add(minute)
+        names.append(f"{minute // 60:02d}时{minute % 60:02d}分")
+    return sorted(names)
+
+
+def write_snapshot(path: Path, boards: Dict[str, List[str]], names: Dict[str, str], failed: List[str]) -> None:
+    """按爬虫的格式写入一个快照文件"""
+    lines = []
+    for index, (platform_id, titles) in enumerate(boards.items()):
+        lines.append(f"{platform_id} | {names[platform_id]}")
+        for rank, title in enumerate(titles, 1):
+            line = f"{rank}. {title}"
+            # 一部分平台带链接，一部分同时带移动端链接
+            article_id = zlib.crc32(title.encode("utf-8"))
+            if index % 3 != 2:
+                line += f" [URL:https://example.com/{platform_id}/{article_id}]"
+            if index % 3 == 0:
+                line += f" [MOBILE:https://m.example.com/{platform_id}/{article_id}]"
+            lines.append(line)
+        lines.append("")
+
+    if failed:
+        lines.append("==== 以下ID请求失败 ====")
+        lines.extend(failed)
+
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def generate_dataset(
+    root: str,
+    platforms: int = 11,
+    snapshots: int = 24,
+    days: int = 3,
+    titles: int = 50,
+    word_groups: int = 20,
+    churn: float = 0.15,
+    fail_rate: float = 0.02,
+    end_date: Optional[datetime] = None,
+    seed: int = 0,
+) -> Dict:
+    """
+    生成合成数据目录
+
+    Args:
+        root: 输出根目录（其下生成 output/ 和 config/）
+        platforms: 平台数
+        snapshots: 每天快照数
+        days: 天数
+        titles: 每个平台每次快照的标题数
+        word_groups: 频率词组数
+        churn: 每次快照被替换的标题比例
+        fail_rate: 平台请求失败的概率
+        end_date: 最后一天，默认今天
+        seed: 随机种子
+
+    Returns:
+        数据集描述（参数、日期列表、文件数和大小）
+    """
+    rng = random.Random(seed)
+    factory = TitleFactory(rng)
+    root_path = Path(root)
+    platform_list = make_platforms(platforms)
+    names = dict(platform_list)
+
+    # 配置：复制项目配置，替换平台列表
+    with open(PROJECT_ROOT / "config" / "config.yaml", "r", encoding="utf-8") as f:
+        config = yaml.safe_load(f)
+    config["platforms"] = [{"id": pid, "name": name} for pid, name in platform_list]
+    config_dir = root_path / "config"
+    config_dir.mkdir(parents=True, exist_ok=True)
+    with open(config_dir / "config.yaml", "w", encoding="utf-8") as f:
+        yaml.safe_dump(config, f, allow_unicode=True, sort_keys=False)
+    (config_dir / "frequency_words.txt").write_text(
+        make_word_groups(word_groups, rng), encoding="utf-8"
+    )
+
+    if end_date is None:
+        end_date = datetime.now()
+    end_date = end_date.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    boards = {pid: [factory.make() for _ in range(titles)] for pid, _ in platform_list}
+    dates = []
+    files = 0
+    size = 0
+
+    for day_offset in range(days - 1, -1, -1):
+        date = end_date - timedelta(days=day_offset)
+        txt_dir = root_path / "output" / date.strftime("%Y年%m月%d日") / "txt"
+        txt_dir.mkdir(parents=True, exist_ok=True)
+        dates.append(date.strftime("%Y-%m-%d"))
+
+        for name in snapshot_times(snapshots, rng):
+            for board in boards.values():
+                # 替换一部分标题（新标题从榜单中部进入），再随机交换相邻排名
+                for _ in range(max(1, int(len(board) * churn))):
+                    board.pop(rng.randrange(len(board)))
+                    board.insert(rng.randrange(len(board) // 2, len(board) + 1), factory.make())
+                for _ in range(len(board) // 5 if len(board) > 1 else 0):
+                    i = rng.randrange(len(board) - 1)
+                    board[i], board[i + 1] = board[i + 1], board[i]
+
+            failed = [pid for pid in boards if rng.random() < fail_rate]
+            current = {pid: list(board) for pid, board in boards.items() if pid not in failed}
+            path = txt_dir / f"{name}.txt"
+            write_snapshot(path, current, names, failed)
+            files += 1
+            size += path.stat().st_size
+
+    return {
+        "root": str(root_path),
+        "platforms": platforms,
+        "snapshots_per_day": snapshots,
+        "days": days,
+        "titles": titles,
+        "word_groups": word_groups,
+        "churn": churn,
+        "fail_rate": fail_rate,
+        "seed": seed,
+        "dates": dates,
+        "files": files,
+        "bytes": size,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="合成数据生成器")
+    parser.add_argument("--root", required=True, help="输出根目录")
+    parser.add_argument("--platforms", type=int, default=11, help="平台数")
+    parser.add_argument("--snapshots", type=int, default=24, help="每天快照数")
+    parser.add_argument("--days", type=int, default=3, help="天数")
+    parser.add_argument("--titles", type=int, default=50, help="每个平台每次快照的标题数")
+    parser.add_argument("--word-groups", type=int, default=20, help="频率词组数")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    args = parser.parse_args()
+
+    if (Path(args.root) / "output").exists():
+        print(f"目录中已有数据: {Path(args.root) / 'output'}")
+        return 1
+
+    dataset = generate_dataset(
+        args.root,
+        platforms=args.platforms,
+        snapshots=args.snapshots,
+        days=args.days,
+        titles=args.titles,
+        word_groups=args.word_groups,
+        seed=args.seed,
+    )
+    print(
+        f"已生成 {dataset['files']} 个快照文件（{dataset['bytes'] / 1024 / 1024:.1f} MB），"
+        f"日期 {dataset['dates'][0]} ~ {dataset['dates'][-1]}: {dataset['root']}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,22 +2,33 @@
 
 import json
 import os
+import queue
 import random
 import re
+import threading
 import time
-import webbrowser
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from email.header import Header
-from email.utils import formataddr, formatdate, make_msgid
+from contextlib import contextmanager, redirect_stdout
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional, Union
-
-import pytz
-import requests
-import yaml
+from typing import Callable, Dict, List, Tuple, Optional, Union
+
+# requests、yaml、pytz、smtplib/email、webbrowser 在用到的函数内导入，
+# 未启用爬虫或通知的运行不必承担这些模块的导入开销
+from trendradar_core import (
+    DEFAULT_API_URL,
+    PROFILES_DIR_NAME,
+    Profiler,
+    RankStats,
+    build_api_url,
+    build_snapshot,
+    clean_title,
+    intern_text,
+    parse_snapshot,
+    read_failed_ids,
+    read_snapshot_text_records,
+    resolve_api_url,
+    update_latest_pointer,
+)
 
 
 VERSION = "3.5.0"
@@ -161,6 +172,8 @@ def get_account_at_index(accounts: List[str], index: int, default: str = "") ->
 # === 配置管理 ===
 def load_config():
     """加载配置文件"""
+    import yaml
+
     config_path = os.environ.get("CONFIG_PATH", "config/config.yaml")
 
     if not Path(config_path).exists():
@@ -191,7 +204,16 @@ def load_config():
         in ("true", "1")
         if os.environ.get("REVERSE_CONTENT_ORDER", "").strip()
         else config_data["report"].get("reverse_content_order", False),
+        "API_URL": resolve_api_url(config_data["crawler"].get("api_url")),
         "USE_PROXY": config_data["crawler"]["use_proxy"],
+        "METRICS": {
+            "ENABLED": os.environ.get("METRICS_ENABLED", "").strip().lower()
+            in ("true", "1")
+            if os.environ.get("METRICS_ENABLED", "").strip()
+            else config_data.get("metrics", {}).get("enabled", True),
+            "PROMETHEUS_TEXTFILE": os.environ.get("PROMETHEUS_TEXTFILE", "").strip()
+            or config_data.get("metrics", {}).get("prometheus_textfile", ""),
+        },
         "DEFAULT_PROXY": config_data["crawler"]["default_proxy"],
         "ENABLE_CRAWLER": os.environ.get("ENABLE_CRAWLER", "").strip().lower()
         in ("true", "1")
@@ -398,15 +420,115 @@ def load_config():
     return config
 
 
-print("正在加载配置...")
-CONFIG = load_config()
-print(f"TrendRadar v{VERSION} 配置加载完成")
-print(f"监控平台数量: {len(CONFIG['PLATFORMS'])}")
+class LazyConfig:
+    """首次访问时才加载的配置（导入 main 时不读取配置文件）"""
+
+    def __init__(self, loader):
+        self._loader = loader
+        self._config = None
+
+    def load(self) -> Dict:
+        """加载配置（只加载一次）"""
+        if self._config is None:
+            print("正在加载配置...")
+            self._config = self._loader()
+            print(f"TrendRadar v{VERSION} 配置加载完成")
+            print(f"监控平台数量: {len(self._config['PLATFORMS'])}")
+        return self._config
+
+    def __getitem__(self, key):
+        return self.load()[key]
+
+    def __contains__(self, key) -> bool:
+        return key in self.load()
+
+    def get(self, key, default=None):
+        return self.load().get(key, default)
+
+
+CONFIG = LazyConfig(load_config)
+
+
+# 输出目录和根目录汇总页（回放模式下指向临时目录，不影响实际数据）
+OUTPUT_DIR = Path("output")
+ROOT_INDEX_PATH = Path("index.html")
+
+# 回放模式下的模拟当前时间（None 表示使用真实时间）
+SIMULATED_TIME: Optional[datetime] = None
+
+
+class StageTimer:
+    """分阶段计时器：按阶段名累计耗时和次数，并记录字节数、条目数等计数
+
+    阶段名中的点表示子阶段（如 crawl.weibo 是 crawl 中的一个平台），子阶段的耗时也计入父阶段。
+    设置 profile（性能分析会话）后，各阶段同时按阶段做 CPU / 内存分析，分析中的阶段名加上 profile_prefix。
+    """
+
+    def __init__(self, profile_prefix: str = ""):
+        self.totals: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        self.counters: Dict[str, int] = {}
+        self.profile = None
+        self.profile_prefix = profile_prefix
+
+    @contextmanager
+    def stage(self, name: str):
+        """统计 with 块的耗时，计入指定阶段"""
+        start = time.perf_counter()
+        try:
+            if self.profile is not None:
+                with self.profile.stage(self.profile_prefix + name):
+                    yield
+            else:
+                yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.totals[name] = self.totals.get(name, 0.0) + elapsed
+            self.counts[name] = self.counts.get(name, 0) + 1
+
+    def add(self, name: str, value: int = 1) -> None:
+        """累加计数"""
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def merge(self, other: "StageTimer", prefix: str) -> None:
+        """合并另一个计时器的统计（如后台线程的计时），阶段名和计数名加上前缀作为子阶段"""
+        for name, total in other.totals.items():
+            key = f"{prefix}.{name}"
+            self.totals[key] = self.totals.get(key, 0.0) + total
+            self.counts[key] = self.counts.get(key, 0) + other.counts[name]
+        for name, value in other.counters.items():
+            self.add(f"{prefix}.{name}", value)
+
+    def reset(self) -> None:
+        """清空统计"""
+        self.totals.clear()
+        self.counts.clear()
+        self.counters.clear()
+
+    def summary(self) -> List[Dict]:
+        """按耗时从高到低返回各阶段统计"""
+        return [
+            {
+                "stage": name,
+                "seconds": total,
+                "count": self.counts[name],
+                "avg_ms": total * 1000 / self.counts[name],
+            }
+            for name, total in sorted(self.totals.items(), key=lambda item: -item[1])
+        ]
+
+
+# 当前运行的分阶段计时（通知发送等模块级函数也记录到这里）
+RUN_TIMER = StageTimer()
 
 
 # === 工具函数 ===
 def get_beijing_time():
     """获取北京时间"""
+    if SIMULATED_TIME is not None:
+        return SIMULATED_TIME
+    import pytz
+
     return datetime.now(pytz.timezone("Asia/Shanghai"))
 
 
@@ -420,16 +542,6 @@ def format_time_filename():
     return get_beijing_time().strftime("%H时%M分")
 
 
-def clean_title(title: str) -> str:
-    """清理标题中的特殊字符"""
-    if not isinstance(title, str):
-        title = str(title)
-    cleaned_title = title.replace("\n", " ").replace("\r", " ")
-    cleaned_title = re.sub(r"\s+", " ", cleaned_title)
-    cleaned_title = cleaned_title.strip()
-    return cleaned_title
-
-
 def ensure_directory_exists(directory: str):
     """确保目录存在"""
     Path(directory).mkdir(parents=True, exist_ok=True)
@@ -438,7 +550,7 @@ def ensure_directory_exists(directory: str):
 def get_output_path(subfolder: str, filename: str) -> str:
     """获取输出路径"""
     date_folder = format_date_folder()
-    output_dir = Path("output") / date_folder / subfolder
+    output_dir = OUTPUT_DIR / date_folder / subfolder
     ensure_directory_exists(str(output_dir))
     return str(output_dir / filename)
 
@@ -447,6 +559,8 @@ def check_version_update(
     current_version: str, version_url: str, proxy_url: Optional[str] = None
 ) -> Tuple[bool, Optional[str]]:
     """检查版本更新"""
+    import requests
+
     try:
         proxies = None
         if proxy_url:
@@ -490,7 +604,7 @@ def check_version_update(
 def is_first_crawl_today() -> bool:
     """检测是否是当天第一次爬取"""
     date_folder = format_date_folder()
-    txt_dir = Path("output") / date_folder / "txt"
+    txt_dir = OUTPUT_DIR / date_folder / "txt"
 
     if not txt_dir.exists():
         return True
@@ -513,12 +627,117 @@ def html_escape(text: str) -> str:
     )
 
 
+# === 新闻条目 ===
+class NewsItem:
+    """解析后的新闻条目：排名统计 + 驻留的链接，同时记录出现时间和次数"""
+
+    __slots__ = ("ranks", "url", "mobile_url", "first_time", "last_time", "count")
+
+    def __init__(
+        self,
+        ranks=None,
+        url: str = "",
+        mobile_url: str = "",
+        first_time: str = "",
+        last_time: str = "",
+        count: int = 1,
+    ):
+        self.ranks = RankStats(ranks) if ranks is not None else RankStats()
+        self.url = intern_text(url)
+        self.mobile_url = intern_text(mobile_url)
+        self.first_time = first_time
+        self.last_time = last_time
+        self.count = count
+
+    def copy(self) -> "NewsItem":
+        """复制条目（排名统计独立复制，合并时不影响原条目）"""
+        item = NewsItem.__new__(NewsItem)
+        item.ranks = self.ranks.copy()
+        item.url = self.url
+        item.mobile_url = self.mobile_url
+        item.first_time = self.first_time
+        item.last_time = self.last_time
+        item.count = self.count
+        return item
+
+    def to_dict(self) -> Dict:
+        """转换为字典（仅在输出时使用）"""
+        return {
+            "first_time": self.first_time,
+            "last_time": self.last_time,
+            "count": self.count,
+            "ranks": self.ranks.to_dict(),
+            "url": self.url,
+            "mobileUrl": self.mobile_url,
+        }
+
+
+class MatchedTitle:
+    """词频统计中匹配到的标题"""
+
+    __slots__ = (
+        "title",
+        "source_name",
+        "first_time",
+        "last_time",
+        "time_display",
+        "count",
+        "ranks",
+        "rank_threshold",
+        "url",
+        "mobile_url",
+        "is_new",
+    )
+
+    def __init__(
+        self,
+        title: str,
+        source_name: str,
+        first_time: str,
+        last_time: str,
+        time_display: str,
+        count: int,
+        ranks,
+        rank_threshold: int,
+        url: str,
+        mobile_url: str,
+        is_new: bool,
+    ):
+        self.title = title
+        self.source_name = source_name
+        self.first_time = first_time
+        self.last_time = last_time
+        self.time_display = time_display
+        self.count = count
+        self.ranks = ranks
+        self.rank_threshold = rank_threshold
+        self.url = url
+        self.mobile_url = mobile_url
+        self.is_new = is_new
+
+    def to_dict(self) -> Dict:
+        """转换为字典（仅在输出时使用）"""
+        return {
+            "title": self.title,
+            "source_name": self.source_name,
+            "first_time": self.first_time,
+            "last_time": self.last_time,
+            "time_display": self.time_display,
+            "count": self.count,
+            "ranks": self.ranks.to_dict(),
+            "rank_threshold": self.rank_threshold,
+            "url": self.url,
+            "mobileUrl": self.mobile_url,
+            "is_new": self.is_new,
+        }
+
+
 # === 推送记录管理 ===
 class PushRecordManager:
     """推送记录管理器"""
 
     def __init__(self):
-        self.record_dir = Path("output") / ".push_records"
+        self.record_dir = OUTPUT_DIR / ".push_records"
         self.ensure_record_dir()
         self.cleanup_old_records()
 
@@ -534,6 +753,8 @@ class PushRecordManager:
     def cleanup_old_records(self):
         """清理过期的推送记录"""
         retention_days = CONFIG["PUSH_WINDOW"]["RECORD_RETENTION_DAYS"]
+        import pytz
+
         current_time = get_beijing_time()
 
         for record_file in self.record_dir.glob("push_record_*.json"):
@@ -620,8 +841,9 @@ class PushRecordManager:
 class DataFetcher:
     """数据获取器"""
 
-    def __init__(self, proxy_url: Optional[str] = None):
+    def __init__(self, proxy_url: Optional[str] = None, api_url: Optional[str] = None):
         self.proxy_url = proxy_url
+        self.api_url = api_url or resolve_api_url()
 
     def fetch_data(
         self,
@@ -631,13 +853,15 @@ class DataFetcher:
         max_retry_wait: int = 5,
     ) -> Tuple[Optional[str], str, str]:
         """获取指定ID数据，支持重试"""
+        import requests
+
         if isinstance(id_info, tuple):
             id_value, alias = id_info
         else:
             id_value = id_info
             alias = id_value
 
-        url = f"https://newsnow.busiyi.world/api/s?id={id_value}&latest"
+        url = build_api_url(self.api_url, id_value)
 
         proxies = None
         if self.proxy_url:
@@ -686,9 +910,15 @@ class DataFetcher:
     def crawl_websites(
         self,
         ids_list: List[Union[str, Tuple[str, str]]],
-        request_interval: int = CONFIG["REQUEST_INTERVAL"],
+        request_interval: Optional[int] = None,
+        on_platform: Optional[Callable[[str, str, Dict], None]] = None,
     ) -> Tuple[Dict, Dict, List]:
-        """爬取多个网站数据"""
+        """爬取多个网站数据
+
+        on_platform(平台ID, 平台名称, 标题数据) 在每个平台的数据处理完后立即调用（爬取流水线）。
+        """
+        if request_interval is None:
+            request_interval = CONFIG["REQUEST_INTERVAL"]
         results = {}
         id_to_name = {}
         failed_ids = []
@@ -701,9 +931,11 @@ class DataFetcher:
                 name = id_value
 
             id_to_name[id_value] = name
-            response, _, _ = self.fetch_data(id_info)
+            with RUN_TIMER.stage(f"crawl.{id_value}"):
+                response, _, _ = self.fetch_data(id_info)
 
             if response:
+                RUN_TIMER.add(f"crawl.{id_value}.bytes", len(response.encode("utf-8")))
                 try:
                     data = json.loads(response)
                     results[id_value] = {}
@@ -717,19 +949,20 @@ class DataFetcher:
                         mobile_url = item.get("mobileUrl", "")
 
                         if title in results[id_value]:
-                            results[id_value][title]["ranks"].append(index)
+                            results[id_value][title].ranks.add(index)
                         else:
-                            results[id_value][title] = {
-                                "ranks": [index],
-                                "url": url,
-                                "mobileUrl": mobile_url,
-                            }
+                            results[id_value][title] = NewsItem(
+                                (index,), url or "", mobile_url or ""
+                            )
+                    RUN_TIMER.add(f"crawl.{id_value}.items", len(results[id_value]))
                 except json.JSONDecodeError:
                     print(f"解析 {id_value} 响应失败")
                     failed_ids.append(id_value)
                 except Exception as e:
                     print(f"处理 {id_value} 数据出错: {e}")
                     failed_ids.append(id_value)
+                if on_platform is not None and id_value in results:
+                    on_platform(id_value, name, results[id_value])
             else:
                 failed_ids.append(id_value)
 
@@ -743,54 +976,111 @@ class DataFetcher:
 
 
 # === 数据处理 ===
-def save_titles_to_file(results: Dict, id_to_name: Dict, failed_ids: List) -> str:
-    """保存标题到文件"""
-    file_path = get_output_path("txt", f"{format_time_filename()}.txt")
+def format_snapshot_section(id_value: str, name: Optional[str], title_data: Dict) -> str:
+    """格式化一个平台的快照段落：平台行、按排名排序的标题行和结尾的空行"""
+    # id | name 或 id
+    if name and name != id_value:
+        lines = [f"{id_value} | {name}"]
+    else:
+        lines = [f"{id_value}"]
+
+    # 按排名排序标题
+    sorted_titles = []
+    for title, info in title_data.items():
+        cleaned_title = clean_title(title)
+        if isinstance(info, NewsItem):
+            ranks = [info.ranks.first] if info.ranks else []
+            url = info.url
+            mobile_url = info.mobile_url
+        elif isinstance(info, dict):
+            ranks = info.get("ranks", [])
+            url = info.get("url", "")
+            mobile_url = info.get("mobileUrl", "")
+        else:
+            ranks = info if isinstance(info, list) else []
+            url = ""
+            mobile_url = ""
 
-    with open(file_path, "w", encoding="utf-8") as f:
-        for id_value, title_data in results.items():
-            # id | name 或 id
-            name = id_to_name.get(id_value)
-            if name and name != id_value:
-                f.write(f"{id_value} | {name}\n")
-            else:
-                f.write(f"{id_value}\n")
-
-            # 按排名排序标题
-            sorted_titles = []
-            for title, info in title_data.items():
-                cleaned_title = clean_title(title)
-                if isinstance(info, dict):
-                    ranks = info.get("ranks", [])
-                    url = info.get("url", "")
-                    mobile_url = info.get("mobileUrl", "")
-                else:
-                    ranks = info if isinstance(info, list) else []
-                    url = ""
-                    mobile_url = ""
+        rank = ranks[0] if ranks else 1
+        sorted_titles.append((rank, cleaned_title, url, mobile_url))
 
-                rank = ranks[0] if ranks else 1
-                sorted_titles.append((rank, cleaned_title, url, mobile_url))
+    sorted_titles.sort(key=lambda x: x[0])
 
-            sorted_titles.sort(key=lambda x: x[0])
+    for rank, cleaned_title, url, mobile_url in sorted_titles:
+        line = f"{rank}. {cleaned_title}"
 
-            for rank, cleaned_title, url, mobile_url in sorted_titles:
-                line = f"{rank}. {cleaned_title}"
+        if url:
+            line += f" [URL:{url}]"
+        if mobile_url:
+            line += f" [MOBILE:{mobile_url}]"
+        lines.append(line)
 
-                if url:
-                    line += f" [URL:{url}]"
-                if mobile_url:
-                    line += f" [MOBILE:{mobile_url}]"
-                f.write(line + "\n")
+    return "\n".join(lines) + "\n\n"
 
-            f.write("\n")
 
+class SnapshotWriter:
+    """
+    快照文件写入器：逐个平台追加段落
+
+    先写入同目录下的 .part 临时文件，close() 时写入请求失败的平台列表再改名为正式文件名，
+    读取当天数据的代码（包括 MCP 服务器）不会看到写了一半的快照。
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.part_path = f"{file_path}.part"
+        self.platform_ids: List[str] = []
+        self._file = open(self.part_path, "w", encoding="utf-8")
+
+    def write_section(self, id_value: str, name: Optional[str], title_data: Dict) -> str:
+        """追加一个平台的段落，返回写入的文本"""
+        text = format_snapshot_section(id_value, name, title_data)
+        self._file.write(text)
+        self._file.flush()
+        self.platform_ids.append(id_value)
+        return text
+
+    def close(self, failed_ids: List) -> str:
+        """写入请求失败的平台列表，完成快照文件并更新最新快照指针，返回文件路径"""
         if failed_ids:
-            f.write("==== 以下ID请求失败 ====\n")
+            self._file.write("==== 以下ID请求失败 ====\n")
             for id_value in failed_ids:
-                f.write(f"{id_value}\n")
+                self._file.write(f"{id_value}\n")
+        self._file.close()
+        os.replace(self.part_path, self.file_path)
 
-    return file_path
+        update_latest_snapshot_pointer(self.file_path, self.platform_ids)
+        RUN_TIMER.add("save.bytes", os.path.getsize(self.file_path))
+        return self.file_path
+
+    def discard(self) -> None:
+        """放弃写入，删除临时文件"""
+        self._file.close()
+        try:
+            os.remove(self.part_path)
+        except OSError:
+            pass
+
+
+def save_titles_to_file(results: Dict, id_to_name: Dict, failed_ids: List) -> str:
+    """保存标题到文件"""
+    writer = SnapshotWriter(get_output_path("txt", f"{format_time_filename()}.txt"))
+    for id_value, title_data in results.items():
+        writer.write_section(id_value, id_to_name.get(id_value), title_data)
+    return writer.close(failed_ids)
+
+
+def update_latest_snapshot_pointer(file_path: str, platform_ids: List[str]) -> None:
+    """更新当天最新快照指针（txt/latest.json），记录每个平台最近一次成功爬取所在的快照"""
+    try:
+        update_latest_pointer(
+            Path(file_path).parent,
+            Path(file_path).name,
+            platform_ids,
+            get_beijing_time().strftime("%Y-%m-%d %H:%M:%S"),
+        )
+    except OSError as e:
+        print(f"更新最新快照指针失败: {e}")
 
 
 def load_frequency_words(
@@ -892,116 +1182,135 @@ def load_frequency_words(
 
 def parse_file_titles(file_path: Path) -> Tuple[Dict, Dict]:
     """解析单个txt文件的标题数据，返回(titles_by_id, id_to_name)"""
-    titles_by_id = {}
-    id_to_name = {}
+    return parse_snapshot(file_path, NewsItem)
 
-    with open(file_path, "r", encoding="utf-8") as f:
-        content = f.read()
-        sections = content.split("\n\n")
 
-        for section in sections:
-            if not section.strip() or "==== 以下ID请求失败 ====" in section:
-                continue
+class DayAggregate:
+    """
+    当天快照的聚合：read_all_today_titles 和 detect_latest_new_titles 的数据来源
 
-            lines = section.strip().split("\n")
-            if len(lines) < 2:
-                continue
+    按时间顺序逐个合并快照文件。爬取流水线在等待接口响应时先合并当天已有的快照，
+    再调用 begin_snapshot() 开始本次快照，之后每收到一个平台的数据就合并对应的段落，
+    分析阶段直接取聚合结果，不再重新解析当天的全部快照文件。
+    """
 
-            # id | name 或 id
-            header_line = lines[0].strip()
-            if " | " in header_line:
-                parts = header_line.split(" | ", 1)
-                source_id = parts[0].strip()
-                name = parts[1].strip()
-                id_to_name[source_id] = name
-            else:
-                source_id = header_line
-                id_to_name[source_id] = source_id
+    def __init__(self, txt_dir: Path, platform_ids: Optional[List[str]] = None):
+        self.txt_dir = txt_dir
+        self.platform_ids = platform_ids
+        self.file_names: List[str] = []
+        self.all_results: Dict = {}
+        self.id_to_name: Dict = {}
+        self.title_info: Dict = {}
+        # 本次快照（begin_snapshot 之后合并的段落）
+        self.snapshot_name: Optional[str] = None
+        self.history_titles: Dict[str, set] = {}
+        self._sections: List[List[Tuple]] = []
+
+    def add_titles(self, titles_by_id: Dict, file_id_to_name: Dict, time_info: str) -> None:
+        """合并一个快照的标题数据（只保留当前监控的平台）"""
+        if self.platform_ids is not None:
+            filtered_titles_by_id = {}
+            filtered_id_to_name = {}
 
-            titles_by_id[source_id] = {}
+            for source_id, title_data in titles_by_id.items():
+                if source_id in self.platform_ids:
+                    filtered_titles_by_id[source_id] = title_data
+                    if source_id in file_id_to_name:
+                        filtered_id_to_name[source_id] = file_id_to_name[source_id]
 
-            for line in lines[1:]:
-                if line.strip():
-                    try:
-                        title_part = line.strip()
-                        rank = None
-
-                        # 提取排名
-                        if ". " in title_part and title_part.split(". ")[0].isdigit():
-                            rank_str, title_part = title_part.split(". ", 1)
-                            rank = int(rank_str)
-
-                        # 提取 MOBILE URL
-                        mobile_url = ""
-                        if " [MOBILE:" in title_part:
-                            title_part, mobile_part = title_part.rsplit(" [MOBILE:", 1)
-                            if mobile_part.endswith("]"):
-                                mobile_url = mobile_part[:-1]
-
-                        # 提取 URL
-                        url = ""
-                        if " [URL:" in title_part:
-                            title_part, url_part = title_part.rsplit(" [URL:", 1)
-                            if url_part.endswith("]"):
-                                url = url_part[:-1]
-
-                        title = clean_title(title_part.strip())
-                        ranks = [rank] if rank is not None else [1]
-
-                        titles_by_id[source_id][title] = {
-                            "ranks": ranks,
-                            "url": url,
-                            "mobileUrl": mobile_url,
-                        }
+            titles_by_id = filtered_titles_by_id
+            file_id_to_name = filtered_id_to_name
+
+        self.id_to_name.update(file_id_to_name)
+
+        for source_id, title_data in titles_by_id.items():
+            process_source_data(
+                source_id, title_data, time_info, self.all_results, self.title_info
+            )
+
+    def add_file(self, file_path: Path) -> None:
+        """合并一个快照文件"""
+        titles_by_id, file_id_to_name = parse_file_titles(file_path)
+        self.add_titles(titles_by_id, file_id_to_name, file_path.stem)
+        self.file_names.append(file_path.name)
+
+    def begin_snapshot(self, snapshot_name: str) -> None:
+        """开始合并本次快照，此前合并的快照作为判断新增标题的历史"""
+        self.snapshot_name = snapshot_name
+        self.history_titles = {
+            source_id: set(titles) for source_id, titles in self.all_results.items()
+        }
 
-                    except Exception as e:
-                        print(f"解析标题行出错: {line}, 错误: {e}")
+    def add_section(self, records: List[Tuple]) -> None:
+        """合并本次快照的一个平台段落（read_snapshot_text_records 的结果）"""
+        self._sections.append(records)
+        titles_by_id, file_id_to_name = build_snapshot(records, NewsItem)
+        self.add_titles(titles_by_id, file_id_to_name, Path(self.snapshot_name).stem)
+
+    def is_current(
+        self, txt_dir: Path, files: List[Path], platform_ids: Optional[List[str]]
+    ) -> bool:
+        """当天的快照文件和监控平台是否与聚合时相同（本次快照是最新的快照）"""
+        return (
+            self.snapshot_name is not None
+            and txt_dir == self.txt_dir
+            and platform_ids == self.platform_ids
+            and [f.name for f in files] == self.file_names + [self.snapshot_name]
+        )
+
+    def today_titles(self) -> Tuple[Dict, Dict, Dict]:
+        """read_all_today_titles 的结果（条目为副本，聚合本身不会被调用方修改）"""
+        all_results = {}
+        title_info = {}
+        for source_id, titles in self.all_results.items():
+            copied = {title: item.copy() for title, item in titles.items()}
+            all_results[source_id] = copied
+            title_info[source_id] = dict(copied)
+        return all_results, dict(self.id_to_name), title_info
+
+    def new_titles(self) -> Dict:
+        """detect_latest_new_titles 的结果"""
+        if not self.file_names:
+            return {}
+
+        latest_titles = {}
+        for records in self._sections:
+            titles_by_id, _ = build_snapshot(records, NewsItem)
+            latest_titles.update(titles_by_id)
+
+        if self.platform_ids is not None:
+            latest_titles = {
+                source_id: title_data
+                for source_id, title_data in latest_titles.items()
+                if source_id in self.platform_ids
+            }
 
-    return titles_by_id, id_to_name
+        return find_new_titles(latest_titles, self.history_titles)
 
 
 def read_all_today_titles(
     current_platform_ids: Optional[List[str]] = None,
+    day: Optional[DayAggregate] = None,
 ) -> Tuple[Dict, Dict, Dict]:
-    """读取当天所有标题文件，支持按当前监控平台过滤"""
+    """读取当天所有标题文件，支持按当前监控平台过滤
+
+    传入爬取流水线的当天聚合（day）且快照文件没有变化时，直接使用聚合结果。
+    """
     date_folder = format_date_folder()
-    txt_dir = Path("output") / date_folder / "txt"
+    txt_dir = OUTPUT_DIR / date_folder / "txt"
 
     if not txt_dir.exists():
         return {}, {}, {}
 
-    all_results = {}
-    final_id_to_name = {}
-    title_info = {}
-
     files = sorted([f for f in txt_dir.iterdir() if f.suffix == ".txt"])
+    if day is not None and day.is_current(txt_dir, files, current_platform_ids):
+        return day.today_titles()
 
+    aggregate = DayAggregate(txt_dir, current_platform_ids)
     for file_path in files:
-        time_info = file_path.stem
-
-        titles_by_id, file_id_to_name = parse_file_titles(file_path)
-
-        if current_platform_ids is not None:
-            filtered_titles_by_id = {}
-            filtered_id_to_name = {}
-
-            for source_id, title_data in titles_by_id.items():
-                if source_id in current_platform_ids:
-                    filtered_titles_by_id[source_id] = title_data
-                    if source_id in file_id_to_name:
-                        filtered_id_to_name[source_id] = file_id_to_name[source_id]
-
-            titles_by_id = filtered_titles_by_id
-            file_id_to_name = filtered_id_to_name
-
-        final_id_to_name.update(file_id_to_name)
-
-        for source_id, title_data in titles_by_id.items():
-            process_source_data(
-                source_id, title_data, time_info, all_results, title_info
-            )
+        aggregate.add_file(file_path)
 
-    return all_results, final_id_to_name, title_info
+    return aggregate.all_results, aggregate.id_to_name, aggregate.title_info
 
 
 def process_source_data(
@@ -1011,81 +1320,58 @@ def process_source_data(
     all_results: Dict,
     title_info: Dict,
 ) -> None:
-    """处理来源数据，合并重复标题"""
+    """处理来源数据，合并重复标题（all_results 与 title_info 共享同一个 NewsItem）"""
     if source_id not in all_results:
         all_results[source_id] = title_data
 
         if source_id not in title_info:
             title_info[source_id] = {}
 
-        for title, data in title_data.items():
-            ranks = data.get("ranks", [])
-            url = data.get("url", "")
-            mobile_url = data.get("mobileUrl", "")
-
-            title_info[source_id][title] = {
-                "first_time": time_info,
-                "last_time": time_info,
-                "count": 1,
-                "ranks": ranks,
-                "url": url,
-                "mobileUrl": mobile_url,
-            }
+        for title, item in title_data.items():
+            item.first_time = time_info
+            item.last_time = time_info
+            item.count = 1
+            title_info[source_id][title] = item
     else:
-        for title, data in title_data.items():
-            ranks = data.get("ranks", [])
-            url = data.get("url", "")
-            mobile_url = data.get("mobileUrl", "")
-
-            if title not in all_results[source_id]:
-                all_results[source_id][title] = {
-                    "ranks": ranks,
-                    "url": url,
-                    "mobileUrl": mobile_url,
-                }
-                title_info[source_id][title] = {
-                    "first_time": time_info,
-                    "last_time": time_info,
-                    "count": 1,
-                    "ranks": ranks,
-                    "url": url,
-                    "mobileUrl": mobile_url,
-                }
+        source_results = all_results[source_id]
+        source_info = title_info[source_id]
+
+        for title, item in title_data.items():
+            existing = source_results.get(title)
+
+            if existing is None:
+                item.first_time = time_info
+                item.last_time = time_info
+                item.count = 1
+                source_results[title] = item
+                source_info[title] = item
             else:
-                existing_data = all_results[source_id][title]
-                existing_ranks = existing_data.get("ranks", [])
-                existing_url = existing_data.get("url", "")
-                existing_mobile_url = existing_data.get("mobileUrl", "")
-
-                merged_ranks = existing_ranks.copy()
-                for rank in ranks:
-                    if rank not in merged_ranks:
-                        merged_ranks.append(rank)
-
-                all_results[source_id][title] = {
-                    "ranks": merged_ranks,
-                    "url": existing_url or url,
-                    "mobileUrl": existing_mobile_url or mobile_url,
-                }
+                existing.ranks.merge(item.ranks)
+                existing.last_time = time_info
+                existing.count += 1
+                if not existing.url:
+                    existing.url = item.url
+                if not existing.mobile_url:
+                    existing.mobile_url = item.mobile_url
 
-                title_info[source_id][title]["last_time"] = time_info
-                title_info[source_id][title]["ranks"] = merged_ranks
-                title_info[source_id][title]["count"] += 1
-                if not title_info[source_id][title].get("url"):
-                    title_info[source_id][title]["url"] = url
-                if not title_info[source_id][title].get("mobileUrl"):
-                    title_info[source_id][title]["mobileUrl"] = mobile_url
 
+def detect_latest_new_titles(
+    current_platform_ids: Optional[List[str]] = None,
+    day: Optional[DayAggregate] = None,
+) -> Dict:
+    """检测当日最新批次的新增标题，支持按当前监控平台过滤
 
-def detect_latest_new_titles(current_platform_ids: Optional[List[str]] = None) -> Dict:
-    """检测当日最新批次的新增标题，支持按当前监控平台过滤"""
+    传入爬取流水线的当天聚合（day）且快照文件没有变化时，直接使用聚合结果。
+    """
     date_folder = format_date_folder()
-    txt_dir = Path("output") / date_folder / "txt"
+    txt_dir = OUTPUT_DIR / date_folder / "txt"
 
     if not txt_dir.exists():
         return {}
 
     files = sorted([f for f in txt_dir.iterdir() if f.suffix == ".txt"])
+    if day is not None and day.is_current(txt_dir, files, current_platform_ids):
+        return day.new_titles()
     if len(files) < 2:
         return {}
 
@@ -1120,7 +1406,11 @@ def detect_latest_new_titles(current_platform_ids: Optional[List[str]] = None) -
             for title in titles_data.keys():
                 historical_titles[source_id].add(title)
 
-    # 找出新增标题
+    return find_new_titles(latest_titles, historical_titles)
+
+
+def find_new_titles(latest_titles: Dict, historical_titles: Dict) -> Dict:
+    """找出最新批次中不在历史标题集合里的标题"""
     new_titles = {}
     for source_id, latest_source_titles in latest_titles.items():
         historical_set = historical_titles.get(source_id, set())
@@ -1138,30 +1428,27 @@ def detect_latest_new_titles(current_platform_ids: Optional[List[str]] = None) -
 
 # === 统计和分析 ===
 def calculate_news_weight(
-    title_data: Dict, rank_threshold: int = CONFIG["RANK_THRESHOLD"]
+    title_data: Union[NewsItem, MatchedTitle],
+    rank_threshold: Optional[int] = None,
 ) -> float:
     """计算新闻权重，用于排序"""
-    ranks = title_data.get("ranks", [])
+    if rank_threshold is None:
+        rank_threshold = CONFIG["RANK_THRESHOLD"]
+    ranks = title_data.ranks
     if not ranks:
         return 0.0
 
-    count = title_data.get("count", len(ranks))
+    count = title_data.count
     weight_config = CONFIG["WEIGHT_CONFIG"]
 
     # 排名权重：Σ(11 - min(rank, 10)) / 出现次数
-    rank_scores = []
-    for rank in ranks:
-        score = 11 - min(rank, 10)
-        rank_scores.append(score)
-
-    rank_weight = sum(rank_scores) / len(ranks) if ranks else 0
+    rank_weight = ranks.score_sum() / len(ranks)
 
     # 频次权重：min(出现次数, 10) × 10
     frequency_weight = min(count, 10) * 10
 
     # 热度加成：高排名次数 / 总出现次数 × 100
-    high_rank_count = sum(1 for rank in ranks if rank <= rank_threshold)
-    hotness_ratio = high_rank_count / len(ranks) if ranks else 0
+    hotness_ratio = ranks.within(rank_threshold) / len(ranks)
     hotness_weight = hotness_ratio * 100
 
     total_weight = (
@@ -1224,6 +1511,194 @@ def matches_word_groups(
     return False
 
 
+# 频率词匹配缓存目录（output 下）
+MATCH_CACHE_DIR_NAME = ".match_cache"
+
+# 匹配缓存格式版本（匹配规则或结构变化时递增，旧文件会被忽略）
+MATCH_CACHE_VERSION = 1
+
+
+def get_match_cache_path() -> Path:
+    """当天的频率词匹配缓存文件：output/.match_cache/YYYY-MM-DD.pickle"""
+    return OUTPUT_DIR / MATCH_CACHE_DIR_NAME / f"{get_beijing_time().strftime('%Y-%m-%d')}.pickle"
+
+
+class MatchMemo:
+    """
+    频率词匹配结果缓存：标题 -> 匹配到的第一个词组的序号（被过滤或不匹配为 None）
+
+    匹配结果只取决于标题和频率词配置，同一标题会在当天的多个快照、多个平台和
+    多份报告中反复出现，每个标题只需匹配一次。没有配置词组时使用"全部新闻"虚拟词组，
+    与 count_word_frequency 一致；结果不为 None 等价于 matches_word_groups 返回 True。
+
+    按规范化标题（去掉首尾空白、转小写，匹配本身不区分大小写）记录的结果可以通过
+    load() / save() 按天保存，文件中记录频率词配置的指纹，修改 frequency_words.txt
+    后指纹变化，旧结果自动失效。
+    """
+
+    def __init__(
+        self,
+        word_groups: List[Dict],
+        filter_words: List[str],
+        global_filters: Optional[List[str]] = None,
+    ):
+        self.config = (word_groups, filter_words, global_filters or [])
+        if not word_groups:
+            word_groups = [{"required": [], "normal": [], "group_key": "全部新闻"}]
+            filter_words = []
+        # 实际用于匹配的词组（count_word_frequency 按序号取 group_key）
+        self.word_groups = word_groups
+        self.results: Dict[str, Optional[int]] = {}
+        # {规范化标题: 词组序号}，可持久化
+        self.normalized: Dict[str, Optional[int]] = {}
+        # 本次实际执行匹配的标题数（未命中任何缓存）
+        self.new_count = 0
+        self._fingerprint: Optional[str] = None
+
+        # 预先转为小写，匹配时只对标题做一次 lower()
+        self._global_filters = tuple(word.lower() for word in global_filters or ())
+        self._filter_words = tuple(word.lower() for word in filter_words)
+        self._groups = tuple(
+            (
+                tuple(word.lower() for word in group["required"]),
+                tuple(word.lower() for word in group["normal"]),
+            )
+            for group in word_groups
+        )
+
+    def matches_config(
+        self,
+        word_groups: List[Dict],
+        filter_words: List[str],
+        global_filters: Optional[List[str]] = None,
+    ) -> bool:
+        """是否为同一份频率词配置"""
+        return self.config == (word_groups, filter_words, global_filters or [])
+
+    @property
+    def fingerprint(self) -> str:
+        """频率词配置的指纹（实际用于匹配的词组、过滤词和全局过滤词）"""
+        if self._fingerprint is None:
+            import hashlib
+
+            # 只含字符串和列表的普通结构（匹配不区分大小写，因此使用小写形式）
+            plain = {
+                "word_groups": [
+                    {"required": [str(word) for word in required], "normal": [str(word) for word in normal]}
+                    for required, normal in self._groups
+                ],
+                "filter_words": [str(word) for word in self._filter_words],
+                "global_filters": [str(word) for word in self._global_filters],
+            }
+            try:
+                payload = json.dumps(plain, sort_keys=True)
+            except (TypeError, ValueError):
+                payload = repr(plain)
+            self._fingerprint = hashlib.sha256(payload.encode("utf-8", "surrogatepass")).hexdigest()[:16]
+        return self._fingerprint
+
+    def match(self, title: str) -> Optional[int]:
+        """返回标题匹配到的第一个词组的序号，被过滤或不匹配时返回 None"""
+        try:
+            return self.results[title]
+        except KeyError:
+            pass
+
+        # 防御性类型检查：确保 title 是有效字符串
+        if not isinstance(title, str):
+            text = str(title) if title is not None else ""
+        else:
+            text = title
+        normalized = text.strip().lower()
+        try:
+            group_index = self.normalized[normalized]
+        except KeyError:
+            group_index = self.normalized[normalized] = self._match(normalized)
+            self.new_count += 1
+
+        self.results[title] = group_index
+        return group_index
+
+    def _match(self, title_lower: str) -> Optional[int]:
+        if not title_lower:
+            return None
+
+        # 全局过滤词优先级最高，其次是词组内的过滤词
+        for word in self._global_filters:
+            if word in title_lower:
+                return None
+        for word in self._filter_words:
+            if word in title_lower:
+                return None
+
+        for index, (required_words, normal_words) in enumerate(self._groups):
+            if required_words and not all(word in title_lower for word in required_words):
+                continue
+            if normal_words and not any(word in title_lower for word in normal_words):
+                continue
+            return index
+
+        return None
+
+    def load(self, path: Path) -> int:
+        """
+        读取已保存的匹配结果（版本或频率词配置指纹不同时忽略）
+
+        Returns:
+            读取到的标题数
+        """
+        import pickle
+
+        try:
+            with open(path, "rb") as f:
+                data = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError):
+            return 0
+
+        if (
+            not isinstance(data, tuple)
+            or len(data) != 3
+            or data[0] != MATCH_CACHE_VERSION
+            or data[1] != self.fingerprint
+            or not isinstance(data[2], dict)
+        ):
+            return 0
+
+        for normalized, group_index in data[2].items():
+            self.normalized.setdefault(normalized, group_index)
+        return len(data[2])
+
+    def save(self, path: Path) -> None:
+        """保存匹配结果（先写临时文件再替换），同时删除日期早于本文件的缓存文件"""
+        import pickle
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                day = datetime.strptime(path.stem, "%Y-%m-%d")
+            except ValueError:
+                day = None
+            if day is not None and not path.exists():
+                for old_path in path.parent.glob("*.pickle"):
+                    try:
+                        old_day = datetime.strptime(old_path.stem, "%Y-%m-%d")
+                    except ValueError:
+                        continue
+                    if old_day < day:
+                        old_path.unlink()
+            tmp_path = path.with_name(f".{path.name}.tmp")
+            with open(tmp_path, "wb") as f:
+                pickle.dump(
+                    (MATCH_CACHE_VERSION, self.fingerprint, self.normalized),
+                    f,
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+            os.replace(tmp_path, path)
+        except OSError as e:
+            # 写入失败不影响本次运行，下次重新匹配
+            print(f"保存频率词匹配缓存失败: {e}")
+
+
 def format_time_display(first_time: str, last_time: str) -> str:
     """格式化时间显示"""
     if not first_time:
@@ -1234,14 +1709,13 @@ def format_time_display(first_time: str, last_time: str) -> str:
         return f"[{first_time} ~ {last_time}]"
 
 
-def format_rank_display(ranks: List[int], rank_threshold: int, format_type: str) -> str:
+def format_rank_display(ranks: RankStats, rank_threshold: int, format_type: str) -> str:
     """统一的排名格式化方法"""
     if not ranks:
         return ""
 
-    unique_ranks = sorted(set(ranks))
-    min_rank = unique_ranks[0]
-    max_rank = unique_ranks[-1]
+    min_rank = ranks.min
+    max_rank = ranks.max
 
     if format_type == "html":
         highlight_start = "<font color='red'><strong>"
@@ -1283,18 +1757,26 @@ def count_word_frequency(
     filter_words: List[str],
     id_to_name: Dict,
     title_info: Optional[Dict] = None,
-    rank_threshold: int = CONFIG["RANK_THRESHOLD"],
+    rank_threshold: Optional[int] = None,
     new_titles: Optional[Dict] = None,
     mode: str = "daily",
     global_filters: Optional[List[str]] = None,
+    match_memo: Optional[MatchMemo] = None,
 ) -> Tuple[List[Dict], int]:
-    """统计词频，支持必须词、频率词、过滤词、全局过滤词，并标记新增标题"""
+    """统计词频，支持必须词、频率词、过滤词、全局过滤词，并标记新增标题
+
+    match_memo 为同一份频率词配置的匹配结果缓存（配置不同时忽略）。
+    """
+    if rank_threshold is None:
+        rank_threshold = CONFIG["RANK_THRESHOLD"]
 
-    # 如果没有配置词组，创建一个包含所有新闻的虚拟词组
+    if match_memo is None or not match_memo.matches_config(word_groups, filter_words, global_filters):
+        match_memo = MatchMemo(word_groups, filter_words, global_filters)
+
+    # 如果没有配置词组，使用包含所有新闻的虚拟词组（过滤词清空，显示所有新闻）
     if not word_groups:
         print("频率词配置为空，将显示所有新闻")
-        word_groups = [{"required": [], "normal": [], "group_key": "全部新闻"}]
-        filter_words = []  # 清空过滤词，显示所有新闻
+    word_groups = match_memo.word_groups
 
     is_first_today = is_first_crawl_today()
 
@@ -1314,7 +1796,7 @@ def count_word_frequency(
             latest_time = None
             for source_titles in title_info.values():
                 for title_data in source_titles.values():
-                    last_time = title_data.get("last_time", "")
+                    last_time = title_data.last_time
                     if last_time:
                         if latest_time is None or last_time > latest_time:
                             latest_time = last_time
@@ -1328,7 +1810,7 @@ def count_word_frequency(
                         for title, title_data in source_titles.items():
                             if title in title_info[source_id]:
                                 info = title_info[source_id][title]
-                                if info.get("last_time") == latest_time:
+                                if info.last_time == latest_time:
                                     filtered_titles[title] = title_data
                         if filtered_titles:
                             results_to_process[source_id] = filtered_titles
@@ -1377,12 +1859,9 @@ def count_word_frequency(
             if title in processed_titles.get(source_id, {}):
                 continue
 
-            # 使用统一的匹配逻辑
-            matches_frequency_words = matches_word_groups(
-                title, word_groups, filter_words, global_filters
-            )
-
-            if not matches_frequency_words:
+            # 使用统一的匹配逻辑：找到匹配的第一个词组
+            group_index = match_memo.match(title)
+            if group_index is None:
                 continue
 
             # 如果是增量模式或 current 模式第一次，统计匹配的新增新闻数量
@@ -1391,119 +1870,65 @@ def count_word_frequency(
             ):
                 matched_new_count += 1
 
-            source_ranks = title_data.get("ranks", [])
-            source_url = title_data.get("url", "")
-            source_mobile_url = title_data.get("mobileUrl", "")
-
-            # 找到匹配的词组（防御性转换确保类型安全）
-            title_lower = str(title).lower() if not isinstance(title, str) else title.lower()
-            for group in word_groups:
-                required_words = group["required"]
-                normal_words = group["normal"]
-
-                # 如果是"全部新闻"模式，所有标题都匹配第一个（唯一的）词组
-                if len(word_groups) == 1 and word_groups[0]["group_key"] == "全部新闻":
-                    group_key = group["group_key"]
-                    word_stats[group_key]["count"] += 1
-                    if source_id not in word_stats[group_key]["titles"]:
-                        word_stats[group_key]["titles"][source_id] = []
-                else:
-                    # 原有的匹配逻辑
-                    if required_words:
-                        all_required_present = all(
-                            req_word.lower() in title_lower
-                            for req_word in required_words
-                        )
-                        if not all_required_present:
-                            continue
-
-                    if normal_words:
-                        any_normal_present = any(
-                            normal_word.lower() in title_lower
-                            for normal_word in normal_words
-                        )
-                        if not any_normal_present:
-                            continue
-
-                    group_key = group["group_key"]
-                    word_stats[group_key]["count"] += 1
-                    if source_id not in word_stats[group_key]["titles"]:
-                        word_stats[group_key]["titles"][source_id] = []
-
-                first_time = ""
-                last_time = ""
-                count_info = 1
-                ranks = source_ranks if source_ranks else []
-                url = source_url
-                mobile_url = source_mobile_url
-
-                # 对于 current 模式，从历史统计信息中获取完整数据
-                if (
-                    mode == "current"
-                    and title_info
-                    and source_id in title_info
-                    and title in title_info[source_id]
-                ):
-                    info = title_info[source_id][title]
-                    first_time = info.get("first_time", "")
-                    last_time = info.get("last_time", "")
-                    count_info = info.get("count", 1)
-                    if "ranks" in info and info["ranks"]:
-                        ranks = info["ranks"]
-                    url = info.get("url", source_url)
-                    mobile_url = info.get("mobileUrl", source_mobile_url)
-                elif (
-                    title_info
-                    and source_id in title_info
-                    and title in title_info[source_id]
-                ):
-                    info = title_info[source_id][title]
-                    first_time = info.get("first_time", "")
-                    last_time = info.get("last_time", "")
-                    count_info = info.get("count", 1)
-                    if "ranks" in info and info["ranks"]:
-                        ranks = info["ranks"]
-                    url = info.get("url", source_url)
-                    mobile_url = info.get("mobileUrl", source_mobile_url)
-
-                if not ranks:
-                    ranks = [99]
-
-                time_display = format_time_display(first_time, last_time)
-
-                source_name = id_to_name.get(source_id, source_id)
-
-                # 判断是否为新增
-                is_new = False
-                if all_news_are_new:
-                    # 增量模式下所有处理的新闻都是新增，或者当天第一次的所有新闻都是新增
-                    is_new = True
-                elif new_titles and source_id in new_titles:
-                    # 检查是否在新增列表中
-                    new_titles_for_source = new_titles[source_id]
-                    is_new = title in new_titles_for_source
-
-                word_stats[group_key]["titles"][source_id].append(
-                    {
-                        "title": title,
-                        "source_name": source_name,
-                        "first_time": first_time,
-                        "last_time": last_time,
-                        "time_display": time_display,
-                        "count": count_info,
-                        "ranks": ranks,
-                        "rank_threshold": rank_threshold,
-                        "url": url,
-                        "mobileUrl": mobile_url,
-                        "is_new": is_new,
-                    }
+            group_key = word_groups[group_index]["group_key"]
+            word_stats[group_key]["count"] += 1
+            if source_id not in word_stats[group_key]["titles"]:
+                word_stats[group_key]["titles"][source_id] = []
+
+            first_time = ""
+            last_time = ""
+            count_info = 1
+            ranks = title_data.ranks
+            url = title_data.url
+            mobile_url = title_data.mobile_url
+
+            # 从历史统计信息中获取完整数据（current 模式同样适用）
+            if title_info and source_id in title_info and title in title_info[source_id]:
+                info = title_info[source_id][title]
+                first_time = info.first_time
+                last_time = info.last_time
+                count_info = info.count
+                if info.ranks:
+                    ranks = info.ranks
+                url = info.url
+                mobile_url = info.mobile_url
+
+            if not ranks:
+                ranks = RankStats((99,))
+
+            time_display = format_time_display(first_time, last_time)
+
+            source_name = id_to_name.get(source_id, source_id)
+
+            # 判断是否为新增
+            is_new = False
+            if all_news_are_new:
+                # 增量模式下所有处理的新闻都是新增，或者当天第一次的所有新闻都是新增
+                is_new = True
+            elif new_titles and source_id in new_titles:
+                # 检查是否在新增列表中
+                new_titles_for_source = new_titles[source_id]
+                is_new = title in new_titles_for_source
+
+            word_stats[group_key]["titles"][source_id].append(
+                MatchedTitle(
+                    title,
+                    source_name,
+                    first_time,
+                    last_time,
+                    time_display,
+                    count_info,
+                    ranks,
+                    rank_threshold,
+                    url,
+                    mobile_url,
+                    is_new,
                 )
+            )
 
-                if source_id not in processed_titles:
-                    processed_titles[source_id] = {}
-                processed_titles[source_id][title] = True
-
-                break
+            if source_id not in processed_titles:
+                processed_titles[source_id] = {}
+            processed_titles[source_id][title] = True
 
     # 最后统一打印汇总信息
     if mode == "incremental":
@@ -1574,8 +1999,8 @@ def count_word_frequency(
             all_titles,
             key=lambda x: (
                 -calculate_news_weight(x, rank_threshold),
-                min(x["ranks"]) if x["ranks"] else 999,
-                -x["count"],
+                x.ranks.min if x.ranks else 999,
+                -x.count,
             ),
         )
 
@@ -1620,6 +2045,7 @@ def prepare_report_data(
     new_titles: Optional[Dict] = None,
     id_to_name: Optional[Dict] = None,
     mode: str = "daily",
+    match_memo: Optional[MatchMemo] = None,
 ) -> Dict:
     """准备报告数据"""
     processed_new_titles = []
@@ -1632,10 +2058,12 @@ def prepare_report_data(
         filtered_new_titles = {}
         if new_titles and id_to_name:
             word_groups, filter_words, global_filters = load_frequency_words()
+            if match_memo is None or not match_memo.matches_config(word_groups, filter_words, global_filters):
+                match_memo = MatchMemo(word_groups, filter_words, global_filters)
             for source_id, titles_data in new_titles.items():
                 filtered_titles = {}
                 for title, title_data in titles_data.items():
-                    if matches_word_groups(title, word_groups, filter_words, global_filters):
+                    if match_memo.match(title) is not None:
                         filtered_titles[title] = title_data
                 if filtered_titles:
                     filtered_new_titles[source_id] = filtered_titles
@@ -1646,19 +2074,15 @@ def prepare_report_data(
                 source_titles = []
 
                 for title, title_data in titles_data.items():
-                    url = title_data.get("url", "")
-                    mobile_url = title_data.get("mobileUrl", "")
-                    ranks = title_data.get("ranks", [])
-
                     processed_title = {
                         "title": title,
                         "source_name": source_name,
                         "time_display": "",
                         "count": 1,
-                        "ranks": ranks,
+                        "ranks": title_data.ranks,
                         "rank_threshold": CONFIG["RANK_THRESHOLD"],
-                        "url": url,
-                        "mobile_url": mobile_url,
+                        "url": title_data.url,
+                        "mobile_url": title_data.mobile_url,
                         "is_new": True,
                     }
                     source_titles.append(processed_title)
@@ -1680,15 +2104,15 @@ def prepare_report_data(
         processed_titles = []
         for title_data in stat["titles"]:
             processed_title = {
-                "title": title_data["title"],
-                "source_name": title_data["source_name"],
-                "time_display": title_data["time_display"],
-                "count": title_data["count"],
-                "ranks": title_data["ranks"],
-                "rank_threshold": title_data["rank_threshold"],
-                "url": title_data.get("url", ""),
-                "mobile_url": title_data.get("mobileUrl", ""),
-                "is_new": title_data.get("is_new", False),
+                "title": title_data.title,
+                "source_name": title_data.source_name,
+                "time_display": title_data.time_display,
+                "count": title_data.count,
+                "ranks": title_data.ranks,
+                "rank_threshold": title_data.rank_threshold,
+                "url": title_data.url,
+                "mobile_url": title_data.mobile_url,
+                "is_new": title_data.is_new,
             }
             processed_titles.append(processed_title)
 
@@ -1906,6 +2330,7 @@ def generate_html_report(
     mode: str = "daily",
     is_daily_summary: bool = False,
     update_info: Optional[Dict] = None,
+    match_memo: Optional[MatchMemo] = None,
 ) -> str:
     """生成HTML报告"""
     if is_daily_summary:
@@ -1920,7 +2345,9 @@ def generate_html_report(
 
     file_path = get_output_path("html", filename)
 
-    report_data = prepare_report_data(stats, failed_ids, new_titles, id_to_name, mode)
+    report_data = prepare_report_data(
+        stats, failed_ids, new_titles, id_to_name, mode, match_memo
+    )
 
     html_content = render_html_content(
         report_data, total_titles, is_daily_summary, mode, update_info
@@ -1928,16 +2355,16 @@ def generate_html_report(
 
     with open(file_path, "w", encoding="utf-8") as f:
         f.write(html_content)
+    RUN_TIMER.add("render.bytes", len(html_content.encode("utf-8")))
 
     if is_daily_summary:
         # 生成到根目录（供 GitHub Pages 访问）
-        root_index_path = Path("index.html")
-        with open(root_index_path, "w", encoding="utf-8") as f:
+        with open(ROOT_INDEX_PATH, "w", encoding="utf-8") as f:
             f.write(html_content)
 
         # 同时生成到 output 目录（供 Docker Volume 挂载访问）
-        output_index_path = Path("output") / "index.html"
-        ensure_directory_exists("output")
+        output_index_path = OUTPUT_DIR / "index.html"
+        ensure_directory_exists(str(OUTPUT_DIR))
         with open(output_index_path, "w", encoding="utf-8") as f:
             f.write(html_content)
 
@@ -2495,10 +2922,10 @@ def render_html_content(
                                 <span class="source-name">{html_escape(title_data["source_name"])}</span>"""
 
                 # 处理排名显示
-                ranks = title_data.get("ranks", [])
+                ranks = title_data.get("ranks")
                 if ranks:
-                    min_rank = min(ranks)
-                    max_rank = max(ranks)
+                    min_rank = ranks.min
+                    max_rank = ranks.max
                     rank_threshold = title_data.get("rank_threshold", 10)
 
                     # 确定排名等级
@@ -2573,21 +3000,21 @@ def render_html_content(
 
             # 为新增新闻也添加序号
             for idx, title_data in enumerate(source_data["titles"], 1):
-                ranks = title_data.get("ranks", [])
+                ranks = title_data.get("ranks")
 
                 # 处理新增新闻的排名显示
                 rank_class = ""
                 if ranks:
-                    min_rank = min(ranks)
+                    min_rank = ranks.min
                     if min_rank <= 3:
                         rank_class = "top"
                     elif min_rank <= title_data.get("rank_threshold", 10):
                         rank_class = "high"
 
                     if len(ranks) == 1:
-                        rank_text = str(ranks[0])
+                        rank_text = str(ranks.first)
                     else:
-                        rank_text = f"{min(ranks)}-{max(ranks)}"
+                        rank_text = f"{ranks.min}-{ranks.max}"
                 else:
                     rank_text = "?"
 
@@ -4029,6 +4456,7 @@ def send_to_notifications(
     proxy_url: Optional[str] = None,
     mode: str = "daily",
     html_file_path: Optional[str] = None,
+    match_memo: Optional[MatchMemo] = None,
 ) -> Dict[str, bool]:
     """发送数据到多个通知平台（支持多账号）"""
     results = {}
@@ -4053,7 +4481,9 @@ def send_to_notifications(
             else:
                 print(f"推送窗口控制：今天首次推送")
 
-    report_data = prepare_report_data(stats, failed_ids, new_titles, id_to_name, mode)
+    report_data = prepare_report_data(
+        stats, failed_ids, new_titles, id_to_name, mode, match_memo
+    )
 
     update_info_to_send = update_info if CONFIG["SHOW_VERSION_UPDATE"] else None
 
@@ -4184,15 +4614,16 @@ def send_to_notifications(
     email_smtp_server = CONFIG.get("EMAIL_SMTP_SERVER", "")
     email_smtp_port = CONFIG.get("EMAIL_SMTP_PORT", "")
     if email_from and email_password and email_to:
-        results["email"] = send_to_email(
-            email_from,
-            email_password,
-            email_to,
-            report_type,
-            html_file_path,
-            email_smtp_server,
-            email_smtp_port,
-        )
+        with RUN_TIMER.stage("notify.email"):
+            results["email"] = send_to_email(
+                email_from,
+                email_password,
+                email_to,
+                report_type,
+                html_file_path,
+                email_smtp_server,
+                email_smtp_port,
+            )
 
     if not results:
         print("未配置任何通知渠道，跳过通知发送")
@@ -4209,6 +4640,62 @@ def send_to_notifications(
     return results
 
 
+def send_to_null_sink(
+    stats: List[Dict],
+    failed_ids: Optional[List] = None,
+    new_titles: Optional[Dict] = None,
+    id_to_name: Optional[Dict] = None,
+    update_info: Optional[Dict] = None,
+    mode: str = "daily",
+    match_memo: Optional[MatchMemo] = None,
+) -> Dict[str, int]:
+    """按各推送渠道的格式和批次大小生成消息批次但不发送（回放模式使用），返回各格式的批次数"""
+    report_data = prepare_report_data(
+        stats, failed_ids, new_titles, id_to_name, mode, match_memo
+    )
+    update_info_to_send = update_info if CONFIG["SHOW_VERSION_UPDATE"] else None
+
+    # (分批格式, 批次头部格式, 批次大小)，与各 send_to_* 函数保持一致
+    formats = [
+        ("feishu", "feishu", CONFIG.get("FEISHU_BATCH_SIZE", 29000)),
+        ("dingtalk", "dingtalk", CONFIG.get("DINGTALK_BATCH_SIZE", 20000)),
+        ("wework", "wework", CONFIG.get("MESSAGE_BATCH_SIZE", 4000)),
+        ("wework", "wework_text", CONFIG.get("MESSAGE_BATCH_SIZE", 4000)),
+        ("telegram", "telegram", CONFIG.get("MESSAGE_BATCH_SIZE", 4000)),
+        ("ntfy", "ntfy", 3800),
+        ("bark", "bark", CONFIG["BARK_BATCH_SIZE"]),
+        ("slack", "slack", CONFIG["SLACK_BATCH_SIZE"]),
+    ]
+
+    batch_counts = {}
+    for format_type, header_format_type, batch_size in formats:
+        header_reserve = _get_max_batch_header_size(header_format_type)
+        batches = split_content_into_batches(
+            report_data,
+            format_type,
+            update_info_to_send,
+            max_bytes=batch_size - header_reserve,
+            mode=mode,
+        )
+        batches = add_batch_headers(batches, header_format_type, batch_size)
+        batch_counts[header_format_type] = len(batches)
+
+    return batch_counts
+
+
+def _post_message(channel: str, url: str, **kwargs):
+    """发送一条推送消息（requests.post），记录耗时、次数和请求体字节数"""
+    import requests
+
+    body = kwargs.get("data")
+    if body is None:
+        body = json.dumps(kwargs.get("json")).encode("utf-8")
+    RUN_TIMER.add(f"notify.{channel}.bytes", len(body))
+
+    with RUN_TIMER.stage(f"notify.{channel}"):
+        return requests.post(url, **kwargs)
+
+
 def send_to_feishu(
     webhook_url: str,
     report_data: Dict,
@@ -4242,8 +4729,8 @@ def send_to_feishu(
         }
 
         try:
-            response = requests.post(
-                webhook_url, headers=headers, json=payload, proxies=proxies, timeout=30
+            response = _post_message(
+                "feishu", webhook_url, headers=headers, json=payload, proxies=proxies, timeout=30
             )
             if response.status_code == 200:
                 result = response.json()
@@ -4303,8 +4790,8 @@ def send_to_feishu(
         }
 
         try:
-            response = requests.post(
-                webhook_url, headers=headers, json=payload, proxies=proxies, timeout=30
+            response = _post_message(
+                "feishu", webhook_url, headers=headers, json=payload, proxies=proxies, timeout=30
             )
             if response.status_code == 200:
                 result = response.json()
@@ -4384,8 +4871,8 @@ def send_to_dingtalk(
         }
 
         try:
-            response = requests.post(
-                webhook_url, headers=headers, json=payload, proxies=proxies, timeout=30
+            response = _post_message(
+                "dingtalk", webhook_url, headers=headers, json=payload, proxies=proxies, timeout=30
             )
             if response.status_code == 200:
                 result = response.json()
@@ -4516,8 +5003,8 @@ def send_to_wework(
         )
 
         try:
-            response = requests.post(
-                webhook_url, headers=headers, json=payload, proxies=proxies, timeout=30
+            response = _post_message(
+                "wework", webhook_url, headers=headers, json=payload, proxies=proxies, timeout=30
             )
             if response.status_code == 200:
                 result = response.json()
@@ -4592,8 +5079,8 @@ def send_to_telegram(
         }
 
         try:
-            response = requests.post(
-                url, headers=headers, json=payload, proxies=proxies, timeout=30
+            response = _post_message(
+                "telegram", url, headers=headers, json=payload, proxies=proxies, timeout=30
             )
             if response.status_code == 200:
                 result = response.json()
@@ -4630,6 +5117,12 @@ def send_to_email(
     custom_smtp_port: Optional[int] = None,
 ) -> bool:
     """发送邮件通知"""
+    import smtplib
+    from email.header import Header
+    from email.mime.multipart import MIMEMultipart
+    from email.mime.text import MIMEText
+    from email.utils import formataddr, formatdate, make_msgid
+
     try:
         if not html_file_path or not Path(html_file_path).exists():
             print(f"错误：HTML文件不存在或未提供: {html_file_path}")
@@ -4772,6 +5265,8 @@ def send_to_ntfy(
     account_label: str = "",
 ) -> bool:
     """发送到ntfy（支持分批发送，严格遵守4KB限制）"""
+    import requests
+
     # 日志前缀
     log_prefix = f"ntfy{account_label}" if account_label else "ntfy"
 
@@ -4848,7 +5343,8 @@ def send_to_ntfy(
             )
 
         try:
-            response = requests.post(
+            response = _post_message(
+                "ntfy",
                 url,
                 headers=current_headers,
                 data=batch_content.encode("utf-8"),
@@ -4869,7 +5365,8 @@ def send_to_ntfy(
                 )
                 time.sleep(10)  # 等待10秒后重试
                 # 重试一次
-                retry_response = requests.post(
+                retry_response = _post_message(
+                    "ntfy",
                     url,
                     headers=current_headers,
                     data=batch_content.encode("utf-8"),
@@ -4927,6 +5424,8 @@ def send_to_bark(
     account_label: str = "",
 ) -> bool:
     """发送到Bark（支持分批发送，使用 markdown 格式）"""
+    import requests
+
     # 日志前缀
     log_prefix = f"Bark{account_label}" if account_label else "Bark"
 
@@ -4995,7 +5494,8 @@ def send_to_bark(
         }
 
         try:
-            response = requests.post(
+            response = _post_message(
+                "bark",
                 api_endpoint,
                 json=payload,
                 proxies=proxies,
@@ -5108,8 +5608,8 @@ def send_to_slack(
         }
 
         try:
-            response = requests.post(
-                webhook_url, headers=headers, json=payload, proxies=proxies, timeout=30
+            response = _post_message(
+                "slack", webhook_url, headers=headers, json=payload, proxies=proxies, timeout=30
             )
 
             # Slack Incoming Webhooks 成功时返回 "ok" 文本
@@ -5132,6 +5632,141 @@ def send_to_slack(
     return True
 
 
+# === 爬取流水线 ===
+class CrawlPipeline:
+    """
+    爬取流水线：处理已收到的平台数据与请求其余平台同时进行
+
+    爬取线程每处理完一个平台的响应就交给后台线程：追加写入本次快照 → 解析写入的段落 →
+    合并到当天聚合 → 预先匹配频率词。后台线程在第一个响应到达之前先合并当天已有的快照，
+    并读取当天的匹配缓存（之前的运行中匹配过的标题不再重新匹配），处理完后保存匹配缓存。
+    爬取结束时快照已经写好，分析阶段直接使用当天聚合（DayAggregate）和匹配缓存（MatchMemo）。
+
+    快照文件名在爬取开始时确定。后台线程出错、同一平台重复出现或爬取期间跨天时，
+    finish() 返回 None，调用方按原流程在爬取结束后保存快照并重新读取当天数据。
+    """
+
+    def __init__(self, platform_ids: List[str]):
+        self.platform_ids = platform_ids
+        self.date_folder = format_date_folder()
+        self.file_path = get_output_path("txt", f"{format_time_filename()}.txt")
+        self.match_cache_path = get_match_cache_path()
+        # 后台线程的分阶段计时，finish() 时作为 pipeline 的子阶段合并到 RUN_TIMER；
+        # 运行开启了性能分析时，后台线程的阶段也计入同一个分析会话
+        self.timer = StageTimer(profile_prefix="pipeline.")
+        self.timer.profile = RUN_TIMER.profile
+        self.day = None
+        self.match_memo = None
+        self.error: Optional[Exception] = None
+        self._writer: Optional[SnapshotWriter] = None
+        self._seen = set()
+        self._duplicate = False
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="crawl-pipeline", daemon=True)
+
+    def start(self) -> "CrawlPipeline":
+        """启动后台线程"""
+        self._thread.start()
+        return self
+
+    def add_platform(self, id_value: str, name: Optional[str], title_data: Dict) -> None:
+        """交给后台线程处理一个平台的数据（爬取线程调用，之后不再修改 title_data）"""
+        if id_value in self._seen:
+            self._duplicate = True
+            return
+        self._seen.add(id_value)
+        self._queue.put((id_value, name, title_data))
+
+    def _run(self) -> None:
+        try:
+            with self.timer.stage("history"):
+                self._prepare()
+        except Exception as e:
+            self.error = e
+
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            if self.error is not None:
+                continue
+            try:
+                self._process(*item)
+            except Exception as e:
+                self.error = e
+
+        if self.error is None and self.match_memo.new_count:
+            with self.timer.stage("match_cache"):
+                self.match_memo.save(self.match_cache_path)
+        if self.match_memo is not None:
+            self.timer.add("match.new", self.match_memo.new_count)
+
+    def _prepare(self) -> None:
+        """合并当天已有的快照并预先匹配其中的标题，然后开始写入本次快照"""
+        word_groups, filter_words, global_filters = load_frequency_words()
+        self.match_memo = MatchMemo(word_groups, filter_words, global_filters)
+        self.timer.add("match_cache.titles", self.match_memo.load(self.match_cache_path))
+
+        snapshot_path = Path(self.file_path)
+        self.day = DayAggregate(snapshot_path.parent, self.platform_ids)
+        files = sorted(
+            f for f in snapshot_path.parent.iterdir()
+            if f.suffix == ".txt" and f.name != snapshot_path.name
+        )
+        for file_path in files:
+            self.day.add_file(file_path)
+        self.day.begin_snapshot(snapshot_path.name)
+        self.timer.add("history.files", len(files))
+
+        for titles in self.day.all_results.values():
+            for title in titles:
+                self.match_memo.match(title)
+
+        self._writer = SnapshotWriter(self.file_path)
+
+    def _process(self, id_value: str, name: Optional[str], title_data: Dict) -> None:
+        with self.timer.stage("save"):
+            text = self._writer.write_section(id_value, name, title_data)
+        with self.timer.stage("aggregate"):
+            records = read_snapshot_text_records(text)
+            self.day.add_section(records)
+        with self.timer.stage("match"):
+            # 爬取结果中的原始标题（非 current 模式直接统计）和快照中清理后的标题
+            for title in title_data:
+                self.match_memo.match(title)
+            for record in records:
+                self.match_memo.match(record[3])
+        self.timer.add("platforms")
+
+    def finish(self, results: Dict, failed_ids: List) -> Optional[str]:
+        """
+        等待后台线程处理完所有平台，完成本次快照
+
+        Returns:
+            快照文件路径；流水线没有完整处理本次爬取结果时返回 None（快照未写入）
+        """
+        self._queue.put(None)
+        self._thread.join()
+        RUN_TIMER.merge(self.timer, "pipeline")
+
+        writer = self._writer
+        complete = (
+            self.error is None
+            and not self._duplicate
+            and writer is not None
+            and writer.platform_ids == list(results.keys())
+            and format_date_folder() == self.date_folder
+        )
+        if not complete:
+            if writer is not None:
+                writer.discard()
+            if self.error is not None:
+                print(f"爬取流水线出错，改为爬取结束后统一处理: {self.error}")
+            return None
+
+        return writer.close(failed_ids)
+
+
 # === 主分析器 ===
 class NewsAnalyzer:
     """新闻分析器"""
@@ -5167,7 +5802,7 @@ class NewsAnalyzer:
         },
     }
 
-    def __init__(self):
+    def __init__(self, replay: bool = False, profiler=None):
         self.request_interval = CONFIG["REQUEST_INTERVAL"]
         self.report_mode = CONFIG["REPORT_MODE"]
         self.rank_threshold = CONFIG["RANK_THRESHOLD"]
@@ -5175,10 +5810,20 @@ class NewsAnalyzer:
         self.is_docker_container = self._detect_docker_environment()
         self.update_info = None
         self.proxy_url = None
+        # 回放模式：数据来自已保存的快照，通知只生成消息批次不发送，不打开浏览器
+        self.replay = replay
+        self.timer = RUN_TIMER
+        # 性能分析配置（trendradar_core.profiling.Profiler），None 表示不分析
+        self.profiler = profiler
+        self.failed_ids: List = []
+        # 本次运行的爬取流水线结果：当天聚合、频率词匹配缓存和已写入的快照路径
+        self.day: Optional[DayAggregate] = None
+        self.match_memo: Optional[MatchMemo] = None
+        self.snapshot_path: Optional[str] = None
         self._setup_proxy()
-        self.data_fetcher = DataFetcher(self.proxy_url)
+        self.data_fetcher = DataFetcher(self.proxy_url, CONFIG["API_URL"])
 
-        if self.is_github_actions:
+        if self.is_github_actions and not self.replay:
             self._check_version_update()
 
     def _detect_docker_environment(self) -> bool:
@@ -5196,7 +5841,7 @@ class NewsAnalyzer:
 
     def _should_open_browser(self) -> bool:
         """判断是否应该打开浏览器"""
-        return not self.is_github_actions and not self.is_docker_container
+        return not self.is_github_actions and not self.is_docker_container and not self.replay
 
     def _setup_proxy(self) -> None:
         """设置代理配置"""
@@ -5268,6 +5913,13 @@ class NewsAnalyzer:
         self,
     ) -> Optional[Tuple[Dict, Dict, Dict, Dict, List, List]]:
         """统一的数据加载和预处理，使用当前监控平台列表过滤历史数据"""
+        with self.timer.stage("aggregate"):
+            return self._read_analysis_data()
+
+    def _read_analysis_data(
+        self,
+    ) -> Optional[Tuple[Dict, Dict, Dict, Dict, List, List]]:
+        """读取当天全部数据、新增标题和频率词配置"""
         try:
             # 获取当前配置的监控平台ID列表
             current_platform_ids = []
@@ -5277,7 +5929,7 @@ class NewsAnalyzer:
             print(f"当前监控平台: {current_platform_ids}")
 
             all_results, id_to_name, title_info = read_all_today_titles(
-                current_platform_ids
+                current_platform_ids, self.day
             )
 
             if not all_results:
@@ -5285,9 +5937,10 @@ class NewsAnalyzer:
                 return None
 
             total_titles = sum(len(titles) for titles in all_results.values())
+            self.timer.add("aggregate.titles", total_titles)
             print(f"读取到 {total_titles} 个标题（已按当前监控平台过滤）")
 
-            new_titles = detect_latest_new_titles(current_platform_ids)
+            new_titles = detect_latest_new_titles(current_platform_ids, self.day)
             word_groups, filter_words, global_filters = load_frequency_words()
 
             return (
@@ -5309,18 +5962,14 @@ class NewsAnalyzer:
         for source_id, titles_data in results.items():
             title_info[source_id] = {}
             for title, title_data in titles_data.items():
-                ranks = title_data.get("ranks", [])
-                url = title_data.get("url", "")
-                mobile_url = title_data.get("mobileUrl", "")
-
-                title_info[source_id][title] = {
-                    "first_time": time_info,
-                    "last_time": time_info,
-                    "count": 1,
-                    "ranks": ranks,
-                    "url": url,
-                    "mobileUrl": mobile_url,
-                }
+                info = NewsItem(
+                    url=title_data.url,
+                    mobile_url=title_data.mobile_url,
+                    first_time=time_info,
+                    last_time=time_info,
+                )
+                info.ranks.merge(title_data.ranks)
+                title_info[source_id][title] = info
         return title_info
 
     def _run_analysis_pipeline(
@@ -5339,29 +5988,34 @@ class NewsAnalyzer:
         """统一的分析流水线：数据处理 → 统计计算 → HTML生成"""
 
         # 统计计算
-        stats, total_titles = count_word_frequency(
-            data_source,
-            word_groups,
-            filter_words,
-            id_to_name,
-            title_info,
-            self.rank_threshold,
-            new_titles,
-            mode=mode,
-            global_filters=global_filters,
-        )
+        with self.timer.stage("match"):
+            stats, total_titles = count_word_frequency(
+                data_source,
+                word_groups,
+                filter_words,
+                id_to_name,
+                title_info,
+                self.rank_threshold,
+                new_titles,
+                mode=mode,
+                global_filters=global_filters,
+                match_memo=self.match_memo,
+            )
+        self.timer.add("match.titles", total_titles)
 
         # HTML生成
-        html_file = generate_html_report(
-            stats,
-            total_titles,
-            failed_ids=failed_ids,
-            new_titles=new_titles,
-            id_to_name=id_to_name,
-            mode=mode,
-            is_daily_summary=is_daily_summary,
-            update_info=self.update_info if CONFIG["SHOW_VERSION_UPDATE"] else None,
-        )
+        with self.timer.stage("render"):
+            html_file = generate_html_report(
+                stats,
+                total_titles,
+                failed_ids=failed_ids,
+                new_titles=new_titles,
+                id_to_name=id_to_name,
+                mode=mode,
+                is_daily_summary=is_daily_summary,
+                update_info=self.update_info if CONFIG["SHOW_VERSION_UPDATE"] else None,
+                match_memo=self.match_memo,
+            )
 
         return stats, html_file
 
@@ -5376,6 +6030,22 @@ class NewsAnalyzer:
         html_file_path: Optional[str] = None,
     ) -> bool:
         """统一的通知发送逻辑，包含所有判断条件"""
+        if self.replay:
+            # 回放模式：不论是否配置通知渠道，都按全部渠道格式生成消息批次
+            if not self._has_valid_content(stats, new_titles):
+                return False
+            with self.timer.stage("notify"):
+                send_to_null_sink(
+                    stats,
+                    failed_ids or [],
+                    new_titles,
+                    id_to_name,
+                    self.update_info,
+                    mode=mode,
+                    match_memo=self.match_memo,
+                )
+            return True
+
         has_notification = self._has_notification_configured()
 
         if (
@@ -5383,17 +6053,19 @@ class NewsAnalyzer:
             and has_notification
             and self._has_valid_content(stats, new_titles)
         ):
-            send_to_notifications(
-                stats,
-                failed_ids or [],
-                report_type,
-                new_titles,
-                id_to_name,
-                self.update_info,
-                self.proxy_url,
-                mode=mode,
-                html_file_path=html_file_path,
-            )
+            with self.timer.stage("notify"):
+                send_to_notifications(
+                    stats,
+                    failed_ids or [],
+                    report_type,
+                    new_titles,
+                    id_to_name,
+                    self.update_info,
+                    self.proxy_url,
+                    mode=mode,
+                    html_file_path=html_file_path,
+                    match_memo=self.match_memo,
+                )
             return True
         elif CONFIG["ENABLE_NOTIFICATION"] and not has_notification:
             print("⚠️ 警告：通知功能已启用但未配置任何通知渠道，将跳过通知发送")
@@ -5524,17 +6196,64 @@ class NewsAnalyzer:
             f"配置的监控平台: {[p.get('name', p['id']) for p in CONFIG['PLATFORMS']]}"
         )
         print(f"开始爬取数据，请求间隔 {self.request_interval} 毫秒")
-        ensure_directory_exists("output")
-
-        results, id_to_name, failed_ids = self.data_fetcher.crawl_websites(
-            ids, self.request_interval
-        )
+        if CONFIG["API_URL"] != DEFAULT_API_URL:
+            print(f"使用自定义接口地址: {CONFIG['API_URL']}")
+        ensure_directory_exists(str(OUTPUT_DIR))
+
+        pipeline = self._start_pipeline()
+        with self.timer.stage("crawl"):
+            results, id_to_name, failed_ids = self.data_fetcher.crawl_websites(
+                ids, self.request_interval, on_platform=pipeline.add_platform
+            )
 
-        title_file = save_titles_to_file(results, id_to_name, failed_ids)
+        title_file = self._finish_pipeline(pipeline, results, id_to_name, failed_ids)
         print(f"标题已保存到: {title_file}")
 
         return results, id_to_name, failed_ids
 
+    def _start_pipeline(self) -> CrawlPipeline:
+        """启动爬取流水线（快照文件名按当前时间确定）"""
+        self.day = None
+        self.match_memo = None
+        self.snapshot_path = None
+        return CrawlPipeline([platform["id"] for platform in CONFIG["PLATFORMS"]]).start()
+
+    def _finish_pipeline(
+        self, pipeline: CrawlPipeline, results: Dict, id_to_name: Dict, failed_ids: List
+    ) -> str:
+        """等待爬取流水线完成快照，流水线未能完整处理时按原流程保存快照"""
+        with self.timer.stage("pipeline"):
+            title_file = pipeline.finish(results, failed_ids)
+        if title_file is not None:
+            self.day = pipeline.day
+            self.match_memo = pipeline.match_memo
+        else:
+            with self.timer.stage("save"):
+                title_file = save_titles_to_file(results, id_to_name, failed_ids)
+        self.snapshot_path = title_file
+        return title_file
+
+    def _load_snapshot(self, file_path: Path) -> Tuple[Dict, Dict, List]:
+        """读取已保存的快照（回放模式下代替数据爬取），并像爬取一样保存到输出目录"""
+        with self.timer.stage("load"):
+            results, parsed_names = parse_file_titles(file_path)
+            failed_ids = read_failed_ids(file_path)
+
+            # 与爬取结果一致：id_to_name 包含所有配置的平台（含请求失败的平台）
+            id_to_name = {
+                platform["id"]: platform.get("name", platform["id"])
+                for platform in CONFIG["PLATFORMS"]
+            }
+            id_to_name.update(parsed_names)
+
+        # 与爬取相同，快照中的平台逐个送入爬取流水线
+        pipeline = self._start_pipeline()
+        for id_value, title_data in results.items():
+            pipeline.add_platform(id_value, id_to_name.get(id_value), title_data)
+        self._finish_pipeline(pipeline, results, id_to_name, failed_ids)
+
+        return results, id_to_name, failed_ids
+
     def _execute_mode_strategy(
         self, mode_strategy: Dict, results: Dict, id_to_name: Dict, failed_ids: List
     ) -> Optional[str]:
@@ -5542,9 +6261,11 @@ class NewsAnalyzer:
         # 获取当前监控平台ID列表
         current_platform_ids = [platform["id"] for platform in CONFIG["PLATFORMS"]]
 
-        new_titles = detect_latest_new_titles(current_platform_ids)
-        time_info = Path(save_titles_to_file(results, id_to_name, failed_ids)).stem
-        word_groups, filter_words, global_filters = load_frequency_words()
+        with self.timer.stage("aggregate"):
+            new_titles = detect_latest_new_titles(current_platform_ids, self.day)
+        time_info = Path(self.snapshot_path).stem
+        with self.timer.stage("aggregate"):
+            word_groups, filter_words, global_filters = load_frequency_words()
 
         # current模式下，实时推送需要使用完整的历史数据来保证统计信息的完整性
         if self.report_mode == "current":
@@ -5597,7 +6318,8 @@ class NewsAnalyzer:
                 print("❌ 严重错误：无法读取刚保存的数据文件")
                 raise RuntimeError("数据一致性检查失败：保存后立即读取失败")
         else:
-            title_info = self._prepare_current_title_info(results, time_info)
+            with self.timer.stage("aggregate"):
+                title_info = self._prepare_current_title_info(results, time_info)
             stats, html_file = self._run_analysis_pipeline(
                 results,
                 self.report_mode,
@@ -5638,6 +6360,8 @@ class NewsAnalyzer:
 
         # 打开浏览器（仅在非容器环境）
         if self._should_open_browser() and html_file:
+            import webbrowser
+
             if summary_html:
                 summary_url = "file://" + str(Path(summary_html).resolve())
                 print(f"正在打开汇总报告: {summary_url}")
@@ -5654,25 +6378,287 @@ class NewsAnalyzer:
 
         return summary_html
 
+    def replay_snapshot(self, file_path: Path) -> None:
+        """回放一个已保存的快照：用快照代替爬取，其余流程与 run() 相同"""
+        mode_strategy = self._get_mode_strategy()
+        results, id_to_name, failed_ids = self._load_snapshot(file_path)
+        self._execute_mode_strategy(mode_strategy, results, id_to_name, failed_ids)
+
+    def _write_run_record(self, started_at: datetime, duration: float, error: Optional[str]) -> None:
+        """运行结束后写入运行记录（output/.metrics/runs.jsonl）和 Prometheus textfile"""
+        if not CONFIG["METRICS"]["ENABLED"]:
+            return
+
+        record = {
+            "started_at": started_at.strftime("%Y-%m-%d %H:%M:%S"),
+            "timestamp": round(started_at.timestamp(), 3),
+            "duration_seconds": round(duration, 3),
+            "status": "error" if error else "ok",
+            "error": error,
+            "version": VERSION,
+            "report_mode": self.report_mode,
+            "failed_ids": self.failed_ids,
+            "stages": {
+                item["stage"]: {"seconds": round(item["seconds"], 4), "count": item["count"]}
+                for item in self.timer.summary()
+            },
+            "counters": dict(sorted(self.timer.counters.items())),
+        }
+
+        try:
+            append_run_record(record)
+            textfile = CONFIG["METRICS"]["PROMETHEUS_TEXTFILE"]
+            if textfile:
+                write_prometheus_textfile(record, textfile)
+        except OSError as e:
+            print(f"写入运行记录失败: {e}")
+
     def run(self) -> None:
         """执行分析流程"""
+        started_at = get_beijing_time()
+        start = time.perf_counter()
+        self.timer.reset()
+        profile = self.profiler.session("run") if self.profiler else None
+        if profile is not None:
+            profile.start()
+            self.timer.profile = profile
+        error = None
         try:
             self._initialize_and_check_config()
 
             mode_strategy = self._get_mode_strategy()
 
             results, id_to_name, failed_ids = self._crawl_data()
+            self.failed_ids = failed_ids
 
             self._execute_mode_strategy(mode_strategy, results, id_to_name, failed_ids)
 
         except Exception as e:
+            error = str(e)
             print(f"分析流程执行出错: {e}")
             raise
+        finally:
+            self._write_run_record(started_at, time.perf_counter() - start, error)
+            if profile is not None:
+                self.timer.profile = None
+                print(f"性能分析结果已保存: {profile.finish()}")
+
+
+def append_run_record(record: Dict) -> Path:
+    """追加一条运行记录到 output/.metrics/runs.jsonl"""
+    metrics_dir = OUTPUT_DIR / ".metrics"
+    metrics_dir.mkdir(parents=True, exist_ok=True)
+    path = metrics_dir / "runs.jsonl"
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    return path
+
+
+def _prometheus_label(value: str) -> str:
+    """转义 Prometheus 标签值"""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def write_prometheus_textfile(record: Dict, path: str) -> None:
+    """将运行记录写为 Prometheus textfile（供 node_exporter textfile collector 采集）"""
+    lines = [
+        "# HELP trendradar_run_duration_seconds Duration of the last run.",
+        "# TYPE trendradar_run_duration_seconds gauge",
+        f"trendradar_run_duration_seconds {record['duration_seconds']}",
+        "# HELP trendradar_run_success Whether the last run finished without error.",
+        "# TYPE trendradar_run_success gauge",
+        f"trendradar_run_success {0 if record['error'] else 1}",
+        "# HELP trendradar_run_timestamp_seconds Start time of the last run.",
+        "# TYPE trendradar_run_timestamp_seconds gauge",
+        f"trendradar_run_timestamp_seconds {record['timestamp']}",
+        "# HELP trendradar_run_failed_platforms Platforms that failed in the last run.",
+        "# TYPE trendradar_run_failed_platforms gauge",
+        f"trendradar_run_failed_platforms {len(record['failed_ids'])}",
+        "# HELP trendradar_stage_duration_seconds Time spent in each stage of the last run.",
+        "# TYPE trendradar_stage_duration_seconds gauge",
+    ]
+    for stage, item in record["stages"].items():
+        lines.append(
+            f'trendradar_stage_duration_seconds{{stage="{_prometheus_label(stage)}"}} {item["seconds"]}'
+        )
+    lines += [
+        "# HELP trendradar_stage_calls Number of times each stage ran in the last run.",
+        "# TYPE trendradar_stage_calls gauge",
+    ]
+    for stage, item in record["stages"].items():
+        lines.append(f'trendradar_stage_calls{{stage="{_prometheus_label(stage)}"}} {item["count"]}')
+    lines += [
+        "# HELP trendradar_run_counter Bytes and item counts recorded in the last run.",
+        "# TYPE trendradar_run_counter gauge",
+    ]
+    for name, value in record["counters"].items():
+        lines.append(f'trendradar_run_counter{{name="{_prometheus_label(name)}"}} {value}')
+
+    # 先写临时文件再替换，避免采集到写了一半的文件
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = target.with_name(f".{target.name}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    os.replace(tmp_path, target)
+
+
+# 快照文件名：HH时MM分.txt
+SNAPSHOT_FILENAME_PATTERN = re.compile(r"^(\d{2})时(\d{2})分\.txt$")
+
+
+def run_replay(
+    source_dir: str,
+    output_dir: Optional[str] = None,
+    verbose: bool = False,
+    profiler=None,
+) -> Dict:
+    """
+    离线回放一天的快照，测量完整流水线的吞吐量
+
+    按时间顺序把 output/<日期>/txt 下的快照逐个送入与实际运行相同的
+    保存 → 聚合 → 匹配 → 渲染 → 分批流程，当前时间模拟为快照时间，
+    通知只生成消息批次不发送。所有输出写入独立的回放目录，不影响 output/。
+    传入 profiler 时整个回放作为一个性能分析会话。
+    """
+    global OUTPUT_DIR, ROOT_INDEX_PATH, SIMULATED_TIME
+
+    source = Path(source_dir)
+    txt_dir = source / "txt" if (source / "txt").is_dir() else source
+    day_dir = txt_dir.parent if txt_dir.name == "txt" else txt_dir
+    try:
+        day = datetime.strptime(day_dir.name, "%Y年%m月%d日")
+    except ValueError:
+        raise ValueError(f"无法从目录名识别日期: {day_dir}（应为 output/YYYY年MM月DD日）")
+
+    snapshots = []
+    for file_path in sorted(txt_dir.glob("*.txt")):
+        match = SNAPSHOT_FILENAME_PATTERN.match(file_path.name)
+        if match:
+            snapshots.append((file_path, int(match.group(1)), int(match.group(2))))
+    if not snapshots:
+        raise FileNotFoundError(f"没有找到快照文件: {txt_dir}")
+
+    if output_dir:
+        sandbox = Path(output_dir)
+    else:
+        import tempfile
+
+        sandbox = Path(tempfile.mkdtemp(prefix="trendradar-replay-"))
+    replay_output = sandbox / "output"
+    if replay_output.resolve() in (OUTPUT_DIR.resolve(), day_dir.resolve().parent):
+        raise ValueError(f"回放输出目录不能是数据目录本身: {replay_output}")
+    if (replay_output / day_dir.name).exists():
+        raise ValueError(f"回放输出目录中已有当天的数据，请使用新的目录: {replay_output / day_dir.name}")
+
+    CONFIG.load()
+    analyzer = NewsAnalyzer(replay=True)
+    analyzer.timer.reset()
+    print(f"开始回放: {txt_dir}（{len(snapshots)} 个快照，报告模式: {analyzer.report_mode}）")
+    print(f"回放输出目录: {sandbox}")
+
+    import pytz
+
+    tz = pytz.timezone("Asia/Shanghai")
+    saved = (OUTPUT_DIR, ROOT_INDEX_PATH, SIMULATED_TIME)
+    OUTPUT_DIR = replay_output
+    ROOT_INDEX_PATH = sandbox / "index.html"
+    profile = profiler.session("replay") if profiler else None
+    if profile is not None:
+        profile.start()
+        analyzer.timer.profile = profile
+    try:
+        with open(os.devnull, "w", encoding="utf-8") as devnull:
+            start = time.perf_counter()
+            for file_path, hour, minute in snapshots:
+                SIMULATED_TIME = tz.localize(day.replace(hour=hour, minute=minute))
+                if verbose:
+                    analyzer.replay_snapshot(file_path)
+                else:
+                    with redirect_stdout(devnull):
+                        analyzer.replay_snapshot(file_path)
+            elapsed = time.perf_counter() - start
+    finally:
+        OUTPUT_DIR, ROOT_INDEX_PATH, SIMULATED_TIME = saved
+        if profile is not None:
+            analyzer.timer.profile = None
+            print(f"性能分析结果已保存: {profile.finish()}")
+
+    stages = analyzer.timer.summary()
+    print(
+        f"\n回放完成: {len(snapshots)} 个快照，耗时 {elapsed:.2f} 秒，"
+        f"{len(snapshots) / elapsed:.2f} 快照/秒"
+    )
+    print(f"{'阶段':<10}{'总耗时(秒)':>10}{'次数':>8}{'平均(毫秒)':>10}{'占比':>7}")
+    for item in stages:
+        print(
+            f"{item['stage']:<12}{item['seconds']:>12.3f}{item['count']:>10}"
+            f"{item['avg_ms']:>14.2f}{item['seconds'] / elapsed:>9.1%}"
+        )
+
+    return {
+        "date": day.strftime("%Y-%m-%d"),
+        "snapshots": len(snapshots),
+        "seconds": elapsed,
+        "snapshots_per_second": len(snapshots) / elapsed,
+        "stages": stages,
+        "output_dir": str(sandbox),
+    }
 
 
 def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="TrendRadar 热点新闻分析")
+    parser.add_argument(
+        "--replay",
+        metavar="DIR",
+        help="离线回放 output/<日期> 下的快照并输出各阶段耗时（不请求接口、不发送通知）",
+    )
+    parser.add_argument(
+        "--replay-output",
+        metavar="DIR",
+        help="回放输出目录（默认创建临时目录）",
+    )
+    parser.add_argument(
+        "--verbose", action="store_true", help="回放时显示每个快照的处理日志"
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="cpu",
+        default=os.environ.get("PROFILE_MODE") or None,
+        choices=["cpu", "mem", "sample"],
+        help="按阶段做性能分析（cpu: cProfile + 调用栈采样，mem: tracemalloc，"
+        "sample: 只做调用栈采样，开销最小），结果写入 output/.profiles/（环境变量 PROFILE_MODE）",
+    )
+    parser.add_argument(
+        "--profile-rate",
+        type=float,
+        default=os.environ.get("PROFILE_RATE") or "1",
+        help="分析的运行比例 (0, 1]，默认 1；小于 1 时只随机分析一部分运行（环境变量 PROFILE_RATE）",
+    )
+    args = parser.parse_args()
+    if not 0 < args.profile_rate <= 1:
+        parser.error(f"--profile-rate 应在 (0, 1] 之间: {args.profile_rate}")
+
+    profiler = None
+    if args.profile:
+        try:
+            profiler = Profiler(args.profile, OUTPUT_DIR / PROFILES_DIR_NAME, args.profile_rate)
+        except ValueError as e:
+            parser.error(str(e))
+
+    if args.replay:
+        try:
+            run_replay(args.replay, args.replay_output, args.verbose, profiler)
+        except (ValueError, FileNotFoundError) as e:
+            print(f"❌ 回放失败: {e}")
+            raise SystemExit(1)
+        return
+
     try:
-        analyzer = NewsAnalyzer()
+        analyzer = NewsAnalyzer(profiler=profiler)
         analyzer.run()
     except FileNotFoundError as e:
         print(f"❌ 配置文件错误: {e}")
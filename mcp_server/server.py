@@ -5,18 +5,30 @@ TrendRadar MCP Server - FastMCP 2.0 实现
 支持 stdio 和 HTTP 两种传输模式。
 """
 
+import asyncio
 import json
-from typing import List, Optional, Dict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Dict
 
 from fastmcp import FastMCP
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+
+from trendradar_core import PROFILES_DIR_NAME, Profiler
 
 from .tools.data_query import DataQueryTools
 from .tools.analytics import AnalyticsTools
 from .tools.search_tools import SearchTools
 from .tools.config_mgmt import ConfigManagementTools
 from .tools.system import SystemManagementTools
+from .services.cache_service import get_cache
+from .services.compute_service import configure_compute
+from .services.metrics_service import get_metrics
+from .services.warmup_service import configure_warmup
 from .utils.date_parser import DateParser
-from .utils.errors import MCPError
+from .utils.errors import MCPError, ToolTimeoutError
 
 
 # 创建 FastMCP 2.0 应用
@@ -37,6 +49,261 @@ def _get_tools(project_root: Optional[str] = None):
     return _tools_instances
 
 
+# ==================== 工具执行（脱离事件循环）====================
+
+# 工具函数均为同步阻塞实现（读文件、相似度计算、爬取时 sleep），
+# 统一放到有界线程池中执行，避免阻塞事件循环影响其他客户端
+
+# 默认执行配置，可通过 run_server 参数覆盖
+_execution_settings = {
+    'max_workers': 4,
+    'timeout': 120.0,
+}
+
+# 单个工具的并发上限（未列出的工具以线程池大小为上限）
+# 重型分析工具限制并发，给轻量查询留出线程；爬取会写文件，串行执行
+TOOL_CONCURRENCY_LIMITS = {
+    'trigger_crawl': 1,
+    'analyze_topic_trend': 2,
+    'analyze_data_insights': 2,
+    'analyze_sentiment': 2,
+    'find_similar_news': 2,
+    'generate_summary_report': 2,
+    'search_related_news_history': 2,
+}
+
+# 单个工具的超时时间（秒），未列出的工具使用默认超时
+TOOL_TIMEOUTS = {
+    'trigger_crawl': 600.0,
+}
+
+_executor: Optional[ThreadPoolExecutor] = None
+_tool_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+# 工具调用的性能分析（通过 configure_profiling 启用）
+_profiler: Optional[Profiler] = None
+
+
+def configure_tool_execution(max_workers: Optional[int] = None, timeout: Optional[float] = None):
+    """
+    配置工具执行线程池和默认超时
+
+    需要在服务器启动前调用，已创建的线程池不会被调整。
+
+    Args:
+        max_workers: 工具线程池大小
+        timeout: 默认超时时间（秒），0 表示不限制
+    """
+    if max_workers is not None:
+        _execution_settings['max_workers'] = max(1, max_workers)
+    if timeout is not None:
+        _execution_settings['timeout'] = timeout
+
+
+def configure_profiling(mode: Optional[str], sample_rate: float, project_root: Path) -> Optional[Profiler]:
+    """
+    配置工具调用的性能分析
+
+    每次被采样的工具调用作为一个分析会话，结果写入 <项目目录>/output/.profiles/。
+
+    Args:
+        mode: 分析模式（cpu/mem/sample），None 表示不分析
+        sample_rate: 分析的调用比例 (0, 1]
+        project_root: 项目根目录
+
+    Returns:
+        性能分析配置，未启用时返回 None
+    """
+    global _profiler
+    _profiler = None
+    if mode:
+        _profiler = Profiler(mode, Path(project_root) / "output" / PROFILES_DIR_NAME, sample_rate)
+    return _profiler
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """获取工具执行线程池（首次调用时创建）"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=_execution_settings['max_workers'],
+            thread_name_prefix='mcp-tool'
+        )
+    return _executor
+
+
+def _get_tool_semaphore(tool_name: str) -> asyncio.Semaphore:
+    """获取工具的并发控制信号量"""
+    semaphore = _tool_semaphores.get(tool_name)
+    if semaphore is None:
+        limit = TOOL_CONCURRENCY_LIMITS.get(tool_name, _execution_settings['max_workers'])
+        semaphore = asyncio.Semaphore(limit)
+        _tool_semaphores[tool_name] = semaphore
+    return semaphore
+
+
+def _json_default(obj: Any) -> Any:
+    """JSON 序列化时把紧凑表示（如排名统计）转换为字典"""
+    to_dict = getattr(obj, "to_dict", None)
+    if to_dict is None:
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+    return to_dict()
+
+
+def _call_tool(tool_name: str, func: Callable[..., Dict], kwargs: Dict[str, Any]) -> str:
+    """在工作线程中执行工具并序列化结果（启用性能分析时按采样率分析本次调用）"""
+    profile = _profiler.session(tool_name) if _profiler is not None else None
+    if profile is None:
+        return _execute_tool(tool_name, func, kwargs)
+
+    profile.start()
+    try:
+        with profile.stage(tool_name):
+            return _execute_tool(tool_name, func, kwargs)
+    finally:
+        profile.finish()
+
+
+def _execute_tool(tool_name: str, func: Callable[..., Dict], kwargs: Dict[str, Any]) -> str:
+    """执行工具并序列化结果，异常转换为错误响应，错误按错误码计入指标"""
+    metrics = get_metrics()
+    try:
+        with metrics.tool_context(tool_name):
+            result = func(**kwargs)
+    except MCPError as e:
+        result = {
+            "success": False,
+            "error": e.to_dict()
+        }
+    except Exception as e:
+        result = {
+            "success": False,
+            "error": {
+                "code": "INTERNAL_ERROR",
+                "message": str(e)
+            }
+        }
+    if isinstance(result, dict) and result.get("success") is False:
+        metrics.record_tool_error(tool_name, str(result.get("error", {}).get("code", "UNKNOWN")))
+    return json.dumps(result, ensure_ascii=False, indent=2, default=_json_default)
+
+
+async def _run_tool(tool_name: str, func: Callable[..., Dict], **kwargs) -> str:
+    """
+    在线程池中执行同步工具函数，带并发限制和超时控制
+
+    超时从进入排队开始计算。超时后立即向客户端返回错误，
+    但工作线程无法被强制中断，其占用的并发名额会在线程实际结束后才释放。
+    调用耗时（含排队）计入指标服务的耗时直方图。
+
+    Args:
+        tool_name: 工具名称（用于并发限制和超时配置）
+        func: 同步工具函数
+        **kwargs: 工具参数
+
+    Returns:
+        JSON格式的工具结果
+    """
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    try:
+        return await _schedule_tool(loop, tool_name, func, kwargs)
+    finally:
+        get_metrics().record_tool_call(tool_name, loop.time() - started)
+
+
+async def _schedule_tool(
+    loop: asyncio.AbstractEventLoop,
+    tool_name: str,
+    func: Callable[..., Dict],
+    kwargs: Dict[str, Any]
+) -> str:
+    """排队并在线程池中执行工具（见 _run_tool）"""
+    timeout = TOOL_TIMEOUTS.get(tool_name, _execution_settings['timeout']) or None
+    deadline = loop.time() + timeout if timeout else None
+    semaphore = _get_tool_semaphore(tool_name)
+
+    if not await _acquire_permit(semaphore, timeout):
+        get_metrics().record_tool_error(tool_name, "TOOL_TIMEOUT")
+        return json.dumps({
+            "success": False,
+            "error": ToolTimeoutError(tool_name, timeout).to_dict()
+        }, ensure_ascii=False, indent=2)
+
+    try:
+        future = loop.run_in_executor(_get_executor(), partial(_call_tool, tool_name, func, kwargs))
+    except BaseException:
+        semaphore.release()
+        raise
+    future.add_done_callback(lambda _: semaphore.release())
+
+    try:
+        remaining = deadline - loop.time() if deadline is not None else None
+        return await asyncio.wait_for(asyncio.shield(future), remaining)
+    except asyncio.TimeoutError:
+        get_metrics().record_tool_error(tool_name, "TOOL_TIMEOUT")
+        return json.dumps({
+            "success": False,
+            "error": ToolTimeoutError(tool_name, timeout).to_dict()
+        }, ensure_ascii=False, indent=2)
+
+
+async def _acquire_permit(semaphore: asyncio.Semaphore, timeout: Optional[float]) -> bool:
+    """
+    在超时时间内获取工具的执行许可
+
+    Python 3.12 之前 wait_for(semaphore.acquire(), timeout) 可能在超时的同时拿到许可，
+    却仍然抛出超时，这个许可永远不会归还。3.11+ 使用 asyncio.timeout()（取消时 acquire 会
+    自己归还许可），更早的版本在超时或被取消后，如果获取任务实际已经拿到许可则归还。
+
+    Args:
+        semaphore: 工具的并发信号量
+        timeout: 超时时间（秒），None 表示不限时
+
+    Returns:
+        是否获取到许可
+    """
+    if timeout is None:
+        await semaphore.acquire()
+        return True
+
+    if hasattr(asyncio, "timeout"):
+        try:
+            async with asyncio.timeout(timeout):
+                await semaphore.acquire()
+        except TimeoutError:
+            return False
+        return True
+
+    acquire = asyncio.ensure_future(semaphore.acquire())
+    try:
+        await asyncio.wait({acquire}, timeout=timeout)
+    except BaseException:
+        _abandon_acquire(semaphore, acquire)
+        raise
+    if acquire.done():
+        return acquire.result()
+    _abandon_acquire(semaphore, acquire)
+    return False
+
+
+def _abandon_acquire(semaphore: asyncio.Semaphore, acquire: asyncio.Future) -> None:
+    """取消获取许可的任务；任务已经（或在取消生效前）拿到许可时归还许可"""
+    acquire.cancel()
+    acquire.add_done_callback(
+        lambda task: None if task.cancelled() or task.exception() is not None else semaphore.release()
+    )
+
+
+# ==================== 指标（HTTP 模式）====================
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics_endpoint(request: Request) -> PlainTextResponse:
+    """Prometheus 指标：工具调用次数/耗时直方图/错误数、缓存命中与淘汰、文件解析与读取量"""
+    text = get_metrics().render_prometheus(get_cache().get_stats())
+    return PlainTextResponse(text, media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 # ==================== 日期解析工具（优先调用）====================
 
 @mcp.tool
@@ -144,8 +411,7 @@ async def get_latest_news(
     **注意**：如果用户询问"为什么只显示了部分"，说明他们需要完整数据
     """
     tools = _get_tools()
-    result = tools['data'].get_latest_news(platforms=platforms, limit=limit, include_url=include_url)
-    return json.dumps(result, ensure_ascii=False, indent=2)
+    return await _run_tool('get_latest_news', tools['data'].get_latest_news, platforms=platforms, limit=limit, include_url=include_url)
 
 
 @mcp.tool
@@ -169,8 +435,7 @@ async def get_trending_topics(
         JSON格式的关注词频率统计列表
     """
     tools = _get_tools()
-    result = tools['data'].get_trending_topics(top_n=top_n, mode=mode)
-    return json.dumps(result, ensure_ascii=False, indent=2)
+    return await _run_tool('get_trending_topics', tools['data'].get_trending_topics, top_n=top_n, mode=mode)
 
 
 @mcp.tool
@@ -212,13 +477,14 @@ async def get_news_by_date(
     **注意**：如果用户询问"为什么只显示了部分"，说明他们需要完整数据
     """
     tools = _get_tools()
-    result = tools['data'].get_news_by_date(
+    return await _run_tool(
+        'get_news_by_date',
+        tools['data'].get_news_by_date,
         date_query=date_query,
         platforms=platforms,
         limit=limit,
         include_url=include_url
     )
-    return json.dumps(result, ensure_ascii=False, indent=2)
 
 
 
@@ -254,7 +520,10 @@ async def analyze_topic_trend(
                     - **格式**: {"start": "YYYY-MM-DD", "end": "YYYY-MM-DD"}
                     - **获取方式**: 调用 resolve_date_range 工具解析自然语言日期
                     - **默认**: 不指定时默认分析最近7天
-        granularity: 时间粒度（trend模式），默认"day"（仅支持 day，因为底层数据按天聚合）
+        granularity: 时间粒度（trend和lifecycle模式），默认"day"
+                    - day: 按天统计
+                    - hour: 按小时统计（基于每次爬取的快照）
+                    - snapshot: 按每次爬取的快照统计
         threshold: 热度突增倍数阈值（viral模式），默认3.0
         time_window: 检测时间窗口小时数（viral模式），默认24
         lookahead_hours: 预测未来小时数（predict模式），默认6
@@ -275,7 +544,9 @@ async def analyze_topic_trend(
         2. analyze_topic_trend(topic="特斯拉", analysis_type="lifecycle", date_range=...)
     """
     tools = _get_tools()
-    result = tools['analytics'].analyze_topic_trend_unified(
+    return await _run_tool(
+        'analyze_topic_trend',
+        tools['analytics'].analyze_topic_trend_unified,
         topic=topic,
         analysis_type=analysis_type,
         date_range=date_range,
@@ -285,7 +556,6 @@ async def analyze_topic_trend(
         lookahead_hours=lookahead_hours,
         confidence_threshold=confidence_threshold
     )
-    return json.dumps(result, ensure_ascii=False, indent=2)
 
 
 @mcp.tool
@@ -321,14 +591,15 @@ async def analyze_data_insights(
         - analyze_data_insights(insight_type="keyword_cooccur", min_frequency=5, top_n=15)
     """
     tools = _get_tools()
-    result = tools['analytics'].analyze_data_insights_unified(
+    return await _run_tool(
+        'analyze_data_insights',
+        tools['analytics'].analyze_data_insights_unified,
         insight_type=insight_type,
         topic=topic,
         date_range=date_range,
         min_frequency=min_frequency,
         top_n=top_n
     )
-    return json.dumps(result, ensure_ascii=False, indent=2)
 
 
 @mcp.tool
@@ -384,7 +655,9 @@ async def analyze_sentiment(
     - 仅在用户明确要求"总结"或"挑重点"时才进行筛选
     """
     tools = _get_tools()
-    result = tools['analytics'].analyze_sentiment(
+    return await _run_tool(
+        'analyze_sentiment',
+        tools['analytics'].analyze_sentiment,
         topic=topic,
         platforms=platforms,
         date_range=date_range,
@@ -392,7 +665,6 @@ async def analyze_sentiment(
         sort_by_weight=sort_by_weight,
         include_url=include_url
     )
-    return json.dumps(result, ensure_ascii=False, indent=2)
 
 
 @mcp.tool
@@ -422,13 +694,14 @@ async def find_similar_news(
     - 仅在用户明确要求"总结"或"挑重点"时才进行筛选
     """
     tools = _get_tools()
-    result = tools['analytics'].find_similar_news(
+    return await _run_tool(
+        'find_similar_news',
+        tools['analytics'].find_similar_news,
         reference_title=reference_title,
         threshold=threshold,
         limit=limit,
         include_url=include_url
     )
-    return json.dumps(result, ensure_ascii=False, indent=2)
 
 
 @mcp.tool
@@ -450,11 +723,12 @@ async def generate_summary_report(
         JSON格式的摘要报告，包含Markdown格式内容
     """
     tools = _get_tools()
-    result = tools['analytics'].generate_summary_report(
+    return await _run_tool(
+        'generate_summary_report',
+        tools['analytics'].generate_summary_report,
         report_type=report_type,
         date_range=date_range
     )
-    return json.dumps(result, ensure_ascii=False, indent=2)
 
 
 # ==================== 智能检索工具 ====================
@@ -525,7 +799,9 @@ async def search_news(
     - 仅在用户明确要求"总结"或"挑重点"时才进行筛选
     """
     tools = _get_tools()
-    result = tools['search'].search_news_unified(
+    return await _run_tool(
+        'search_news',
+        tools['search'].search_news_unified,
         query=query,
         search_mode=search_mode,
         date_range=date_range,
@@ -535,7 +811,6 @@ async def search_news(
         threshold=threshold,
         include_url=include_url
     )
-    return json.dumps(result, ensure_ascii=False, indent=2)
 
 
 @mcp.tool
@@ -572,14 +847,15 @@ async def search_related_news_history(
     - 仅在用户明确要求"总结"或"挑重点"时才进行筛选
     """
     tools = _get_tools()
-    result = tools['search'].search_related_news_history(
+    return await _run_tool(
+        'search_related_news_history',
+        tools['search'].search_related_news_history,
         reference_text=reference_text,
         time_preset=time_preset,
         threshold=threshold,
         limit=limit,
         include_url=include_url
     )
-    return json.dumps(result, ensure_ascii=False, indent=2)
 
 
 # ==================== 配置与系统管理工具 ====================
@@ -603,8 +879,7 @@ async def get_current_config(
         JSON格式的配置信息
     """
     tools = _get_tools()
-    result = tools['config'].get_current_config(section=section)
-    return json.dumps(result, ensure_ascii=False, indent=2)
+    return await _run_tool('get_current_config', tools['config'].get_current_config, section=section)
 
 
 @mcp.tool
@@ -612,14 +887,13 @@ async def get_system_status() -> str:
     """
     获取系统运行状态和健康检查信息
 
-    返回系统版本、数据统计、缓存状态等信息
+    返回系统版本、数据统计、缓存状态、数据预热进度等信息
 
     Returns:
         JSON格式的系统状态信息
     """
     tools = _get_tools()
-    result = tools['system'].get_system_status()
-    return json.dumps(result, ensure_ascii=False, indent=2)
+    return await _run_tool('get_system_status', tools['system'].get_system_status)
 
 
 @mcp.tool
@@ -653,8 +927,7 @@ async def trigger_crawl(
         - 使用默认平台: trigger_crawl()  # 爬取config.yaml中配置的所有平台
     """
     tools = _get_tools()
-    result = tools['system'].trigger_crawl(platforms=platforms, save_to_local=save_to_local, include_url=include_url)
-    return json.dumps(result, ensure_ascii=False, indent=2)
+    return await _run_tool('trigger_crawl', tools['system'].trigger_crawl, platforms=platforms, save_to_local=save_to_local, include_url=include_url)
 
 
 # ==================== 启动入口 ====================
@@ -663,7 +936,13 @@ def run_server(
     project_root: Optional[str] = None,
     transport: str = 'stdio',
     host: str = '0.0.0.0',
-    port: int = 3333
+    port: int = 3333,
+    max_workers: Optional[int] = None,
+    tool_timeout: Optional[float] = None,
+    compute_workers: int = 0,
+    warmup_days: int = 0,
+    profile: Optional[str] = None,
+    profile_rate: float = 1.0
 ):
     """
     启动 MCP 服务器
@@ -673,9 +952,19 @@ def run_server(
         transport: 传输模式，'stdio' 或 'http'
         host: HTTP模式的监听地址，默认 0.0.0.0
         port: HTTP模式的监听端口，默认 3333
+        max_workers: 工具执行线程池大小，默认 4
+        tool_timeout: 工具默认超时时间（秒），默认 120，0 表示不限制
+        compute_workers: 相似度/关键词计算进程数，默认 0（在工具线程内计算）
+        warmup_days: 启动后在后台预热的最近天数，默认 0（不预热）
+        profile: 工具调用的性能分析模式（cpu/mem/sample），默认不分析
+        profile_rate: 性能分析的调用比例 (0, 1]，默认 1
     """
     # 初始化工具实例
-    _get_tools(project_root)
+    tools = _get_tools(project_root)
+    configure_tool_execution(max_workers=max_workers, timeout=tool_timeout)
+    configure_compute(compute_workers)
+    warmup = configure_warmup(tools['analytics'].data_service, warmup_days)
+    profiler = configure_profiling(profile, profile_rate, tools['system'].project_root)
 
     # 打印启动信息
     print()
@@ -690,6 +979,15 @@ def run_server(
     elif transport == 'http':
         print(f"  协议: MCP over HTTP (生产环境)")
         print(f"  服务器监听: {host}:{port}")
+        print(f"  指标端点: http://{host}:{port}/metrics (Prometheus)")
+
+    print(f"  工具线程池: {_execution_settings['max_workers']} 线程，默认超时 {_execution_settings['timeout']:g} 秒")
+    if compute_workers > 0:
+        print(f"  计算进程池: {compute_workers} 进程")
+    if warmup_days > 0:
+        print(f"  数据预热: 最近 {warmup_days} 天（后台进行，可通过 get_system_status 查看进度）")
+    if profiler is not None:
+        print(f"  性能分析: {profiler.mode} 模式，采样 {profiler.sample_rate:.0%} 的调用，结果写入 {profiler.output_dir}")
 
     if project_root:
         print(f"  项目目录: {project_root}")
@@ -724,6 +1022,9 @@ def run_server(
     print("=" * 60)
     print()
 
+    # 预热在后台线程中进行，不阻塞服务器启动
+    warmup.start()
+
     # 根据传输模式运行服务器
     if transport == 'stdio':
         mcp.run(transport='stdio')
@@ -770,12 +1071,59 @@ if __name__ == '__main__':
         '--project-root',
         help='项目根目录路径'
     )
+    parser.add_argument(
+        '--max-workers',
+        type=int,
+        default=None,
+        help='工具执行线程池大小，默认 4'
+    )
+    parser.add_argument(
+        '--tool-timeout',
+        type=float,
+        default=None,
+        help='工具默认超时时间（秒），默认 120，0 表示不限制'
+    )
+    parser.add_argument(
+        '--compute-workers',
+        type=int,
+        default=0,
+        help='相似度/关键词计算进程数，默认 0（不启用多进程）'
+    )
+    parser.add_argument(
+        '--warmup-days',
+        type=int,
+        default=0,
+        help='启动后在后台预热的最近天数，默认 0（不预热）'
+    )
+    parser.add_argument(
+        '--profile',
+        nargs='?',
+        const='cpu',
+        default=None,
+        choices=['cpu', 'mem', 'sample'],
+        help='按工具调用做性能分析（cpu: cProfile + 调用栈采样，mem: tracemalloc，sample: 只做调用栈采样），'
+             '结果写入 output/.profiles/'
+    )
+    parser.add_argument(
+        '--profile-rate',
+        type=float,
+        default=1.0,
+        help='性能分析的调用比例 (0, 1]，默认 1；生产环境可设为 0.01 等小值长期开启'
+    )
 
     args = parser.parse_args()
+    if not 0 < args.profile_rate <= 1:
+        parser.error(f"--profile-rate 应在 (0, 1] 之间: {args.profile_rate}")
 
     run_server(
         project_root=args.project_root,
         transport=args.transport,
         host=args.host,
-        port=args.port
+        port=args.port,
+        max_workers=args.max_workers,
+        tool_timeout=args.tool_timeout,
+        compute_workers=args.compute_workers,
+        warmup_days=args.warmup_days,
+        profile=args.profile,
+        profile_rate=args.profile_rate
     )
@@ -2,6 +2,9 @@
 缓存服务
 
 实现TTL缓存机制，提升数据访问性能。
+
+同时统计命中、未命中和淘汰（过期或清空）次数；缓存占用按调用方在 set 时
+提供的近似大小（如日聚合对应的快照文件字节数）累计，未提供大小的条目不计入。
 """
 
 import time
@@ -16,15 +19,25 @@ class CacheService:
         """初始化缓存服务"""
         self._cache = {}
         self._timestamps = {}
+        self._sizes = {}
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
         self._lock = Lock()
 
-    def get(self, key: str, ttl: int = 900) -> Optional[Any]:
+    def _remove(self, key: str) -> None:
+        """删除条目（调用方持有锁）"""
+        del self._cache[key]
+        del self._timestamps[key]
+        self._sizes.pop(key, None)
+
+    def get(self, key: str, ttl: Optional[int] = 900) -> Optional[Any]:
         """
         获取缓存数据
 
         Args:
             key: 缓存键
-            ttl: 存活时间（秒），默认15分钟
+            ttl: 存活时间（秒），默认15分钟；None 表示永不过期
 
         Returns:
             缓存的值，如果不存在或已过期则返回None
@@ -32,25 +45,32 @@ class CacheService:
         with self._lock:
             if key in self._cache:
                 # 检查是否过期
-                if time.time() - self._timestamps[key] < ttl:
+                if ttl is None or time.time() - self._timestamps[key] < ttl:
+                    self._hits += 1
                     return self._cache[key]
                 else:
                     # 已过期，删除缓存
-                    del self._cache[key]
-                    del self._timestamps[key]
+                    self._remove(key)
+                    self._evictions += 1
+            self._misses += 1
         return None
 
-    def set(self, key: str, value: Any) -> None:
+    def set(self, key: str, value: Any, size: int = 0) -> None:
         """
         设置缓存数据
 
         Args:
             key: 缓存键
             value: 缓存值
+            size: 近似大小（字节），用于统计缓存占用，0 表示不统计
         """
         with self._lock:
             self._cache[key] = value
             self._timestamps[key] = time.time()
+            if size:
+                self._sizes[key] = size
+            else:
+                self._sizes.pop(key, None)
 
     def delete(self, key: str) -> bool:
         """
@@ -64,16 +84,17 @@ class CacheService:
         """
         with self._lock:
             if key in self._cache:
-                del self._cache[key]
-                del self._timestamps[key]
+                self._remove(key)
                 return True
         return False
 
     def clear(self) -> None:
         """清空所有缓存"""
         with self._lock:
+            self._evictions += len(self._cache)
             self._cache.clear()
             self._timestamps.clear()
+            self._sizes.clear()
 
     def cleanup_expired(self, ttl: int = 900) -> int:
         """
@@ -93,8 +114,8 @@ class CacheService:
             ]
 
             for key in expired_keys:
-                del self._cache[key]
-                del self._timestamps[key]
+                self._remove(key)
+            self._evictions += len(expired_keys)
 
             return len(expired_keys)
 
@@ -106,8 +127,14 @@ class CacheService:
             统计信息字典
         """
         with self._lock:
+            lookups = self._hits + self._misses
             return {
                 "total_entries": len(self._cache),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / lookups, 4) if lookups else None,
+                "evictions": self._evictions,
+                "bytes": sum(self._sizes.values()),
                 "oldest_entry_age": (
                     time.time() - min(self._timestamps.values())
                     if self._timestamps else 0
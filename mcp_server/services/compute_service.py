@@ -0,0 +1,388 @@
+"""
+计算服务
+
+为 CPU 密集型的标题分析（相似度计算、关键词提取）和快照文件解析提供多进程执行后端。
+
+标题语料以 UTF-8 编码一次性写入共享内存，工作进程按下标区间直接读取，
+不需要为每次调用序列化标题字典。语料按原有遍历顺序切分为连续分片，
+结果按分片顺序合并，因此输出与单进程执行完全一致。
+"""
+
+import atexit
+import hashlib
+import multiprocessing
+import struct
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from threading import Lock
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from ..utils.keywords import extract_title_keywords
+from ..utils.similarity import fuzzy_matches, ratio_matches, related_matches
+
+
+# ==================== 计算内核 ====================
+# 内核签名: kernel(titles, offset, params) -> 分片结果
+# titles 为分片内的标题列表，offset 为分片在整个语料中的起始下标
+
+def ratio_kernel(titles: List[str], offset: int, params: Tuple[str, float]) -> List[Tuple[int, float]]:
+    """
+    序列相似度内核（区分大小写）
+
+    Args:
+        titles: 分片标题列表
+        offset: 分片起始下标
+        params: (参考标题, 相似度阈值)
+
+    Returns:
+        [(下标, 相似度)]，仅包含达到阈值的标题
+    """
+    reference, threshold = params
+    return ratio_matches(reference, titles, threshold, offset)
+
+
+def fuzzy_kernel(titles: List[str], offset: int, params: Tuple[str, float]) -> List[Tuple[int, float]]:
+    """
+    模糊匹配内核
+
+    Args:
+        titles: 分片标题列表
+        offset: 分片起始下标
+        params: (查询文本, 匹配阈值)
+
+    Returns:
+        [(下标, 相似度)]，仅包含匹配的标题
+    """
+    query, threshold = params
+    return fuzzy_matches(query, titles, threshold, offset)
+
+
+def related_kernel(
+    titles: List[str],
+    offset: int,
+    params: Tuple[str, List[str], float]
+) -> List[Tuple[int, float, float, float]]:
+    """
+    相关新闻内核（70% 关键词重合 + 30% 文本相似度）
+
+    Args:
+        titles: 分片标题列表
+        offset: 分片起始下标
+        params: (参考文本, 参考关键词, 相关性阈值)
+
+    Returns:
+        [(下标, 综合分数, 关键词重合度, 文本相似度)]，仅包含达到阈值的标题
+    """
+    reference_text, reference_keywords, threshold = params
+    return related_matches(reference_text, reference_keywords, titles, threshold, offset)
+
+
+def cooccurrence_kernel(
+    titles: List[str],
+    offset: int,
+    params: Any = None
+) -> Tuple[List[List[str]], Counter]:
+    """
+    关键词共现内核
+
+    Args:
+        titles: 分片标题列表
+        offset: 分片起始下标（未使用）
+        params: 未使用
+
+    Returns:
+        (每个标题的关键词列表, 关键词对计数)
+    """
+    title_keywords = []
+    cooccurrence = Counter()
+    for title in titles:
+        keywords = extract_title_keywords(title)
+        title_keywords.append(keywords)
+
+        # 计算两两共现
+        if len(keywords) >= 2:
+            for i, kw1 in enumerate(keywords):
+                for kw2 in keywords[i+1:]:
+                    # 统一排序，避免重复
+                    pair = tuple(sorted([kw1, kw2]))
+                    cooccurrence[pair] += 1
+    return title_keywords, cooccurrence
+
+
+# ==================== 共享内存语料 ====================
+
+# 布局: [标题数 n: uint64][n+1 个偏移: uint64][UTF-8 数据]
+_HEADER = struct.Struct("<Q")
+
+
+def _encode_corpus(titles: Sequence[str]) -> Tuple[bytes, bytes]:
+    """将标题列表编码为 (偏移表, 数据) 字节串"""
+    encoded = [title.encode("utf-8") for title in titles]
+    offsets = [0] * (len(encoded) + 1)
+    total = 0
+    for i, data in enumerate(encoded):
+        total += len(data)
+        offsets[i + 1] = total
+    return struct.pack(f"<{len(offsets)}Q", *offsets), b"".join(encoded)
+
+
+# 工作进程内已附加的共享内存（按名称缓存，避免重复打开）
+_ATTACHED_LIMIT = 8
+_attached: "OrderedDict[str, shared_memory.SharedMemory]" = OrderedDict()
+
+
+def _read_titles(shm_name: str, start: int, end: int) -> List[str]:
+    """在工作进程中读取语料的 [start, end) 区间"""
+    shm = _attached.get(shm_name)
+    if shm is None:
+        shm = shared_memory.SharedMemory(name=shm_name)
+        _attached[shm_name] = shm
+        # 主进程淘汰的语料已被 unlink，这里及时关闭映射以释放内存
+        while len(_attached) > _ATTACHED_LIMIT:
+            _, stale = _attached.popitem(last=False)
+            stale.close()
+    else:
+        _attached.move_to_end(shm_name)
+
+    buf = shm.buf
+    count = _HEADER.unpack_from(buf, 0)[0]
+    offsets = struct.unpack_from(f"<{end - start + 1}Q", buf, _HEADER.size + start * 8)
+    data_start = _HEADER.size + (count + 1) * 8
+    raw = bytes(buf[data_start + offsets[0]:data_start + offsets[-1]])
+
+    # 偏移为字节偏移，逐个切分后解码
+    base = offsets[0]
+    return [
+        raw[offsets[i] - base:offsets[i + 1] - base].decode("utf-8")
+        for i in range(end - start)
+    ]
+
+
+def _run_shard(kernel: Callable, shm_name: str, start: int, end: int, params: Any) -> Any:
+    """工作进程入口：读取分片并执行内核"""
+    return kernel(_read_titles(shm_name, start, end), start, params)
+
+
+class _SharedCorpus:
+    """发布到共享内存中的一份标题语料"""
+
+    def __init__(self, titles: Sequence[str]):
+        offsets, data = _encode_corpus(titles)
+        size = _HEADER.size + len(offsets) + len(data)
+        self.count = len(titles)
+        self.shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        _HEADER.pack_into(self.shm.buf, 0, self.count)
+        self.shm.buf[_HEADER.size:_HEADER.size + len(offsets)] = offsets
+        self.shm.buf[_HEADER.size + len(offsets):size] = data
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def release(self) -> None:
+        """释放共享内存"""
+        try:
+            self.shm.close()
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class ComputeService:
+    """计算服务类"""
+
+    # 语料规模低于该值时直接在当前进程计算（进程间调度开销大于收益）
+    MIN_PARALLEL_TITLES = 2000
+
+    # 保留的共享内存语料份数（按最近使用淘汰）
+    MAX_SHARED_CORPORA = 8
+
+    def __init__(self, workers: int = 0):
+        """
+        初始化计算服务
+
+        Args:
+            workers: 计算进程数，0 表示在当前进程内计算
+        """
+        self.workers = max(0, workers)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._corpora: "OrderedDict[str, _SharedCorpus]" = OrderedDict()
+        self._lock = Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """是否启用多进程计算"""
+        return self.workers > 0
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """获取进程池（首次调用时创建）"""
+        with self._lock:
+            if self._pool is None:
+                # forkserver 避免在多线程的服务器进程中直接 fork
+                methods = multiprocessing.get_all_start_methods()
+                method = "forkserver" if "forkserver" in methods else "spawn"
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(method)
+                )
+            return self._pool
+
+    def _publish(self, titles: Sequence[str]) -> _SharedCorpus:
+        """
+        将语料发布到共享内存（相同内容的语料只发布一次）
+
+        Args:
+            titles: 标题列表
+
+        Returns:
+            共享语料
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for title in titles:
+            digest.update(title.encode("utf-8"))
+            digest.update(b"\n")
+        key = digest.hexdigest()
+
+        with self._lock:
+            corpus = self._corpora.get(key)
+            if corpus is not None:
+                self._corpora.move_to_end(key)
+                return corpus
+
+            corpus = _SharedCorpus(titles)
+            self._corpora[key] = corpus
+            while len(self._corpora) > self.MAX_SHARED_CORPORA:
+                _, evicted = self._corpora.popitem(last=False)
+                evicted.release()
+            return corpus
+
+    def map_shards(self, kernel: Callable, titles: Sequence[str], params: Any = None) -> List[Any]:
+        """
+        对标题语料分片执行计算内核
+
+        Args:
+            kernel: 模块级计算内核函数
+            titles: 标题列表（按需要的遍历顺序排列）
+            params: 传给内核的参数
+
+        Returns:
+            按分片顺序排列的内核结果列表
+        """
+        if not self.enabled or len(titles) < self.MIN_PARALLEL_TITLES:
+            return [kernel(list(titles), 0, params)]
+
+        corpus = self._publish(titles)
+        shard_count = min(self.workers, len(titles))
+        bounds = [len(titles) * i // shard_count for i in range(shard_count + 1)]
+
+        try:
+            pool = self._get_pool()
+            futures = [
+                pool.submit(_run_shard, kernel, corpus.name, bounds[i], bounds[i + 1], params)
+                for i in range(shard_count)
+            ]
+            return [future.result() for future in futures]
+        except (BrokenProcessPool, FileNotFoundError) as e:
+            # 工作进程异常退出或语料已被并发请求淘汰：本次在当前进程内计算
+            print(f"Warning: 多进程计算失败，本次改为单进程计算: {e}")
+            if isinstance(e, BrokenProcessPool):
+                with self._lock:
+                    self._pool = None
+            return [kernel(list(titles), 0, params)]
+
+    def map_matches(self, kernel: Callable, titles: Sequence[str], params: Any = None) -> List[Any]:
+        """
+        执行返回匹配列表的内核，并按原顺序拼接分片结果
+
+        Args:
+            kernel: 模块级计算内核函数（返回列表）
+            titles: 标题列表
+            params: 传给内核的参数
+
+        Returns:
+            拼接后的匹配列表
+        """
+        matches = []
+        for shard in self.map_shards(kernel, titles, params):
+            matches.extend(shard)
+        return matches
+
+    def map_calls(self, func: Callable, items: Sequence[Any]) -> List[Any]:
+        """
+        在进程池中对每个元素调用函数，结果按输入顺序返回
+
+        未启用多进程时在当前进程内依次调用。函数需定义在模块级别，
+        并自行处理单个元素的异常（任何一个元素抛出异常都会中断整批调用）。
+
+        Args:
+            func: 模块级函数，参数为单个元素
+            items: 元素列表（需可序列化）
+
+        Returns:
+            按输入顺序排列的结果列表
+        """
+        if not self.enabled or len(items) < 2:
+            return [func(item) for item in items]
+
+        # 每个进程分到若干批，兼顾负载均衡与进程间通信次数
+        chunksize = max(1, len(items) // (self.workers * 4))
+
+        try:
+            return list(self._get_pool().map(func, items, chunksize=chunksize))
+        except BrokenProcessPool as e:
+            print(f"Warning: 多进程计算失败，本次改为单进程计算: {e}")
+            with self._lock:
+                self._pool = None
+            return [func(item) for item in items]
+
+    def shutdown(self) -> None:
+        """关闭进程池并释放共享内存"""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True, cancel_futures=True)
+                self._pool = None
+            while self._corpora:
+                _, corpus = self._corpora.popitem()
+                corpus.release()
+
+
+# 全局计算服务实例
+_global_compute = None
+
+
+def configure_compute(workers: int) -> ComputeService:
+    """
+    配置全局计算服务
+
+    Args:
+        workers: 计算进程数，0 表示在当前进程内计算
+
+    Returns:
+        全局计算服务实例
+    """
+    global _global_compute
+    if _global_compute is not None:
+        _global_compute.shutdown()
+    _global_compute = ComputeService(workers)
+    return _global_compute
+
+
+def get_compute() -> ComputeService:
+    """
+    获取全局计算服务实例
+
+    Returns:
+        全局计算服务实例（默认不启用多进程）
+    """
+    global _global_compute
+    if _global_compute is None:
+        _global_compute = ComputeService()
+    return _global_compute
+
+
+@atexit.register
+def _shutdown_compute() -> None:
+    if _global_compute is not None:
+        _global_compute.shutdown()
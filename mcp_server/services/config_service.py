@@ -0,0 +1,303 @@
+"""
+配置服务
+
+config/config.yaml 和 config/frequency_words.txt 只解析一次，之后每次访问
+只检查文件状态（mtime、大小），文件变化时自动重新加载。
+
+解析结果以不可变快照（ConfigSnapshot）的形式提供：字典转为只读映射，
+列表转为元组，调用方可以放心共享；平台ID预先整理为集合，平台校验为 O(1) 查找。
+"""
+
+from pathlib import Path
+from threading import Lock
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, List, Mapping, NamedTuple, Optional, Tuple
+
+import yaml
+
+from ..utils.errors import FileParseError
+
+
+def freeze(value: Any) -> Any:
+    """
+    将配置数据转换为不可变结构（字典 → 只读映射，列表 → 元组）
+
+    Args:
+        value: 配置数据
+
+    Returns:
+        不可变的配置数据
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """
+    将不可变配置数据转换回普通字典和列表（用于 JSON 输出）
+
+    Args:
+        value: 不可变的配置数据
+
+    Returns:
+        普通字典/列表结构
+    """
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+def load_yaml_config(config_path: Path) -> Dict:
+    """
+    解析YAML配置文件
+
+    Args:
+        config_path: 配置文件路径
+
+    Returns:
+        配置字典
+
+    Raises:
+        FileParseError: 配置文件不存在或解析错误
+    """
+    if not config_path.exists():
+        raise FileParseError(str(config_path), "配置文件不存在")
+
+    try:
+        with open(config_path, "r", encoding="utf-8") as f:
+            return yaml.safe_load(f) or {}
+    except Exception as e:
+        raise FileParseError(str(config_path), str(e))
+
+
+def load_frequency_words(words_file: Path) -> List[Dict]:
+    """
+    解析关键词配置文件
+
+    Args:
+        words_file: 关键词文件路径
+
+    Returns:
+        词组列表，文件不存在时返回空列表
+
+    Raises:
+        FileParseError: 文件解析错误
+    """
+    if not words_file.exists():
+        return []
+
+    word_groups = []
+
+    try:
+        with open(words_file, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+
+                # 使用 | 分隔符
+                parts = [p.strip() for p in line.split("|")]
+                if not parts:
+                    continue
+
+                group = {
+                    "required": [],
+                    "normal": [],
+                    "filter_words": []
+                }
+
+                for part in parts:
+                    if not part:
+                        continue
+
+                    words = [w.strip() for w in part.split(",")]
+                    for word in words:
+                        if not word:
+                            continue
+                        if word.endswith("+"):
+                            # 必须词
+                            group["required"].append(word[:-1])
+                        elif word.endswith("!"):
+                            # 过滤词
+                            group["filter_words"].append(word[:-1])
+                        else:
+                            # 普通词
+                            group["normal"].append(word)
+
+                if group["required"] or group["normal"]:
+                    word_groups.append(group)
+
+    except Exception as e:
+        raise FileParseError(str(words_file), str(e))
+
+    return word_groups
+
+
+class ConfigSnapshot(NamedTuple):
+    """某一版本的配置（不可变）"""
+
+    version: int
+    config: Optional[Mapping]
+    config_error: Optional[FileParseError]
+    platforms: Tuple[Mapping, ...]
+    platform_ids: FrozenSet[str]
+    platform_order: Tuple[str, ...]
+    word_groups: Tuple[Mapping, ...]
+    words_error: Optional[FileParseError]
+
+    def require_config(self) -> Mapping:
+        """
+        获取配置（配置不可用时抛出解析错误）
+
+        Returns:
+            只读配置映射
+
+        Raises:
+            FileParseError: 配置文件不存在或解析错误
+        """
+        if self.config is None:
+            raise self.config_error
+        return self.config
+
+    def require_word_groups(self) -> Tuple[Mapping, ...]:
+        """
+        获取关键词词组（关键词文件不可用时抛出解析错误）
+
+        Returns:
+            只读词组元组
+
+        Raises:
+            FileParseError: 文件解析错误
+        """
+        if self.words_error is not None:
+            raise self.words_error
+        return self.word_groups
+
+
+class ConfigService:
+    """配置服务类"""
+
+    def __init__(self, project_root: Path):
+        """
+        初始化配置服务
+
+        Args:
+            project_root: 项目根目录
+        """
+        self.config_path = project_root / "config" / "config.yaml"
+        self.words_path = project_root / "config" / "frequency_words.txt"
+        self._snapshot: Optional[ConfigSnapshot] = None
+        self._states = None
+        self._lock = Lock()
+
+    @staticmethod
+    def _file_state(path: Path) -> Optional[Tuple[int, int]]:
+        """文件状态 (mtime_ns, size)，文件不存在时为 None"""
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def snapshot(self) -> ConfigSnapshot:
+        """
+        获取当前配置快照（文件有变化时重新加载）
+
+        Returns:
+            配置快照
+        """
+        states = (self._file_state(self.config_path), self._file_state(self.words_path))
+        snapshot = self._snapshot
+        if snapshot is not None and states == self._states:
+            return snapshot
+
+        with self._lock:
+            if self._snapshot is None or states != self._states:
+                self._snapshot = self._load(self._snapshot)
+                self._states = states
+            return self._snapshot
+
+    def _load(self, previous: Optional[ConfigSnapshot]) -> ConfigSnapshot:
+        """
+        加载配置文件
+
+        重新加载失败时（如文件正在编辑）继续使用上一版本的配置，并记录错误。
+
+        Args:
+            previous: 上一版本的配置快照
+
+        Returns:
+            新的配置快照
+        """
+        version = previous.version + 1 if previous else 1
+
+        config_error = None
+        try:
+            config = freeze(load_yaml_config(self.config_path))
+        except FileParseError as e:
+            config_error = e
+            config = previous.config if previous else None
+            if config is not None:
+                print(f"Warning: {e.message}，继续使用上一版本的配置")
+
+        words_error = None
+        try:
+            word_groups = freeze(load_frequency_words(self.words_path))
+        except FileParseError as e:
+            words_error = e
+            word_groups = previous.word_groups if previous else ()
+
+        platforms = tuple(config.get("platforms") or ()) if config is not None else ()
+        platform_order = tuple(p["id"] for p in platforms if "id" in p)
+
+        return ConfigSnapshot(
+            version=version,
+            config=config,
+            config_error=config_error,
+            platforms=platforms,
+            platform_ids=frozenset(platform_order),
+            platform_order=platform_order,
+            word_groups=word_groups,
+            words_error=words_error,
+        )
+
+
+# 默认项目根目录（mcp_server 所在目录的父目录）
+_DEFAULT_PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+# 按项目根目录区分的配置服务实例（原始路径和规范化路径均可作为键）
+_config_services: Dict[str, ConfigService] = {}
+_config_services_lock = Lock()
+
+
+def get_config_service(project_root: Optional[Path] = None) -> ConfigService:
+    """
+    获取配置服务实例（同一项目根目录共享一个实例）
+
+    Args:
+        project_root: 项目根目录，默认为 mcp_server 所在目录的父目录
+
+    Returns:
+        配置服务实例
+    """
+    if project_root is None:
+        project_root = _DEFAULT_PROJECT_ROOT
+
+    # 先按原始路径查找，未命中时再按规范化路径合并同一目录的不同写法
+    service = _config_services.get(str(project_root))
+    if service is not None:
+        return service
+
+    with _config_services_lock:
+        key = str(Path(project_root).resolve())
+        service = _config_services.get(key)
+        if service is None:
+            service = ConfigService(Path(project_root))
+            _config_services[key] = service
+        _config_services[str(project_root)] = service
+        return service
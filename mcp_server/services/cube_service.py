@@ -0,0 +1,444 @@
+"""
+聚合立方服务
+
+将每天的日汇总和时间序列写入 SQLite 聚合表（平台 × 日期 × 小时 / 关键词），
+平台对比、平台活跃度等多日查询只需对日期范围做切片聚合，而不必逐条遍历标题。
+
+数据库位于 output/.cube/cube.sqlite3，按天维护：
+- 每天记录一次txt目录指纹，指纹变化（新快照写入）时只重建该天的数据
+- 历史日期在进程内确认一次后不再检查
+
+表结构：
+- cube_days: 日期 → 指纹
+- platform_days: 平台 × 日期（新闻数、出现的快照数、首次出现顺序）
+- platform_hours: 平台 × 日期 × 小时（出现的快照数）
+- platform_keywords: 平台 × 日期 × 关键词（出现次数、当天首次出现顺序）
+- titles / platform_titles: 标题字典与 平台 × 日期 × 标题 的出现关系
+"""
+
+import sqlite3
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+from .cache_service import get_cache
+from .parser_service import ParserService
+from .rollup_service import RollupService
+from .series_service import SeriesService
+from ..utils.errors import DataNotFoundError
+
+
+# 数据库结构版本（结构变化时递增，旧数据库会被清空重建）
+CUBE_VERSION = 1
+
+# 数据库目录（位于 output/ 下）
+CUBE_DIR_NAME = ".cube"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cube_days (
+    date TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS platform_days (
+    date TEXT NOT NULL,
+    platform_id TEXT NOT NULL,
+    platform_name TEXT NOT NULL,
+    ord INTEGER NOT NULL,
+    news_count INTEGER NOT NULL,
+    snapshots INTEGER NOT NULL,
+    PRIMARY KEY (date, platform_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS platform_hours (
+    date TEXT NOT NULL,
+    platform_id TEXT NOT NULL,
+    platform_name TEXT NOT NULL,
+    hour INTEGER NOT NULL,
+    snapshots INTEGER NOT NULL,
+    PRIMARY KEY (date, platform_id, hour)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS platform_keywords (
+    date TEXT NOT NULL,
+    platform_id TEXT NOT NULL,
+    platform_name TEXT NOT NULL,
+    keyword TEXT NOT NULL,
+    ord INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (date, platform_id, keyword)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS titles (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL UNIQUE,
+    title_lower TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS platform_titles (
+    date TEXT NOT NULL,
+    platform_id TEXT NOT NULL,
+    platform_name TEXT NOT NULL,
+    title_id INTEGER NOT NULL,
+    PRIMARY KEY (date, platform_id, title_id)
+) WITHOUT ROWID;
+"""
+
+# 按天重建时需要清理的表
+_DAY_TABLES = ("platform_days", "platform_hours", "platform_keywords", "platform_titles")
+
+
+class CubeService:
+    """聚合立方服务类"""
+
+    def __init__(
+        self,
+        parser: ParserService,
+        rollups: RollupService,
+        series: SeriesService
+    ):
+        """
+        初始化聚合立方服务
+
+        Args:
+            parser: 文件解析服务
+            rollups: 日汇总服务
+            series: 时间序列服务
+        """
+        self.parser = parser
+        self.rollups = rollups
+        self.series = series
+        self.cache = get_cache()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = Lock()
+
+    @property
+    def db_path(self) -> Path:
+        """数据库文件路径"""
+        return self.parser.project_root / "output" / CUBE_DIR_NAME / "cube.sqlite3"
+
+    def _connect(self) -> sqlite3.Connection:
+        """获取数据库连接（首次调用时创建并初始化表结构，需持有锁）"""
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != CUBE_VERSION:
+                # 结构版本不符：清空旧表后重建
+                tables = conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table'"
+                ).fetchall()
+                for (table,) in tables:
+                    conn.execute(f'DROP TABLE IF EXISTS "{table}"')
+                conn.executescript(_SCHEMA)
+                conn.execute(f"PRAGMA user_version = {CUBE_VERSION}")
+                conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _ingest_day(self, conn: sqlite3.Connection, rollup: Dict, series: Dict) -> None:
+        """
+        用日汇总和时间序列重建一天的聚合数据（需持有锁）
+
+        Args:
+            conn: 数据库连接
+            rollup: 日汇总
+            series: 时间序列
+        """
+        date_str = rollup["date"]
+        platform_names = rollup["platform_names"]
+
+        # 每个平台出现的快照数（成功爬取次数），以及按小时的分布
+        platform_snapshots = Counter()
+        hour_snapshots = Counter()
+        entries = series["entries"]
+
+        for time_str, ids in series["snapshots"].items():
+            hour = int(time_str[:2]) if time_str[:2].isdigit() else 0
+            present = {entries[index][0] for index in ids}
+            for platform_id in present:
+                platform_snapshots[platform_id] += 1
+                hour_snapshots[(platform_id, hour)] += 1
+
+        with conn:
+            for table in _DAY_TABLES:
+                conn.execute(f"DELETE FROM {table} WHERE date = ?", (date_str,))
+
+            conn.executemany(
+                "INSERT INTO platform_days VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        date_str, platform_id, platform_names[platform_id], ord_,
+                        count, platform_snapshots.get(platform_id, 0)
+                    )
+                    for ord_, (platform_id, count) in enumerate(rollup["platform_counts"].items())
+                ]
+            )
+
+            conn.executemany(
+                "INSERT INTO platform_hours VALUES (?, ?, ?, ?, ?)",
+                [
+                    (date_str, platform_id, platform_names.get(platform_id, platform_id), hour, snapshots)
+                    for (platform_id, hour), snapshots in hour_snapshots.items()
+                ]
+            )
+
+            conn.executemany(
+                "INSERT INTO platform_keywords VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (date_str, platform_id, platform_names[platform_id], keyword, ord_, count)
+                    for platform_id, keyword_counts in rollup["platform_keyword_counts"].items()
+                    for ord_, (keyword, count) in enumerate(keyword_counts.items())
+                ]
+            )
+
+            # 标题字典：先补充新标题，再查出当天标题的ID
+            day_titles = list(dict.fromkeys(
+                title for titles in rollup["titles"].values() for title in titles
+            ))
+            conn.executemany(
+                "INSERT OR IGNORE INTO titles (title, title_lower) VALUES (?, ?)",
+                [(title, title.lower()) for title in day_titles]
+            )
+            title_ids = {}
+            for i in range(0, len(day_titles), 500):
+                chunk = day_titles[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                for title_id, title in conn.execute(
+                    f"SELECT id, title FROM titles WHERE title IN ({placeholders})", chunk
+                ):
+                    title_ids[title] = title_id
+
+            conn.executemany(
+                "INSERT OR IGNORE INTO platform_titles VALUES (?, ?, ?, ?)",
+                [
+                    (date_str, platform_id, platform_names[platform_id], title_ids[title])
+                    for platform_id, titles in rollup["titles"].items()
+                    for title in titles
+                ]
+            )
+
+            conn.execute(
+                "INSERT OR REPLACE INTO cube_days VALUES (?, ?)",
+                (date_str, rollup["fingerprint"])
+            )
+
+    def _forget_day(self, conn: sqlite3.Connection, date_str: str) -> None:
+        """
+        删除一天的聚合数据（需持有锁）
+
+        Args:
+            conn: 数据库连接
+            date_str: 日期字符串（YYYY-MM-DD）
+        """
+        row = conn.execute("SELECT 1 FROM cube_days WHERE date = ?", (date_str,)).fetchone()
+        if row is None:
+            return
+
+        with conn:
+            for table in _DAY_TABLES:
+                conn.execute(f"DELETE FROM {table} WHERE date = ?", (date_str,))
+            conn.execute("DELETE FROM cube_days WHERE date = ?", (date_str,))
+
+    def ensure_range(self, start_date: datetime, end_date: datetime) -> List[str]:
+        """
+        确保日期范围内每天的聚合数据都是最新的
+
+        Args:
+            start_date: 开始日期
+            end_date: 结束日期
+
+        Returns:
+            有数据的日期字符串列表（YYYY-MM-DD）
+        """
+        today = datetime.now().date()
+        dates = []
+
+        current_date = start_date
+        while current_date <= end_date:
+            date_str = current_date.strftime("%Y-%m-%d")
+            cache_key = f"cube:{date_str}"
+            is_today = current_date.date() == today
+
+            if not is_today and self.cache.get(cache_key, ttl=None):
+                dates.append(date_str)
+                current_date += timedelta(days=1)
+                continue
+
+            try:
+                rollup = self.rollups.get_day_rollup(current_date)
+            except DataNotFoundError:
+                # 数据已被删除的日期不能留下旧的聚合数据
+                with self._lock:
+                    self._forget_day(self._connect(), date_str)
+                current_date += timedelta(days=1)
+                continue
+
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT fingerprint FROM cube_days WHERE date = ?", (date_str,)
+                ).fetchone()
+                if row is None or row[0] != rollup["fingerprint"]:
+                    try:
+                        series = self.series.get_day_series(current_date)
+                    except DataNotFoundError:
+                        series = {"entries": [], "snapshots": {}}
+                    self._ingest_day(conn, rollup, series)
+
+            if not is_today:
+                self.cache.set(cache_key, True)
+            dates.append(date_str)
+            current_date += timedelta(days=1)
+
+        return dates
+
+    def _query(self, sql: str, params: Tuple) -> List[Tuple]:
+        """执行只读查询"""
+        with self._lock:
+            return self._connect().execute(sql, params).fetchall()
+
+    def platform_coverage(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        topic: Optional[str] = None,
+        top_keywords: int = 10
+    ) -> Dict[str, Dict]:
+        """
+        按平台统计新闻数、去重标题数、话题覆盖数和热门关键词
+
+        平台和关键词的顺序与按日期顺序逐条统计时的首次出现顺序一致。
+
+        Args:
+            start_date: 开始日期
+            end_date: 结束日期
+            topic: 话题关键词（不区分大小写的子串匹配），None表示不统计
+            top_keywords: 每个平台返回的热门关键词数
+
+        Returns:
+            {平台名称: {"total_news", "unique_titles", "topic_mentions", "top_keywords": Counter}}
+        """
+        dates = self.ensure_range(start_date, end_date)
+        if not dates:
+            return {}
+        start_str, end_str = dates[0], dates[-1]
+
+        stats = {}
+        for platform_name, total_news in self._query(
+            """
+            SELECT platform_name, SUM(news_count)
+            FROM platform_days
+            WHERE date BETWEEN ? AND ?
+            GROUP BY platform_name
+            ORDER BY MIN(date || printf('%06d', ord))
+            """,
+            (start_str, end_str)
+        ):
+            stats[platform_name] = {
+                "total_news": total_news,
+                "unique_titles": 0,
+                "topic_mentions": 0,
+                "top_keywords": Counter(),
+            }
+
+        for platform_name, unique_titles in self._query(
+            """
+            SELECT platform_name, COUNT(DISTINCT title_id)
+            FROM platform_titles
+            WHERE date BETWEEN ? AND ?
+            GROUP BY platform_name
+            """,
+            (start_str, end_str)
+        ):
+            stats[platform_name]["unique_titles"] = unique_titles
+
+        if topic:
+            for platform_name, mentions in self._query(
+                """
+                SELECT pt.platform_name, COUNT(*)
+                FROM platform_titles pt JOIN titles t ON t.id = pt.title_id
+                WHERE pt.date BETWEEN ? AND ? AND instr(t.title_lower, ?) > 0
+                GROUP BY pt.platform_name
+                """,
+                (start_str, end_str, topic.lower())
+            ):
+                stats[platform_name]["topic_mentions"] = mentions
+
+        # 关键词按 (总次数降序, 首次出现顺序) 排列，与 Counter.most_common 的并列顺序一致
+        for platform_name, keyword, count in self._query(
+            """
+            SELECT platform_name, keyword, total FROM (
+                SELECT platform_name, keyword, SUM(count) AS total,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY platform_name
+                           ORDER BY SUM(count) DESC, MIN(date || printf('%06d', ord))
+                       ) AS position
+                FROM platform_keywords
+                WHERE date BETWEEN ? AND ?
+                GROUP BY platform_name, keyword
+            )
+            WHERE position <= ?
+            ORDER BY platform_name, position
+            """,
+            (start_str, end_str, top_keywords)
+        ):
+            stats[platform_name]["top_keywords"][keyword] = count
+
+        return stats
+
+    def platform_activity(self, start_date: datetime, end_date: datetime) -> Dict[str, Dict]:
+        """
+        按平台统计活跃度
+
+        Args:
+            start_date: 开始日期
+            end_date: 结束日期
+
+        Returns:
+            {平台名称: {"news_count", "days_active", "total_updates", "hourly_distribution": Counter}}
+            - total_updates: 平台出现的快照数（成功爬取次数）
+            - hourly_distribution: {小时: 该小时内平台出现的快照数}
+        """
+        dates = self.ensure_range(start_date, end_date)
+        if not dates:
+            return {}
+        start_str, end_str = dates[0], dates[-1]
+
+        activity = {}
+        for platform_name, news_count, days_active, total_updates in self._query(
+            """
+            SELECT platform_name, SUM(news_count), COUNT(DISTINCT date), SUM(snapshots)
+            FROM platform_days
+            WHERE date BETWEEN ? AND ?
+            GROUP BY platform_name
+            ORDER BY MIN(date || printf('%06d', ord))
+            """,
+            (start_str, end_str)
+        ):
+            activity[platform_name] = {
+                "news_count": news_count,
+                "days_active": days_active,
+                "total_updates": total_updates,
+                "hourly_distribution": Counter(),
+            }
+
+        for platform_name, hour, snapshots in self._query(
+            """
+            SELECT platform_name, hour, SUM(snapshots)
+            FROM platform_hours
+            WHERE date BETWEEN ? AND ?
+            GROUP BY platform_name, hour
+            ORDER BY platform_name, hour
+            """,
+            (start_str, end_str)
+        ):
+            if platform_name in activity:
+                activity[platform_name]["hourly_distribution"][hour] = snapshots
+
+        return activity
+
+    def close(self) -> None:
+        """关闭数据库连接"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -10,8 +10,14 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 
 from .cache_service import get_cache
+from .config_service import thaw
+from .cube_service import CubeService
 from .parser_service import ParserService
+from .rollup_service import RollupService
+from .series_service import SeriesService
 from ..utils.errors import DataNotFoundError
+from ..utils.keywords import get_keyword_cache_stats
+from ..utils.news_item import RankStats
 
 
 class DataService:
@@ -25,6 +31,9 @@ class DataService:
             project_root: 项目根目录
         """
         self.parser = ParserService(project_root)
+        self.rollups = RollupService(self.parser)
+        self.series = SeriesService(self.parser)
+        self.cube = CubeService(self.parser, self.rollups, self.series)
         self.cache = get_cache()
 
     def get_latest_news(
@@ -47,14 +56,8 @@ class DataService:
         Raises:
             DataNotFoundError: 数据不存在
         """
-        # 尝试从缓存获取
-        cache_key = f"latest_news:{','.join(platforms or [])}:{limit}:{include_url}"
-        cached = self.cache.get(cache_key, ttl=900)  # 15分钟缓存
-        if cached:
-            return cached
-
-        # 读取今天的数据
-        all_titles, id_to_name, timestamps = self.parser.read_all_titles_for_date(
+        # 只读取今天最新一批快照（快照解析结果按文件状态缓存，新爬取后立即可见）
+        all_titles, id_to_name, timestamps = self.parser.read_latest_snapshot(
             date=None,
             platform_ids=platforms
         )
@@ -73,7 +76,7 @@ class DataService:
 
             for title, info in titles.items():
                 # 取第一个排名
-                rank = info["ranks"][0] if info["ranks"] else 0
+                rank = info.ranks.first if info.ranks else 0
 
                 news_item = {
                     "title": title,
@@ -85,8 +88,8 @@ class DataService:
 
                 # 条件性添加 URL 字段
                 if include_url:
-                    news_item["url"] = info.get("url", "")
-                    news_item["mobileUrl"] = info.get("mobileUrl", "")
+                    news_item["url"] = info.url
+                    news_item["mobileUrl"] = info.mobile_url
 
                 news_list.append(news_item)
 
@@ -94,12 +97,7 @@ class DataService:
         news_list.sort(key=lambda x: x["rank"])
 
         # 限制返回数量
-        result = news_list[:limit]
-
-        # 缓存结果
-        self.cache.set(cache_key, result)
-
-        return result
+        return news_list[:limit]
 
     def get_news_by_date(
         self,
@@ -151,22 +149,22 @@ class DataService:
 
             for title, info in titles.items():
                 # 计算平均排名
-                avg_rank = sum(info["ranks"]) / len(info["ranks"]) if info["ranks"] else 0
+                avg_rank = info.ranks.avg
 
                 news_item = {
                     "title": title,
                     "platform": platform_id,
                     "platform_name": platform_name,
-                    "rank": info["ranks"][0] if info["ranks"] else 0,
+                    "rank": info.ranks.first if info.ranks else 0,
                     "avg_rank": round(avg_rank, 2),
-                    "count": len(info["ranks"]),
+                    "count": len(info.ranks),
                     "date": date_str
                 }
 
                 # 条件性添加 URL 字段
                 if include_url:
-                    news_item["url"] = info.get("url", "")
-                    news_item["mobileUrl"] = info.get("mobileUrl", "")
+                    news_item["url"] = info.url
+                    news_item["mobileUrl"] = info.mobile_url
 
                 news_list.append(news_item)
 
@@ -214,7 +212,8 @@ class DataService:
         results = []
         platform_distribution = Counter()
 
-        # 遍历日期范围
+        # 遍历日期范围（先批量加载各天数据，启用计算进程池时并行解析）
+        self.parser.preload_days(start_date, end_date)
         current_date = start_date
         while current_date <= end_date:
             try:
@@ -230,17 +229,17 @@ class DataService:
                     for title, info in titles.items():
                         if keyword.lower() in title.lower():
                             # 计算平均排名
-                            avg_rank = sum(info["ranks"]) / len(info["ranks"]) if info["ranks"] else 0
+                            avg_rank = info.ranks.avg
 
                             results.append({
                                 "title": title,
                                 "platform": platform_id,
                                 "platform_name": platform_name,
-                                "ranks": info["ranks"],
-                                "count": len(info["ranks"]),
+                                "ranks": info.ranks,
+                                "count": len(info.ranks),
                                 "avg_rank": round(avg_rank, 2),
-                                "url": info.get("url", ""),
-                                "mobileUrl": info.get("mobileUrl", ""),
+                                "url": info.url,
+                                "mobileUrl": info.mobile_url,
                                 "date": current_date.strftime("%Y-%m-%d")
                             })
 
@@ -260,11 +259,11 @@ class DataService:
             )
 
         # 计算统计信息
-        total_ranks = []
+        total_ranks = RankStats()
         for item in results:
-            total_ranks.extend(item["ranks"])
+            total_ranks.merge(item["ranks"])
 
-        avg_rank = sum(total_ranks) / len(total_ranks) if total_ranks else 0
+        avg_rank = total_ranks.avg
 
         # 限制返回数量(如果指定)
         total_found = len(results)
@@ -303,54 +302,35 @@ class DataService:
         Raises:
             DataNotFoundError: 数据不存在
         """
-        # 尝试从缓存获取
-        cache_key = f"trending_topics:{top_n}:{mode}"
-        cached = self.cache.get(cache_key, ttl=1800)  # 30分钟缓存
-        if cached:
-            return cached
-
-        # 读取今天的数据
-        all_titles, id_to_name, timestamps = self.parser.read_all_titles_for_date()
-
-        if not all_titles:
-            raise DataNotFoundError(
-                "未找到今天的新闻数据",
-                suggestion="请确保爬虫已经运行并生成了数据"
-            )
-
-        # 加载关键词配置
-        word_groups = self.parser.parse_frequency_words()
-
         # 根据mode选择要处理的标题数据
-        titles_to_process = {}
+        cache_key = f"trending_topics:{top_n}:{mode}"
 
         if mode == "daily":
             # daily模式:处理当天所有累计数据
-            titles_to_process = all_titles
+            cached = self.cache.get(cache_key, ttl=1800)  # 30分钟缓存
+            if cached:
+                return cached
+
+            titles_to_process, _, _ = self.parser.read_all_titles_for_date()
 
         elif mode == "current":
-            # current模式:只处理最新一批数据(最新时间戳的文件)
-            if timestamps:
-                # 找出最新的时间戳
-                latest_timestamp = max(timestamps.values())
-
-                # 重新读取,只获取最新时间的数据
-                # 这里我们通过timestamps字典反查找最新文件对应的平台
-                latest_titles, _, _ = self.parser.read_all_titles_for_date()
-
-                # 由于read_all_titles_for_date返回所有文件的合并数据,
-                # 我们需要通过timestamps来过滤出最新批次
-                # 简化实现:使用当前所有数据作为最新批次
-                # (更精确的实现需要解析服务支持按时间过滤)
-                titles_to_process = latest_titles
-            else:
-                titles_to_process = all_titles
+            # current模式:只读取最新一批快照,不加载整天数据
+            titles_to_process, _, _ = self.parser.read_latest_snapshot()
 
         else:
             raise ValueError(
                 f"不支持的模式: {mode}。支持的模式: daily, current"
             )
 
+        if not titles_to_process:
+            raise DataNotFoundError(
+                "未找到今天的新闻数据",
+                suggestion="请确保爬虫已经运行并生成了数据"
+            )
+
+        # 加载关键词配置
+        word_groups = self.parser.parse_frequency_words()
+
         # 统计词频
         word_frequency = Counter()
         keyword_to_news = {}
@@ -395,8 +375,9 @@ class DataService:
             "description": self._get_mode_description(mode)
         }
 
-        # 缓存结果
-        self.cache.set(cache_key, result)
+        # 缓存结果(current模式直接读取最新快照,不缓存)
+        if mode == "daily":
+            self.cache.set(cache_key, result)
 
         return result
 
@@ -421,13 +402,7 @@ class DataService:
         Raises:
             FileParseError: 配置文件解析错误
         """
-        # 尝试从缓存获取
-        cache_key = f"config:{section}"
-        cached = self.cache.get(cache_key, ttl=3600)  # 1小时缓存
-        if cached:
-            return cached
-
-        # 解析配置文件
+        # 配置由配置服务缓存（文件变化时自动重新加载），这里只组装输出
         config_data = self.parser.parse_yaml_config()
         word_groups = self.parser.parse_frequency_words()
 
@@ -446,7 +421,7 @@ class DataService:
                 "enable_notification": config_data.get("notification", {}).get("enable_notification", True),
                 "enabled_channels": [],
                 "message_batch_size": config_data.get("notification", {}).get("message_batch_size", 20),
-                "push_window": config_data.get("notification", {}).get("push_window", {})
+                "push_window": thaw(config_data.get("notification", {}).get("push_window", {}))
             }
 
             # 检测已配置的通知渠道
@@ -460,7 +435,7 @@ class DataService:
 
         if section == "all" or section == "keywords":
             keywords_config = {
-                "word_groups": word_groups,
+                "word_groups": thaw(word_groups),
                 "total_groups": len(word_groups)
             }
 
@@ -490,9 +465,6 @@ class DataService:
         else:
             result = {}
 
-        # 缓存结果
-        self.cache.set(cache_key, result)
-
         return result
 
     def get_available_date_range(self) -> Tuple[Optional[datetime], Optional[datetime]]:
@@ -600,5 +572,6 @@ class DataService:
                 "latest_record": latest_record.strftime("%Y-%m-%d") if latest_record else None,
             },
             "cache": self.cache.get_stats(),
+            "keyword_cache": get_keyword_cache_stats(),
             "health": "healthy"
         }
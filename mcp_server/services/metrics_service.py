@@ -0,0 +1,261 @@
+"""
+指标服务
+
+统计 MCP 服务器运行期间的工具调用和数据读取情况：
+- 每个工具的调用次数、错误次数（按错误码）和耗时分布（直方图）
+- 解析的快照文件数、从磁盘读取的字节数（快照文件和各类磁盘缓存）
+- 每次调用加载了多少天的数据（按来源：内存缓存 / 解析缓存 / 重新解析）
+
+HTTP 模式下通过 /metrics（Prometheus 文本格式）导出，汇总信息也包含在 get_system_status 中。
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+
+# 工具耗时直方图的桶上界（秒）
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# 不在工具调用中的数据加载（如后台预热）记在这个名称下
+BACKGROUND_TOOL = "background"
+
+
+def _label(value: str) -> str:
+    """转义 Prometheus 标签值"""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class ToolStats:
+    """单个工具的调用统计"""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors: Dict[str, int] = {}
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.requests += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+                break
+
+    def quantile(self, q: float) -> Optional[float]:
+        """按直方图估计分位数（返回所在桶的上界，超出最大桶时返回最大耗时）"""
+        if not self.requests:
+            return None
+        target = q * self.requests
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.buckets):
+            cumulative += count
+            if cumulative >= target:
+                return bound
+        return self.max_seconds
+
+
+class MetricsService:
+    """指标服务类"""
+
+    def __init__(self):
+        """初始化指标服务"""
+        self.started_at = time.time()
+        self._tools: Dict[str, ToolStats] = {}
+        self._files_parsed = 0
+        self._bytes_read: Dict[str, int] = {}
+        self._days_loaded: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @contextmanager
+    def tool_context(self, tool_name: str):
+        """标记当前线程正在执行的工具（数据加载按工具归类）"""
+        previous = getattr(self._local, "tool", None)
+        self._local.tool = tool_name
+        try:
+            yield
+        finally:
+            self._local.tool = previous
+
+    def record_tool_call(self, tool_name: str, seconds: float) -> None:
+        """
+        记录一次工具调用
+
+        Args:
+            tool_name: 工具名称
+            seconds: 耗时（从排队开始到返回结果）
+        """
+        with self._lock:
+            stats = self._tools.get(tool_name)
+            if stats is None:
+                stats = self._tools[tool_name] = ToolStats()
+            stats.observe(seconds)
+
+    def record_tool_error(self, tool_name: str, code: str) -> None:
+        """
+        记录一次工具错误
+
+        Args:
+            tool_name: 工具名称
+            code: 错误码（如 DATA_NOT_FOUND、TOOL_TIMEOUT）
+        """
+        with self._lock:
+            stats = self._tools.get(tool_name)
+            if stats is None:
+                stats = self._tools[tool_name] = ToolStats()
+            stats.errors[code] = stats.errors.get(code, 0) + 1
+
+    def record_read(self, source: str, size: int, files: int = 0) -> None:
+        """
+        记录一次磁盘读取
+
+        Args:
+            source: 数据来源（snapshot、parse_cache、series、rollup）
+            size: 读取的字节数
+            files: 解析的快照文件数
+        """
+        with self._lock:
+            self._bytes_read[source] = self._bytes_read.get(source, 0) + size
+            self._files_parsed += files
+
+    def record_day_load(self, source: str) -> None:
+        """
+        记录一次日聚合加载（计入当前线程正在执行的工具）
+
+        Args:
+            source: memory（内存缓存）、parse_cache（解析缓存）或 parsed（解析快照文件）
+        """
+        key = (getattr(self._local, "tool", None) or BACKGROUND_TOOL, source)
+        with self._lock:
+            self._days_loaded[key] = self._days_loaded.get(key, 0) + 1
+
+    def summary(self) -> Dict:
+        """
+        获取指标汇总
+
+        Returns:
+            {tools: {工具: 调用统计}, io: 读取统计, days_loaded: {工具: {来源: 次数}}}
+        """
+        with self._lock:
+            tools = {}
+            for name, stats in sorted(self._tools.items()):
+                p95 = stats.quantile(0.95)
+                tools[name] = {
+                    "requests": stats.requests,
+                    "errors": sum(stats.errors.values()),
+                    "error_codes": dict(stats.errors),
+                    "avg_ms": round(stats.total_seconds * 1000 / stats.requests, 2) if stats.requests else None,
+                    "p95_ms": round(p95 * 1000, 2) if p95 is not None else None,
+                    "max_ms": round(stats.max_seconds * 1000, 2),
+                }
+
+            days_loaded: Dict[str, Dict[str, int]] = {}
+            for (tool, source), count in sorted(self._days_loaded.items()):
+                days_loaded.setdefault(tool, {})[source] = count
+
+            return {
+                "uptime_seconds": round(time.time() - self.started_at, 1),
+                "tools": tools,
+                "io": {
+                    "files_parsed": self._files_parsed,
+                    "bytes_read": dict(self._bytes_read),
+                },
+                "days_loaded": days_loaded,
+            }
+
+    def render_prometheus(self, cache_stats: Optional[Dict] = None) -> str:
+        """
+        导出 Prometheus 文本格式
+
+        Args:
+            cache_stats: CacheService.get_stats() 的结果
+
+        Returns:
+            指标文本
+        """
+        lines: List[str] = []
+
+        def metric(name: str, kind: str, help_text: str, samples: List[Tuple[str, float]]) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{name}{labels} {value}")
+
+        with self._lock:
+            tools = sorted(self._tools.items())
+
+            metric("trendradar_tool_requests_total", "counter", "Tool invocations.", [
+                (f'{{tool="{_label(name)}"}}', stats.requests) for name, stats in tools
+            ])
+            metric("trendradar_tool_errors_total", "counter", "Tool invocations that returned an error.", [
+                (f'{{tool="{_label(name)}",code="{_label(code)}"}}', count)
+                for name, stats in tools
+                for code, count in sorted(stats.errors.items())
+            ])
+
+            lines.append("# HELP trendradar_tool_duration_seconds Tool latency including queueing.")
+            lines.append("# TYPE trendradar_tool_duration_seconds histogram")
+            for name, stats in tools:
+                tool = _label(name)
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS, stats.buckets):
+                    cumulative += count
+                    lines.append(f'trendradar_tool_duration_seconds_bucket{{tool="{tool}",le="{bound:g}"}} {cumulative}')
+                lines.append(f'trendradar_tool_duration_seconds_bucket{{tool="{tool}",le="+Inf"}} {stats.requests}')
+                lines.append(f'trendradar_tool_duration_seconds_sum{{tool="{tool}"}} {stats.total_seconds}')
+                lines.append(f'trendradar_tool_duration_seconds_count{{tool="{tool}"}} {stats.requests}')
+
+            metric("trendradar_files_parsed_total", "counter", "Snapshot files parsed.", [
+                ("", self._files_parsed)
+            ])
+            metric("trendradar_bytes_read_total", "counter", "Bytes read from disk by source.", [
+                (f'{{source="{_label(source)}"}}', size) for source, size in sorted(self._bytes_read.items())
+            ])
+            metric("trendradar_days_loaded_total", "counter", "Day aggregates loaded by tool and source.", [
+                (f'{{tool="{_label(tool)}",source="{_label(source)}"}}', count)
+                for (tool, source), count in sorted(self._days_loaded.items())
+            ])
+
+        if cache_stats is not None:
+            metric("trendradar_cache_hits_total", "counter", "Cache lookups that found a live entry.", [
+                ("", cache_stats["hits"])
+            ])
+            metric("trendradar_cache_misses_total", "counter", "Cache lookups that found no live entry.", [
+                ("", cache_stats["misses"])
+            ])
+            metric("trendradar_cache_evictions_total", "counter", "Cache entries removed by expiry or clearing.", [
+                ("", cache_stats["evictions"])
+            ])
+            metric("trendradar_cache_entries", "gauge", "Live cache entries.", [
+                ("", cache_stats["total_entries"])
+            ])
+            metric("trendradar_cache_bytes", "gauge", "Approximate size of cached data (source bytes).", [
+                ("", cache_stats["bytes"])
+            ])
+
+        metric("trendradar_uptime_seconds", "gauge", "Seconds since the server started.", [
+            ("", round(time.time() - self.started_at, 1))
+        ])
+        return "\n".join(lines) + "\n"
+
+
+# 全局指标实例
+_global_metrics = None
+
+
+def get_metrics() -> MetricsService:
+    """
+    获取全局指标实例
+
+    Returns:
+        全局指标服务实例
+    """
+    global _global_metrics
+    if _global_metrics is None:
+        _global_metrics = MetricsService()
+    return _global_metrics
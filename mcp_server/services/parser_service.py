@@ -2,17 +2,149 @@
 文件解析服务
 
 提供txt格式新闻数据和YAML配置文件的解析功能。
+
+历史日期的解析结果（日聚合）写入 output/.parse_cache/YYYY-MM-DD.pickle，
+并记录当天txt目录的文件状态；服务重启后一次读取即可恢复，
+目录中的文件有变化时自动重新解析。
 """
 
-import re
+import os
+import pickle
+from array import array
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
-from datetime import datetime
-
-import yaml
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Union
+from datetime import datetime, timedelta
+
+from trendradar_core import (
+    RankStats,
+    build_snapshot,
+    clean_title,
+    intern_text,
+    parse_snapshot,
+    read_latest_pointer,
+    read_snapshot_records,
+)
 
 from ..utils.errors import FileParseError, DataNotFoundError
+from ..utils.news_item import NewsItem
 from .cache_service import get_cache
+from .compute_service import get_compute
+from .config_service import get_config_service, load_frequency_words, load_yaml_config
+from .metrics_service import get_metrics
+
+
+# 启用计算进程池时，待解析文件达到该数量才并行解析（文件较少时进程间传输开销大于收益）
+PARALLEL_MIN_FILES = 8
+
+# 解析缓存目录（位于 output/ 下）
+PARSE_CACHE_DIR_NAME = ".parse_cache"
+
+# 解析缓存格式版本（结构变化时递增，旧版本文件会被重新解析）
+PARSE_CACHE_VERSION = 2
+
+
+def encode_day(day: Dict) -> Tuple:
+    """
+    将日聚合编码为只含基本类型的扁平结构（用于持久化）
+
+    快照中的标题保存为其在平台标题列表中的下标，同一标题只保存一次。
+
+    Args:
+        day: 日聚合字典
+
+    Returns:
+        (PARSE_CACHE_VERSION, files, id_to_name, all_timestamps, platforms, snapshots)
+    """
+    platforms = []
+    title_index = {}
+    for platform_id, titles in day["all_titles"].items():
+        platforms.append((platform_id, [
+            (title, info.ranks.state(), info.url, info.mobile_url)
+            for title, info in titles.items()
+        ]))
+        title_index[platform_id] = {title: i for i, title in enumerate(titles)}
+
+    snapshots = [
+        (file_name, [
+            (platform_id, array("I", [title_index[platform_id][title] for title in titles]))
+            for platform_id, titles in titles_by_id.items()
+        ])
+        for file_name, titles_by_id in day["snapshots"].items()
+    ]
+
+    return (
+        PARSE_CACHE_VERSION,
+        day["files"],
+        day["id_to_name"],
+        day["all_timestamps"],
+        platforms,
+        snapshots,
+    )
+
+
+def decode_day(data: Tuple) -> Dict:
+    """
+    从 encode_day 的结果恢复日聚合
+
+    Args:
+        data: 编码后的日聚合
+
+    Returns:
+        日聚合字典（complete 为 True）
+    """
+    _, files, id_to_name, all_timestamps, platforms, encoded_snapshots = data
+
+    all_titles = {}
+    title_lists = {}
+    for platform_id, entries in platforms:
+        platform_id = intern_text(platform_id)
+        titles = {}
+        for title, state, url, mobile_url in entries:
+            item = NewsItem.__new__(NewsItem)
+            item.ranks = RankStats.from_state(state)
+            item.url = intern_text(url)
+            item.mobile_url = intern_text(mobile_url)
+            titles[title] = item
+        all_titles[platform_id] = titles
+        title_lists[platform_id] = list(titles)
+
+    snapshots = {
+        file_name: {
+            intern_text(platform_id): tuple(title_lists[platform_id][i] for i in indexes)
+            for platform_id, indexes in titles_by_id
+        }
+        for file_name, titles_by_id in encoded_snapshots
+    }
+
+    return {
+        "files": files,
+        "all_titles": all_titles,
+        "id_to_name": id_to_name,
+        "all_timestamps": all_timestamps,
+        "snapshots": snapshots,
+        "complete": True,
+    }
+
+
+def _files_size(files: Dict[str, Tuple[int, int]]) -> int:
+    """txt目录状态 {filename: (mtime_ns, size)} 中文件的总字节数（作为缓存占用的近似值）"""
+    return sum(size for _, size in files.values())
+
+
+def scan_snapshot_file(path: str) -> Tuple[Optional[List[Tuple]], Optional[str]]:
+    """
+    解析快照文件为记录列表（在计算进程中执行）
+
+    Args:
+        path: 快照文件路径
+
+    Returns:
+        (记录列表, None)，解析失败时返回 (None, 错误信息)
+    """
+    try:
+        return read_snapshot_records(path), None
+    except Exception as e:
+        return None, str(e)
 
 
 class ParserService:
@@ -46,11 +178,7 @@ class ParserService:
         Returns:
             清理后的标题
         """
-        # 移除多余空白
-        title = re.sub(r'\s+', ' ', title)
-        # 移除特殊字符
-        title = title.strip()
-        return title
+        return clean_title(title)
 
     def parse_txt_file(self, file_path: Path) -> Tuple[Dict, Dict]:
         """
@@ -61,7 +189,7 @@ class ParserService:
 
         Returns:
             (titles_by_id, id_to_name) 元组
-            - titles_by_id: {platform_id: {title: {ranks, url, mobileUrl}}}
+            - titles_by_id: {platform_id: {title: NewsItem}}
             - id_to_name: {platform_id: platform_name}
 
         Raises:
@@ -70,74 +198,9 @@ class ParserService:
         if not file_path.exists():
             raise FileParseError(str(file_path), "文件不存在")
 
-        titles_by_id = {}
-        id_to_name = {}
-
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
-                sections = content.split("\n\n")
-
-                for section in sections:
-                    if not section.strip() or "==== 以下ID请求失败 ====" in section:
-                        continue
-
-                    lines = section.strip().split("\n")
-                    if len(lines) < 2:
-                        continue
-
-                    # 解析header: id | name 或 id
-                    header_line = lines[0].strip()
-                    if " | " in header_line:
-                        parts = header_line.split(" | ", 1)
-                        source_id = parts[0].strip()
-                        name = parts[1].strip()
-                        id_to_name[source_id] = name
-                    else:
-                        source_id = header_line
-                        id_to_name[source_id] = source_id
-
-                    titles_by_id[source_id] = {}
-
-                    # 解析标题行
-                    for line in lines[1:]:
-                        if line.strip():
-                            try:
-                                title_part = line.strip()
-                                rank = None
-
-                                # 提取排名
-                                if ". " in title_part and title_part.split(". ")[0].isdigit():
-                                    rank_str, title_part = title_part.split(". ", 1)
-                                    rank = int(rank_str)
-
-                                # 提取 MOBILE URL
-                                mobile_url = ""
-                                if " [MOBILE:" in title_part:
-                                    title_part, mobile_part = title_part.rsplit(" [MOBILE:", 1)
-                                    if mobile_part.endswith("]"):
-                                        mobile_url = mobile_part[:-1]
-
-                                # 提取 URL
-                                url = ""
-                                if " [URL:" in title_part:
-                                    title_part, url_part = title_part.rsplit(" [URL:", 1)
-                                    if url_part.endswith("]"):
-                                        url = url_part[:-1]
-
-                                title = self.clean_title(title_part.strip())
-                                ranks = [rank] if rank is not None else [1]
-
-                                titles_by_id[source_id][title] = {
-                                    "ranks": ranks,
-                                    "url": url,
-                                    "mobileUrl": mobile_url,
-                                }
-
-                            except Exception as e:
-                                # 忽略单行解析错误
-                                continue
-
+            titles_by_id, id_to_name = parse_snapshot(file_path, NewsItem)
+            get_metrics().record_read("snapshot", file_path.stat().st_size, files=1)
         except Exception as e:
             raise FileParseError(str(file_path), str(e))
 
@@ -157,6 +220,364 @@ class ParserService:
             date = datetime.now()
         return date.strftime("%Y年%m月%d日")
 
+    def _scan_txt_dir(self, txt_dir: Path) -> Dict[str, Tuple[int, int]]:
+        """
+        扫描txt目录，生成目录状态指纹
+
+        Args:
+            txt_dir: txt文件目录
+
+        Returns:
+            {filename: (mtime_ns, size)}，按文件名排序
+        """
+        files = {}
+        with os.scandir(txt_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(".txt") and entry.is_file():
+                    stat = entry.stat()
+                    files[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        return dict(sorted(files.items()))
+
+    def _parse_files(self, paths: List[Path]) -> List[Union[Tuple[Dict, Dict], Exception]]:
+        """
+        解析多个txt文件
+
+        启用计算进程池且文件较多时，文件在进程池中并行解析，结果与逐个解析完全一致。
+
+        Args:
+            paths: txt文件路径列表
+
+        Returns:
+            与 paths 一一对应的 (titles_by_id, id_to_name)，解析失败的文件为异常对象
+        """
+        compute = get_compute()
+        results = []
+
+        if not compute.enabled or len(paths) < PARALLEL_MIN_FILES:
+            for path in paths:
+                try:
+                    results.append(self.parse_txt_file(path))
+                except Exception as e:
+                    results.append(e)
+            return results
+
+        scanned = compute.map_calls(scan_snapshot_file, [str(path) for path in paths])
+        metrics = get_metrics()
+        for path, (records, error) in zip(paths, scanned):
+            if error is not None:
+                results.append(FileParseError(str(path), error))
+            else:
+                results.append(build_snapshot(records, NewsItem))
+                metrics.record_read("snapshot", path.stat().st_size, files=1)
+        return results
+
+    def _merge_files(
+        self,
+        txt_dir: Path,
+        file_names: List[str],
+        all_titles: Dict,
+        id_to_name: Dict,
+        all_timestamps: Dict,
+        owned: set,
+        snapshots: Optional[Dict] = None,
+        parsed: Optional[List] = None
+    ) -> None:
+        """
+        按文件名顺序解析txt文件并合并到日聚合中
+
+        已缓存的标题信息不会被原地修改：首次合并到某条旧标题时先复制，
+        避免影响仍持有旧聚合结果的调用方。
+
+        Args:
+            txt_dir: txt文件目录
+            file_names: 待合并的文件名列表（已排序）
+            all_titles: 标题聚合 {platform_id: {title: NewsItem}}
+            id_to_name: 平台ID到名称的映射
+            all_timestamps: 文件时间戳 {filename: timestamp}
+            owned: 本次合并中新建的 (platform_id, title) 集合
+            snapshots: 各快照包含的标题 {filename: {platform_id: (title, ...)}}，None表示不记录
+            parsed: 已解析的结果（与 file_names 一一对应，见 _parse_files），None表示在此解析
+        """
+        if parsed is None:
+            parsed = self._parse_files([txt_dir / file_name for file_name in file_names])
+
+        for file_name, result in zip(file_names, parsed):
+            txt_file = txt_dir / file_name
+            try:
+                if isinstance(result, Exception):
+                    raise result
+                titles_by_id, file_id_to_name = result
+
+                # 更新id_to_name
+                id_to_name.update(file_id_to_name)
+
+                # 合并标题数据
+                for platform_id, titles in titles_by_id.items():
+                    platform_titles = all_titles.setdefault(platform_id, {})
+
+                    for title, info in titles.items():
+                        existing = platform_titles.get(title)
+                        if existing is None:
+                            # 新解析的条目不被其他地方引用，直接放入聚合
+                            platform_titles[title] = info
+                            owned.add((platform_id, title))
+                            continue
+
+                        if (platform_id, title) not in owned:
+                            existing = existing.copy()
+                            platform_titles[title] = existing
+                            owned.add((platform_id, title))
+
+                        # 合并排名
+                        existing.ranks.merge(info.ranks)
+
+                # 记录文件时间戳
+                all_timestamps[file_name] = txt_file.stat().st_mtime
+
+                # 记录快照中的标题（引用已有字符串，用于按小时/快照统计）
+                if snapshots is not None:
+                    snapshots[file_name] = {
+                        platform_id: tuple(titles.keys())
+                        for platform_id, titles in titles_by_id.items()
+                    }
+
+            except Exception as e:
+                # 忽略单个文件的解析错误，继续处理其他文件
+                print(f"Warning: 解析文件 {txt_file} 失败: {e}")
+                continue
+
+    @property
+    def parse_cache_dir(self) -> Path:
+        """解析缓存目录"""
+        return self.project_root / "output" / PARSE_CACHE_DIR_NAME
+
+    def _parse_cache_path(self, date: datetime) -> Path:
+        return self.parse_cache_dir / f"{date.strftime('%Y-%m-%d')}.pickle"
+
+    def _read_parse_cache(self, date: datetime, files: Dict[str, Tuple[int, int]]) -> Optional[Dict]:
+        """
+        读取已保存的日聚合
+
+        缓存文件只由本服务写入（与 output/ 下的其他数据同样可信）。
+
+        Args:
+            date: 日期对象
+            files: 当前txt目录状态 {filename: (mtime_ns, size)}
+
+        Returns:
+            日聚合字典；不存在、格式错误、版本不符或文件状态不一致时返回None
+        """
+        try:
+            with open(self._parse_cache_path(date), "rb") as f:
+                raw = f.read()
+            get_metrics().record_read("parse_cache", len(raw))
+            data = pickle.loads(raw)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError):
+            return None
+
+        if not isinstance(data, tuple) or not data or data[0] != PARSE_CACHE_VERSION:
+            return None
+        if data[1] != files:
+            return None
+
+        try:
+            return decode_day(data)
+        except (ValueError, TypeError, KeyError, IndexError) as e:
+            print(f"Warning: 解析缓存 {self._parse_cache_path(date)} 无效: {e}")
+            return None
+
+    def _write_parse_cache(self, date: datetime, day: Dict) -> None:
+        """
+        保存日聚合（先写临时文件再替换）
+
+        Args:
+            date: 日期对象
+            day: 日聚合字典
+        """
+        path = self._parse_cache_path(date)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f".{path.name}.tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(pickle.dumps(encode_day(day), protocol=pickle.HIGHEST_PROTOCOL))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            # 写入失败不影响本次查询，下次启动时重新解析
+            print(f"Warning: 保存解析缓存 {path} 失败: {e}")
+
+    def _plan_day(self, date: datetime = None) -> Tuple[Optional[Dict], Optional[Dict]]:
+        """
+        检查指定日期的缓存，确定需要解析的文件
+
+        缓存以目录中txt文件的 (文件名, mtime, size) 为指纹：
+        - 指纹未变化：直接返回缓存
+        - 仅新增了更晚的快照文件：只解析新文件并合并到缓存的聚合中
+        - 其他变化（文件被修改或删除）：重新解析整天数据
+        - 历史日期的数据不再变化，构建后永久缓存，不再检查目录；
+          同时写入解析缓存目录，服务重启后文件状态一致时直接读取
+
+        Args:
+            date: 日期对象，默认为今天
+
+        Returns:
+            (day, plan) 元组：缓存可用时 day 为日聚合、plan 为 None；
+            否则 day 为 None，plan 为交给 _finish_day 的加载计划
+
+        Raises:
+            DataNotFoundError: 数据不存在
+        """
+        date_folder = self.get_date_folder_name(date)
+        cache_key = f"day_titles:{date_folder}"
+
+        cached = self.cache.get(cache_key, ttl=None)
+        if cached and cached["complete"]:
+            get_metrics().record_day_load("memory")
+            return cached, None
+
+        txt_dir = self.project_root / "output" / date_folder / "txt"
+
+        if not txt_dir.exists():
+            raise DataNotFoundError(
+                f"未找到 {date_folder} 的数据目录",
+                suggestion="请先运行爬虫或检查日期是否正确"
+            )
+
+        files = self._scan_txt_dir(txt_dir)
+
+        if not files:
+            raise DataNotFoundError(
+                f"{date_folder} 没有数据文件",
+                suggestion="请等待爬虫任务完成"
+            )
+
+        is_today = (date is None) or (date.date() == datetime.now().date())
+
+        if cached is None and not is_today:
+            stored = self._read_parse_cache(date, files)
+            if stored is not None:
+                self.cache.set(cache_key, stored, _files_size(files))
+                get_metrics().record_day_load("parse_cache")
+                return stored, None
+
+        if cached and cached["files"] == files:
+            if not is_today:
+                # 当天结束后的首次访问：确认无变化，转为永久缓存
+                cached = dict(cached, complete=True)
+                self.cache.set(cache_key, cached, _files_size(files))
+                self._write_parse_cache(date, cached)
+            get_metrics().record_day_load("memory")
+            return cached, None
+
+        # 判断是否可以增量合并：旧文件均未变化，且新文件都排在已有文件之后
+        incremental = False
+        if cached and cached["files"]:
+            last_name = next(reversed(cached["files"]))
+            incremental = all(
+                files.get(name) == state for name, state in cached["files"].items()
+            ) and all(
+                name > last_name for name in files if name not in cached["files"]
+            )
+
+        if incremental:
+            new_names = [name for name in files if name not in cached["files"]]
+            all_titles = {pid: dict(titles) for pid, titles in cached["all_titles"].items()}
+            id_to_name = dict(cached["id_to_name"])
+            all_timestamps = dict(cached["all_timestamps"])
+            snapshots = dict(cached["snapshots"])
+        else:
+            new_names = list(files)
+            all_titles = {}
+            id_to_name = {}
+            all_timestamps = {}
+            snapshots = {}
+
+        plan = {
+            "date": date,
+            "cache_key": cache_key,
+            "txt_dir": txt_dir,
+            "new_names": new_names,
+            "day": {
+                "files": files,
+                "all_titles": all_titles,
+                "id_to_name": id_to_name,
+                "all_timestamps": all_timestamps,
+                "snapshots": snapshots,
+                "complete": not is_today,
+            },
+        }
+        return None, plan
+
+    def _finish_day(self, plan: Dict, parsed: Optional[List] = None) -> Dict:
+        """
+        按加载计划合并新文件并写入缓存
+
+        Args:
+            plan: _plan_day 返回的加载计划
+            parsed: 新文件的解析结果（见 _parse_files），None表示在此解析
+
+        Returns:
+            日聚合字典
+        """
+        day = plan["day"]
+        self._merge_files(
+            plan["txt_dir"], plan["new_names"], day["all_titles"], day["id_to_name"],
+            day["all_timestamps"], set(), day["snapshots"], parsed
+        )
+        self.cache.set(plan["cache_key"], day, _files_size(day["files"]))
+        get_metrics().record_day_load("parsed")
+        if day["complete"]:
+            self._write_parse_cache(plan["date"], day)
+        return day
+
+    def _load_day(self, date: datetime = None) -> Dict:
+        """
+        读取指定日期的全部平台数据（按目录状态缓存，见 _plan_day）
+
+        Args:
+            date: 日期对象，默认为今天
+
+        Returns:
+            日聚合字典，包含 files/all_titles/id_to_name/all_timestamps/snapshots/complete
+
+        Raises:
+            DataNotFoundError: 数据不存在
+        """
+        day, plan = self._plan_day(date)
+        if day is not None:
+            return day
+        return self._finish_day(plan)
+
+    def preload_days(self, start_date: datetime, end_date: datetime) -> None:
+        """
+        预先加载日期范围内尚未缓存的日数据
+
+        各天需要解析的文件合并为一批解析（启用计算进程池时并行），
+        再按日期和文件名顺序合并，结果与逐天读取完全一致。
+        没有数据的日期直接跳过。
+
+        Args:
+            start_date: 开始日期
+            end_date: 结束日期
+        """
+        plans = []
+        current = start_date
+        while current <= end_date:
+            try:
+                _, plan = self._plan_day(current)
+            except DataNotFoundError:
+                plan = None
+            if plan is not None:
+                plans.append(plan)
+            current += timedelta(days=1)
+
+        if not plans:
+            return
+
+        paths = [plan["txt_dir"] / name for plan in plans for name in plan["new_names"]]
+        parsed = iter(self._parse_files(paths))
+        for plan in plans:
+            self._finish_day(plan, [next(parsed) for _ in plan["new_names"]])
+
     def read_all_titles_for_date(
         self,
         date: datetime = None,
@@ -171,29 +592,91 @@ class ParserService:
 
         Returns:
             (all_titles, id_to_name, all_timestamps) 元组
-            - all_titles: {platform_id: {title: {ranks, url, mobileUrl, ...}}}
+            - all_titles: {platform_id: {title: NewsItem}}
             - id_to_name: {platform_id: platform_name}
             - all_timestamps: {filename: timestamp}
 
         Raises:
             DataNotFoundError: 数据不存在
         """
-        # 生成缓存键
-        date_str = self.get_date_folder_name(date)
-        platform_key = ','.join(sorted(platform_ids)) if platform_ids else 'all'
-        cache_key = f"read_all_titles:{date_str}:{platform_key}"
+        day = self._load_day(date)
+        all_titles = day["all_titles"]
 
-        # 尝试从缓存获取
-        # 对于历史数据（非今天），使用更长的缓存时间（1小时）
-        # 对于今天的数据，使用较短的缓存时间（15分钟），因为可能有新数据
-        is_today = (date is None) or (date.date() == datetime.now().date())
-        ttl = 900 if is_today else 3600  # 15分钟 vs 1小时
+        # 平台过滤基于同一份日聚合，不单独缓存
+        if platform_ids:
+            all_titles = {
+                platform_id: titles
+                for platform_id, titles in all_titles.items()
+                if platform_id in platform_ids
+            }
+
+        if not all_titles:
+            date_folder = self.get_date_folder_name(date)
+            raise DataNotFoundError(
+                f"{date_folder} 没有有效的数据",
+                suggestion="请检查数据文件格式或重新运行爬虫"
+            )
+
+        return all_titles, day["id_to_name"], day["all_timestamps"]
+
+    def read_day_with_files(self, date: datetime = None) -> Tuple[Dict, Dict, Dict[str, Tuple[int, int]]]:
+        """
+        读取指定日期的全部平台数据，并返回对应的文件状态指纹
+
+        数据与指纹来自同一次目录扫描，可用于判断派生数据（如日汇总）是否过期。
+
+        Args:
+            date: 日期对象，默认为今天
+
+        Returns:
+            (all_titles, id_to_name, files) 元组
+            - files: {filename: (mtime_ns, size)}
+
+        Raises:
+            DataNotFoundError: 数据不存在
+        """
+        day = self._load_day(date)
+
+        if not day["all_titles"]:
+            date_folder = self.get_date_folder_name(date)
+            raise DataNotFoundError(
+                f"{date_folder} 没有有效的数据",
+                suggestion="请检查数据文件格式或重新运行爬虫"
+            )
+
+        return day["all_titles"], day["id_to_name"], day["files"]
 
-        cached = self.cache.get(cache_key, ttl=ttl)
-        if cached:
-            return cached
+    def read_day_snapshots(self, date: datetime = None) -> Tuple[Dict, Dict[str, Tuple[int, int]]]:
+        """
+        读取指定日期每个快照包含的标题，并返回对应的文件状态指纹
+
+        Args:
+            date: 日期对象，默认为今天
+
+        Returns:
+            (snapshots, files) 元组
+            - snapshots: {filename: {platform_id: (title, ...)}}，按文件名排序
+            - files: {filename: (mtime_ns, size)}
+
+        Raises:
+            DataNotFoundError: 数据不存在
+        """
+        day = self._load_day(date)
+        return day["snapshots"], day["files"]
+
+    def scan_date_files(self, date: datetime = None) -> Dict[str, Tuple[int, int]]:
+        """
+        扫描指定日期的txt目录状态（不解析文件）
+
+        Args:
+            date: 日期对象，默认为今天
 
-        # 缓存未命中，读取文件
+        Returns:
+            {filename: (mtime_ns, size)}，按文件名排序
+
+        Raises:
+            DataNotFoundError: 数据目录不存在
+        """
         date_folder = self.get_date_folder_name(date)
         txt_dir = self.project_root / "output" / date_folder / "txt"
 
@@ -203,49 +686,85 @@ class ParserService:
                 suggestion="请先运行爬虫或检查日期是否正确"
             )
 
-        all_titles = {}
-        id_to_name = {}
-        all_timestamps = {}
+        return self._scan_txt_dir(txt_dir)
 
-        # 读取所有txt文件
-        txt_files = sorted(txt_dir.glob("*.txt"))
+    def read_latest_snapshot(
+        self,
+        date: datetime = None,
+        platform_ids: Optional[List[str]] = None
+    ) -> Tuple[Dict, Dict, Dict]:
+        """
+        读取指定日期最新一批快照的标题（只解析最新快照，不加载整天数据）
 
-        if not txt_files:
+        存在最新快照指针且与目录中最新文件一致时，每个平台取其最近一次成功
+        爬取所在的快照；否则（如旧数据没有指针）直接使用最新的快照文件。
+
+        Args:
+            date: 日期对象，默认为今天
+            platform_ids: 平台ID列表，None表示所有平台
+
+        Returns:
+            (all_titles, id_to_name, all_timestamps) 元组，结构与
+            read_all_titles_for_date 相同，all_timestamps 只包含用到的快照文件
+
+        Raises:
+            DataNotFoundError: 数据不存在
+        """
+        date_folder = self.get_date_folder_name(date)
+        txt_dir = self.project_root / "output" / date_folder / "txt"
+
+        if not txt_dir.exists():
+            raise DataNotFoundError(
+                f"未找到 {date_folder} 的数据目录",
+                suggestion="请先运行爬虫或检查日期是否正确"
+            )
+
+        names = sorted(name for name in os.listdir(txt_dir) if name.endswith(".txt"))
+
+        if not names:
             raise DataNotFoundError(
                 f"{date_folder} 没有数据文件",
                 suggestion="请等待爬虫任务完成"
             )
 
-        for txt_file in txt_files:
-            try:
-                titles_by_id, file_id_to_name = self.parse_txt_file(txt_file)
+        newest = names[-1]
+        source_of = None
+        pointer = read_latest_pointer(txt_dir)
+        if pointer and pointer.get("snapshot") == newest:
+            existing = set(names)
+            source_of = {
+                platform_id: name
+                for platform_id, name in pointer["platforms"].items()
+                if name in existing
+            }
+
+        # 需要读取的快照（从新到旧）
+        if source_of:
+            snapshot_names = sorted(set(source_of.values()), reverse=True)
+        else:
+            snapshot_names = [newest]
 
-                # 更新id_to_name
-                id_to_name.update(file_id_to_name)
+        snapshots = self._read_snapshots(date_folder, txt_dir, snapshot_names)
 
-                # 合并标题数据
-                for platform_id, titles in titles_by_id.items():
-                    # 如果指定了平台过滤
-                    if platform_ids and platform_id not in platform_ids:
-                        continue
+        all_titles = {}
+        id_to_name = {}
+        all_timestamps = {}
 
-                    if platform_id not in all_titles:
-                        all_titles[platform_id] = {}
+        for name in snapshot_names:
+            titles_by_id, file_id_to_name, timestamp = snapshots[name]
+            used = False
 
-                    for title, info in titles.items():
-                        if title in all_titles[platform_id]:
-                            # 合并排名
-                            all_titles[platform_id][title]["ranks"].extend(info["ranks"])
-                        else:
-                            all_titles[platform_id][title] = info.copy()
+            for platform_id, titles in titles_by_id.items():
+                if source_of and source_of.get(platform_id) != name:
+                    continue
+                if platform_ids and platform_id not in platform_ids:
+                    continue
+                all_titles[platform_id] = titles
+                id_to_name[platform_id] = file_id_to_name.get(platform_id, platform_id)
+                used = True
 
-                # 记录文件时间戳
-                all_timestamps[txt_file.name] = txt_file.stat().st_mtime
-
-            except Exception as e:
-                # 忽略单个文件的解析错误，继续处理其他文件
-                print(f"Warning: 解析文件 {txt_file} 失败: {e}")
-                continue
+            if used:
+                all_timestamps[name] = timestamp
 
         if not all_titles:
             raise DataNotFoundError(
@@ -253,46 +772,78 @@ class ParserService:
                 suggestion="请检查数据文件格式或重新运行爬虫"
             )
 
-        # 缓存结果
-        result = (all_titles, id_to_name, all_timestamps)
-        self.cache.set(cache_key, result)
+        return all_titles, id_to_name, all_timestamps
+
+    def _read_snapshots(
+        self,
+        date_folder: str,
+        txt_dir: Path,
+        snapshot_names: List[str]
+    ) -> Dict[str, Tuple[Dict, Dict, float]]:
+        """
+        读取若干快照文件（按文件状态缓存，每个日期只保留最近用到的快照）
 
-        return result
+        Args:
+            date_folder: 日期文件夹名称
+            txt_dir: txt文件目录
+            snapshot_names: 快照文件名列表
 
-    def parse_yaml_config(self, config_path: str = None) -> dict:
+        Returns:
+            {快照文件名: (titles_by_id, id_to_name, mtime)}
+        """
+        cache_key = f"latest_snapshot:{date_folder}"
+        cached = self.cache.get(cache_key, ttl=None) or {}
+
+        snapshots = {}
+        states = {}
+        changed = False
+
+        for name in snapshot_names:
+            txt_file = txt_dir / name
+            stat = txt_file.stat()
+            state = (stat.st_mtime_ns, stat.st_size)
+            states[name] = state
+
+            entry = cached.get(name)
+            if entry is not None and entry[0] == state:
+                snapshots[name] = entry[1]
+                continue
+
+            titles_by_id, file_id_to_name = self.parse_txt_file(txt_file)
+            snapshots[name] = (titles_by_id, file_id_to_name, stat.st_mtime)
+            changed = True
+
+        if changed or set(cached) != set(snapshot_names):
+            self.cache.set(cache_key, {
+                name: (states[name], snapshots[name]) for name in snapshot_names
+            }, _files_size(states))
+
+        return snapshots
+
+    def parse_yaml_config(self, config_path: str = None) -> Mapping:
         """
         解析YAML配置文件
 
         Args:
-            config_path: 配置文件路径，默认为 config/config.yaml
+            config_path: 配置文件路径，默认为 config/config.yaml（由配置服务缓存，文件变化时自动重新加载）
 
         Returns:
-            配置字典
+            配置（默认配置文件为只读映射，见 config_service.ConfigSnapshot）
 
         Raises:
             FileParseError: 配置文件解析错误
         """
         if config_path is None:
-            config_path = self.project_root / "config" / "config.yaml"
-        else:
-            config_path = Path(config_path)
+            return get_config_service(self.project_root).snapshot().require_config()
 
-        if not config_path.exists():
-            raise FileParseError(str(config_path), "配置文件不存在")
+        return load_yaml_config(Path(config_path))
 
-        try:
-            with open(config_path, "r", encoding="utf-8") as f:
-                config_data = yaml.safe_load(f)
-            return config_data
-        except Exception as e:
-            raise FileParseError(str(config_path), str(e))
-
-    def parse_frequency_words(self, words_file: str = None) -> List[Dict]:
+    def parse_frequency_words(self, words_file: str = None) -> Sequence[Mapping]:
         """
         解析关键词配置文件
 
         Args:
-            words_file: 关键词文件路径，默认为 config/frequency_words.txt
+            words_file: 关键词文件路径，默认为 config/frequency_words.txt（由配置服务缓存）
 
         Returns:
             词组列表
@@ -301,55 +852,6 @@ class ParserService:
             FileParseError: 文件解析错误
         """
         if words_file is None:
-            words_file = self.project_root / "config" / "frequency_words.txt"
-        else:
-            words_file = Path(words_file)
-
-        if not words_file.exists():
-            return []
-
-        word_groups = []
-
-        try:
-            with open(words_file, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line or line.startswith("#"):
-                        continue
-
-                    # 使用 | 分隔符
-                    parts = [p.strip() for p in line.split("|")]
-                    if not parts:
-                        continue
-
-                    group = {
-                        "required": [],
-                        "normal": [],
-                        "filter_words": []
-                    }
-
-                    for part in parts:
-                        if not part:
-                            continue
-
-                        words = [w.strip() for w in part.split(",")]
-                        for word in words:
-                            if not word:
-                                continue
-                            if word.endswith("+"):
-                                # 必须词
-                                group["required"].append(word[:-1])
-                            elif word.endswith("!"):
-                                # 过滤词
-                                group["filter_words"].append(word[:-1])
-                            else:
-                                # 普通词
-                                group["normal"].append(word)
-
-                    if group["required"] or group["normal"]:
-                        word_groups.append(group)
-
-        except Exception as e:
-            raise FileParseError(str(words_file), str(e))
+            return get_config_service(self.project_root).snapshot().require_word_groups()
 
-        return word_groups
+        return load_frequency_words(Path(words_file))
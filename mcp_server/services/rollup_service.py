@@ -0,0 +1,389 @@
+"""
+日汇总服务
+
+为多日分析（周报、平台对比、爆火检测、趋势预测）预先计算每天的聚合数据：
+关键词计数（整体和按平台）、各平台新闻数、去重标题数、按权重排序的精选标题。
+
+历史日期的汇总写入 output/.rollups/YYYY-MM-DD.json，并记录当天txt目录的
+文件状态指纹；指纹不一致时重新计算。多日分析只需按日期顺序合并这些小文件，
+不必重新解析和分词每一条历史标题。
+
+当天的数据仍在变化，其汇总只保存在内存中，随新快照的写入自动重建。
+
+可在每天零点后运行以下命令生成前一天（及缺失日期）的汇总：
+
+    python -m mcp_server.services.rollup_service
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .cache_service import get_cache
+from .metrics_service import get_metrics
+from .parser_service import ParserService
+from ..utils.errors import DataNotFoundError
+from ..utils.keywords import extract_title_keywords
+
+
+# 汇总文件格式版本（字段变化时递增，旧版本文件会被重新计算）
+ROLLUP_VERSION = 1
+
+# 汇总目录（位于 output/ 下）
+ROLLUP_DIR_NAME = ".rollups"
+
+# 每天保存的精选标题数
+TOP_TITLES_LIMIT = 20
+
+
+def files_fingerprint(files: Dict[str, Tuple[int, int]]) -> str:
+    """
+    计算txt目录状态指纹
+
+    Args:
+        files: {filename: (mtime_ns, size)}
+
+    Returns:
+        指纹字符串
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for name, (mtime_ns, size) in sorted(files.items()):
+        digest.update(f"{name}:{mtime_ns}:{size}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def rank_titles_by_weight(
+    entries: Sequence[Tuple[str, str]],
+    keyword_counts: Counter,
+    limit: int
+) -> List[Dict]:
+    """
+    按关键词权重选取精选标题（确定性排序）
+
+    权重为标题中包含的 TOP 10 关键词的出现次数之和，
+    权重相同则按标题字母顺序排列。
+
+    Args:
+        entries: [(标题, 平台名称)]，同一标题出现在多个平台时各算一条
+        keyword_counts: 关键词计数
+        limit: 返回条数
+
+    Returns:
+        [{"title", "platform", "weight"}]
+    """
+    top_keywords = [
+        (keyword.lower(), count)
+        for keyword, count in keyword_counts.most_common(10)
+    ]
+
+    scored = []
+    for title, platform in entries:
+        title_lower = title.lower()
+        weight = sum(count for keyword, count in top_keywords if keyword in title_lower)
+        scored.append((title, platform, weight))
+
+    # 排序是稳定的，权重和标题都相同的条目保持原有顺序
+    scored.sort(key=lambda item: (-item[2], item[0]))
+
+    return [
+        {"title": title, "platform": platform, "weight": weight}
+        for title, platform, weight in scored[:limit]
+    ]
+
+
+def build_rollup(
+    date_str: str,
+    all_titles: Dict,
+    id_to_name: Dict,
+    fingerprint: str
+) -> Dict:
+    """
+    根据一天的标题数据计算日汇总
+
+    所有计数字典均保持标题的首次出现顺序，合并多日汇总时
+    与逐条统计原始标题得到的 Counter 顺序一致（影响并列时的排序）。
+
+    Args:
+        date_str: 日期字符串（YYYY-MM-DD）
+        all_titles: {platform_id: {title: info}}
+        id_to_name: 平台ID到名称的映射
+        fingerprint: txt目录状态指纹
+
+    Returns:
+        日汇总字典
+    """
+    keyword_counts = Counter()
+    platform_keyword_counts = {}
+    platform_counts = {}
+    platform_names = {}
+    titles = {}
+    entries = []
+    unique_titles = set()
+
+    for platform_id, platform_titles in all_titles.items():
+        platform_name = id_to_name.get(platform_id, platform_id)
+        names = list(platform_titles.keys())
+
+        platform_keywords = Counter()
+        for title in names:
+            keywords = extract_title_keywords(title)
+            keyword_counts.update(keywords)
+            platform_keywords.update(keywords)
+            entries.append((title, platform_name))
+
+        platform_names[platform_id] = platform_name
+        platform_counts[platform_id] = len(names)
+        platform_keyword_counts[platform_id] = dict(platform_keywords)
+        titles[platform_id] = names
+        unique_titles.update(names)
+
+    return {
+        "version": ROLLUP_VERSION,
+        "date": date_str,
+        "fingerprint": fingerprint,
+        "total_news": len(entries),
+        "unique_titles": len(unique_titles),
+        "platform_names": platform_names,
+        "platform_counts": platform_counts,
+        "keyword_counts": dict(keyword_counts),
+        "platform_keyword_counts": platform_keyword_counts,
+        "top_titles": rank_titles_by_weight(entries, keyword_counts, TOP_TITLES_LIMIT),
+        "titles": titles,
+    }
+
+
+class RollupService:
+    """日汇总服务类"""
+
+    def __init__(self, parser: ParserService):
+        """
+        初始化日汇总服务
+
+        Args:
+            parser: 文件解析服务
+        """
+        self.parser = parser
+        self.cache = get_cache()
+
+    @property
+    def rollup_dir(self) -> Path:
+        """汇总文件目录"""
+        return self.parser.project_root / "output" / ROLLUP_DIR_NAME
+
+    def _rollup_path(self, date_str: str) -> Path:
+        return self.rollup_dir / f"{date_str}.json"
+
+    def _read_rollup_file(self, date_str: str) -> Optional[Dict]:
+        """
+        读取已保存的汇总文件
+
+        Args:
+            date_str: 日期字符串（YYYY-MM-DD）
+
+        Returns:
+            汇总字典，不存在、格式错误或版本不符时返回None
+        """
+        try:
+            with open(self._rollup_path(date_str), "r", encoding="utf-8") as f:
+                rollup = json.load(f)
+                get_metrics().record_read("rollup", os.fstat(f.fileno()).st_size)
+        except (OSError, ValueError):
+            return None
+
+        if not isinstance(rollup, dict) or rollup.get("version") != ROLLUP_VERSION:
+            return None
+        return rollup
+
+    def _write_rollup_file(self, rollup: Dict) -> None:
+        """
+        保存汇总文件（先写临时文件再替换）
+
+        Args:
+            rollup: 汇总字典
+        """
+        path = self._rollup_path(rollup["date"])
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f".{path.name}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(rollup, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            # 写入失败不影响本次分析，下次访问时重新计算
+            print(f"Warning: 保存日汇总 {path} 失败: {e}")
+
+    def get_day_rollup(self, date: datetime = None, force: bool = False) -> Dict:
+        """
+        获取指定日期的日汇总
+
+        - 历史日期：优先使用内存缓存，其次使用指纹一致的汇总文件，否则重新计算并保存
+        - 今天：只在内存中缓存，txt目录有新快照时重新计算
+
+        Args:
+            date: 日期对象，默认为今天
+            force: 是否忽略已有汇总强制重新计算
+
+        Returns:
+            日汇总字典
+
+        Raises:
+            DataNotFoundError: 数据不存在
+        """
+        if date is None:
+            date = datetime.now()
+        date_str = date.strftime("%Y-%m-%d")
+        cache_key = f"rollup:{date_str}"
+        is_today = date.date() == datetime.now().date()
+
+        cached = None if force else self.cache.get(cache_key, ttl=None)
+
+        if not is_today:
+            # 历史日期的汇总在进程内确认一次后不再检查目录
+            if cached is not None:
+                return cached
+
+            if not force:
+                stored = self._read_rollup_file(date_str)
+                if stored is not None:
+                    fingerprint = files_fingerprint(self.parser.scan_date_files(date))
+                    if stored["fingerprint"] == fingerprint:
+                        self.cache.set(cache_key, stored)
+                        return stored
+
+        all_titles, id_to_name, files = self.parser.read_day_with_files(date)
+        fingerprint = files_fingerprint(files)
+
+        if cached is not None and cached["fingerprint"] == fingerprint:
+            return cached
+
+        rollup = build_rollup(date_str, all_titles, id_to_name, fingerprint)
+        if not is_today:
+            self._write_rollup_file(rollup)
+        self.cache.set(cache_key, rollup)
+
+        return rollup
+
+    def get_rollups(self, start_date: datetime, end_date: datetime) -> List[Dict]:
+        """
+        获取日期范围内的日汇总（按日期升序，跳过没有数据的日期）
+
+        Args:
+            start_date: 开始日期
+            end_date: 结束日期
+
+        Returns:
+            日汇总列表
+        """
+        rollups = []
+        current_date = start_date
+        while current_date <= end_date:
+            try:
+                rollups.append(self.get_day_rollup(current_date))
+            except DataNotFoundError:
+                pass
+            current_date += timedelta(days=1)
+        return rollups
+
+    def list_data_dates(self) -> List[datetime]:
+        """
+        列出 output 目录中所有有数据目录的日期
+
+        Returns:
+            日期列表（升序）
+        """
+        output_dir = self.parser.project_root / "output"
+        if not output_dir.exists():
+            return []
+
+        dates = []
+        for date_folder in output_dir.iterdir():
+            date_match = re.match(r'(\d{4})年(\d{2})月(\d{2})日$', date_folder.name)
+            if date_match and date_folder.is_dir():
+                try:
+                    dates.append(datetime(
+                        int(date_match.group(1)),
+                        int(date_match.group(2)),
+                        int(date_match.group(3))
+                    ))
+                except ValueError:
+                    continue
+        return sorted(dates)
+
+    def build_rollups(
+        self,
+        dates: Optional[List[datetime]] = None,
+        force: bool = False
+    ) -> Dict[str, str]:
+        """
+        生成（或校验）多个历史日期的日汇总文件
+
+        Args:
+            dates: 日期列表，None表示今天之前所有有数据的日期
+            force: 是否强制重新计算
+
+        Returns:
+            {日期: 状态}，状态为 ok / missing
+        """
+        today = datetime.now().date()
+        if dates is None:
+            dates = [date for date in self.list_data_dates() if date.date() < today]
+
+        results = {}
+        for date in dates:
+            date_str = date.strftime("%Y-%m-%d")
+            try:
+                self.get_day_rollup(date, force=force)
+                results[date_str] = "ok"
+            except DataNotFoundError:
+                results[date_str] = "missing"
+        return results
+
+
+def main() -> None:
+    """命令行入口：生成历史日期的日汇总"""
+    parser = argparse.ArgumentParser(description="TrendRadar 日汇总生成")
+    parser.add_argument(
+        "--project-root",
+        default=None,
+        help="项目根目录（默认为包所在目录的上一级）"
+    )
+    parser.add_argument(
+        "--date",
+        action="append",
+        default=None,
+        help="指定日期（YYYY-MM-DD），可重复；默认处理今天之前所有缺失或过期的日期"
+    )
+    parser.add_argument(
+        "--yesterday",
+        action="store_true",
+        help="只处理昨天（适合每天零点后的定时任务）"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="忽略已有汇总文件，强制重新计算"
+    )
+    args = parser.parse_args()
+
+    dates = None
+    if args.date:
+        dates = [datetime.strptime(date_str, "%Y-%m-%d") for date_str in args.date]
+    elif args.yesterday:
+        dates = [datetime.now() - timedelta(days=1)]
+
+    service = RollupService(ParserService(args.project_root))
+    results = service.build_rollups(dates, force=args.force)
+
+    for date_str, status in results.items():
+        print(f"{date_str}: {status}")
+    print(f"共处理 {len(results)} 天，汇总目录: {service.rollup_dir}")
+
+
+if __name__ == "__main__":
+    main()
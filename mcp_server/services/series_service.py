@@ -0,0 +1,276 @@
+"""
+时间序列服务
+
+按快照（约每30分钟一次爬取）记录每天出现过的标题，支持按小时或按快照
+统计话题热度，而不是只能按天聚合。
+
+每天的序列由两部分组成：
+- entries: 当天出现过的 (平台ID, 标题) 列表，每条只保存一次
+- snapshots: 每个快照包含的条目下标 {快照时间: [下标, ...]}
+
+快照数据在解析服务合并新快照文件时增量记录，新快照写入后只需解析新文件。
+查询话题时只需在当天去重后的标题中匹配一次，再按下标累计各时间桶的数量。
+
+历史日期的序列写入 output/.series/YYYY-MM-DD.json（带txt目录指纹），
+服务重启后无需重新解析历史快照。
+"""
+
+import json
+import os
+import re
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .cache_service import get_cache
+from .metrics_service import get_metrics
+from .parser_service import ParserService
+from .rollup_service import files_fingerprint
+from ..utils.errors import DataNotFoundError
+
+
+# 序列文件格式版本（字段变化时递增，旧版本文件会被重新计算）
+SERIES_VERSION = 1
+
+# 序列目录（位于 output/ 下）
+SERIES_DIR_NAME = ".series"
+
+# 支持的时间粒度
+SERIES_GRANULARITIES = ("hour", "snapshot")
+
+
+def snapshot_time(file_name: str) -> str:
+    """
+    从快照文件名解析时间
+
+    Args:
+        file_name: 快照文件名，如 "08时30分.txt"
+
+    Returns:
+        时间字符串，如 "08:30"；无法解析时返回去掉扩展名的文件名
+    """
+    match = re.match(r'(\d{2})时(\d{2})分', file_name)
+    if match:
+        return f"{match.group(1)}:{match.group(2)}"
+    return file_name.rsplit(".", 1)[0]
+
+
+def build_series(date_str: str, snapshots: Dict, fingerprint: str) -> Dict:
+    """
+    根据每个快照的标题构建当天的时间序列
+
+    Args:
+        date_str: 日期字符串（YYYY-MM-DD）
+        snapshots: {filename: {platform_id: (title, ...)}}，按文件名排序
+        fingerprint: txt目录状态指纹
+
+    Returns:
+        时间序列字典
+    """
+    entries = []
+    entry_index = {}
+    snapshot_entries = {}
+
+    for file_name, titles_by_id in snapshots.items():
+        ids = []
+        for platform_id, titles in titles_by_id.items():
+            for title in titles:
+                key = (platform_id, title)
+                index = entry_index.get(key)
+                if index is None:
+                    index = len(entries)
+                    entry_index[key] = index
+                    entries.append(key)
+                ids.append(index)
+        snapshot_entries[snapshot_time(file_name)] = ids
+
+    return {
+        "version": SERIES_VERSION,
+        "date": date_str,
+        "fingerprint": fingerprint,
+        "entries": entries,
+        "snapshots": snapshot_entries,
+    }
+
+
+class SeriesService:
+    """时间序列服务类"""
+
+    def __init__(self, parser: ParserService):
+        """
+        初始化时间序列服务
+
+        Args:
+            parser: 文件解析服务
+        """
+        self.parser = parser
+        self.cache = get_cache()
+
+    @property
+    def series_dir(self) -> Path:
+        """序列文件目录"""
+        return self.parser.project_root / "output" / SERIES_DIR_NAME
+
+    def _series_path(self, date_str: str) -> Path:
+        return self.series_dir / f"{date_str}.json"
+
+    def _read_series_file(self, date_str: str) -> Optional[Dict]:
+        """
+        读取已保存的序列文件
+
+        Args:
+            date_str: 日期字符串（YYYY-MM-DD）
+
+        Returns:
+            序列字典，不存在、格式错误或版本不符时返回None
+        """
+        try:
+            with open(self._series_path(date_str), "r", encoding="utf-8") as f:
+                series = json.load(f)
+                get_metrics().record_read("series", os.fstat(f.fileno()).st_size)
+        except (OSError, ValueError):
+            return None
+
+        if not isinstance(series, dict) or series.get("version") != SERIES_VERSION:
+            return None
+
+        # JSON 中的条目为列表，转回元组
+        series["entries"] = [tuple(entry) for entry in series["entries"]]
+        return series
+
+    def _write_series_file(self, series: Dict) -> None:
+        """
+        保存序列文件（先写临时文件再替换）
+
+        Args:
+            series: 序列字典
+        """
+        path = self._series_path(series["date"])
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f".{path.name}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(series, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            # 写入失败不影响本次分析，下次访问时重新计算
+            print(f"Warning: 保存时间序列 {path} 失败: {e}")
+
+    def get_day_series(self, date: datetime = None) -> Dict:
+        """
+        获取指定日期的时间序列
+
+        - 历史日期：优先使用内存缓存，其次使用指纹一致的序列文件，否则重新构建并保存
+        - 今天：只在内存中缓存，txt目录有新快照时重新构建
+
+        Args:
+            date: 日期对象，默认为今天
+
+        Returns:
+            时间序列字典
+
+        Raises:
+            DataNotFoundError: 数据不存在
+        """
+        if date is None:
+            date = datetime.now()
+        date_str = date.strftime("%Y-%m-%d")
+        cache_key = f"series:{date_str}"
+        is_today = date.date() == datetime.now().date()
+
+        cached = self.cache.get(cache_key, ttl=None)
+
+        if not is_today:
+            # 历史日期的序列在进程内确认一次后不再检查目录
+            if cached is not None:
+                return cached
+
+            stored = self._read_series_file(date_str)
+            if stored is not None:
+                fingerprint = files_fingerprint(self.parser.scan_date_files(date))
+                if stored["fingerprint"] == fingerprint:
+                    self.cache.set(cache_key, stored)
+                    return stored
+
+        snapshots, files = self.parser.read_day_snapshots(date)
+        fingerprint = files_fingerprint(files)
+
+        if cached is not None and cached["fingerprint"] == fingerprint:
+            return cached
+
+        series = build_series(date_str, snapshots, fingerprint)
+        if not series["snapshots"]:
+            raise DataNotFoundError(
+                f"{date_str} 没有有效的快照数据",
+                suggestion="请检查数据文件格式或重新运行爬虫"
+            )
+
+        if not is_today:
+            self._write_series_file(series)
+        self.cache.set(cache_key, series)
+
+        return series
+
+    def get_topic_series(
+        self,
+        topic: str,
+        start_date: datetime,
+        end_date: datetime,
+        granularity: str = "hour",
+        sample_size: int = 3
+    ) -> List[Dict]:
+        """
+        统计话题在各时间桶中的出现次数
+
+        每个时间桶统计包含话题的 (平台, 标题) 条目数，同一条目在一个时间桶内
+        多次出现只计一次（与按天统计的口径一致）。没有快照的时间段不生成时间桶。
+
+        Args:
+            topic: 话题关键词（不区分大小写的子串匹配）
+            start_date: 开始日期
+            end_date: 结束日期
+            granularity: 时间粒度（hour/snapshot）
+            sample_size: 每个时间桶保留的样本标题数
+
+        Returns:
+            [{"date": "YYYY-MM-DD HH:MM", "count": 次数, "sample_titles": [...]}]，按时间升序
+        """
+        topic_lower = topic.lower()
+        buckets = []
+
+        current_date = start_date
+        while current_date <= end_date:
+            try:
+                series = self.get_day_series(current_date)
+            except DataNotFoundError:
+                current_date += timedelta(days=1)
+                continue
+
+            entries = series["entries"]
+            matched = {
+                index for index, (_, title) in enumerate(entries)
+                if topic_lower in title.lower()
+            }
+
+            # 按时间桶合并快照中的条目（保持首次出现顺序）
+            bucket_entries: Dict[str, Dict[int, None]] = {}
+            for time_str, ids in series["snapshots"].items():
+                if granularity == "hour" and ":" in time_str:
+                    label = time_str.split(":", 1)[0] + ":00"
+                else:
+                    label = time_str
+                bucket = bucket_entries.setdefault(label, {})
+                for index in ids:
+                    if index in matched:
+                        bucket[index] = None
+
+            for label, hits in bucket_entries.items():
+                buckets.append({
+                    "date": f"{series['date']} {label}",
+                    "count": len(hits),
+                    "sample_titles": [entries[index][1] for index in list(hits)[:sample_size]]
+                })
+
+            current_date += timedelta(days=1)
+
+        return buckets
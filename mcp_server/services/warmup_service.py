@@ -0,0 +1,172 @@
+"""
+预热服务
+
+MCP 服务器启动时只创建工具实例，首次调用多日分析工具（如最近一周的话题趋势）
+需要现场解析整段历史数据。预热服务在后台线程中预先加载最近 N 天的数据，
+依次填充日聚合、日汇总、时间序列和聚合数据库，后续查询直接命中缓存。
+
+预热期间工具调用照常按需加载，不会等待预热完成；预热进度和就绪状态
+可通过 get_system_status 查看。
+"""
+
+import time
+from datetime import datetime, timedelta
+from threading import Lock, Thread
+from typing import Dict, List, Optional
+
+from .data_service import DataService
+from ..utils.errors import DataNotFoundError
+
+
+class WarmupService:
+    """预热服务类"""
+
+    def __init__(self, data_service: Optional[DataService] = None, days: int = 0):
+        """
+        初始化预热服务
+
+        Args:
+            data_service: 数据服务（与工具共享同一全局缓存）
+            days: 预热天数，0 表示不预热
+        """
+        self.data_service = data_service
+        self.days = max(0, days)
+        self.state = "pending" if self.days and data_service else "disabled"
+        self.loaded_dates: List[str] = []
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.error: Optional[str] = None
+        self._thread: Optional[Thread] = None
+        self._lock = Lock()
+
+    @property
+    def ready(self) -> bool:
+        """预热是否已结束（未启用预热时视为就绪）"""
+        return self.state in ("disabled", "ready", "failed")
+
+    def start(self) -> None:
+        """在后台线程中开始预热（重复调用无效）"""
+        with self._lock:
+            if self.state != "pending":
+                return
+            self.state = "running"
+            self.started_at = time.time()
+
+        self._thread = Thread(target=self._run, name="mcp-warmup", daemon=True)
+        self._thread.start()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        等待预热结束
+
+        Args:
+            timeout: 最长等待时间（秒），None 表示一直等待
+
+        Returns:
+            预热是否已结束
+        """
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.ready
+
+    def _run(self) -> None:
+        """预热线程入口"""
+        try:
+            self._warm()
+            state, error = "ready", None
+        except Exception as e:
+            # 预热失败不影响服务，工具调用仍会按需加载
+            print(f"Warning: 数据预热失败: {e}")
+            state, error = "failed", str(e)
+
+        with self._lock:
+            self.state = state
+            self.error = error
+            self.finished_at = time.time()
+
+    def _warm(self) -> None:
+        """按日期顺序加载最近 N 天的数据"""
+        _, latest = self.data_service.get_available_date_range()
+        if latest is None:
+            return
+
+        # 以最新有数据的日期为终点（正常运行时即今天）
+        end_date = latest
+        start_date = end_date - timedelta(days=self.days - 1)
+
+        # 先批量解析全部快照文件，再逐天构建汇总和时间序列
+        self.data_service.parser.preload_days(start_date, end_date)
+
+        current_date = start_date
+        while current_date <= end_date:
+            try:
+                self.data_service.rollups.get_day_rollup(current_date)
+                self.data_service.series.get_day_series(current_date)
+            except DataNotFoundError:
+                current_date += timedelta(days=1)
+                continue
+
+            with self._lock:
+                self.loaded_dates.append(current_date.strftime("%Y-%m-%d"))
+            current_date += timedelta(days=1)
+
+        self.data_service.cube.ensure_range(start_date, end_date)
+
+    def get_status(self) -> Dict:
+        """
+        获取预热状态
+
+        Returns:
+            预热状态字典
+        """
+        with self._lock:
+            if self.started_at is None:
+                duration = None
+            else:
+                duration = round((self.finished_at or time.time()) - self.started_at, 2)
+
+            return {
+                "state": self.state,
+                "ready": self.ready,
+                "days": self.days,
+                "loaded_dates": list(self.loaded_dates),
+                "started_at": (
+                    datetime.fromtimestamp(self.started_at).strftime("%Y-%m-%d %H:%M:%S")
+                    if self.started_at else None
+                ),
+                "duration_seconds": duration,
+                "error": self.error,
+            }
+
+
+# 全局预热服务实例
+_global_warmup = None
+
+
+def configure_warmup(data_service: DataService, days: int) -> WarmupService:
+    """
+    配置全局预热服务（需调用 start() 开始预热）
+
+    Args:
+        data_service: 数据服务
+        days: 预热天数，0 表示不预热
+
+    Returns:
+        全局预热服务实例
+    """
+    global _global_warmup
+    _global_warmup = WarmupService(data_service, days)
+    return _global_warmup
+
+
+def get_warmup() -> WarmupService:
+    """
+    获取全局预热服务实例
+
+    Returns:
+        全局预热服务实例（默认不预热）
+    """
+    global _global_warmup
+    if _global_warmup is None:
+        _global_warmup = WarmupService()
+    return _global_warmup
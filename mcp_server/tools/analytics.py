@@ -4,19 +4,22 @@
 提供热度趋势分析、平台对比、关键词共现、情感分析等高级分析功能。
 """
 
-import re
 from collections import Counter, defaultdict
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
-from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Tuple
 
+from ..services.compute_service import cooccurrence_kernel, get_compute, ratio_kernel
 from ..services.data_service import DataService
+from ..services.rollup_service import rank_titles_by_weight
+from ..utils.keywords import extract_title_keywords
+from ..utils.similarity import sequence_ratio
 from ..utils.validators import (
     validate_platforms,
     validate_limit,
     validate_keyword,
     validate_top_n,
-    validate_date_range
+    validate_date_range,
+    validate_granularity
 )
 from ..utils.errors import MCPError, InvalidParameterError, DataNotFoundError
 
@@ -31,13 +34,13 @@ def calculate_news_weight(news_data: Dict, rank_threshold: int = 5) -> float:
     - 热度权重 (10%)：高排名出现的比例
 
     Args:
-        news_data: 新闻数据字典，包含 ranks 和 count 字段
+        news_data: 新闻数据字典，包含 ranks（RankStats）和 count 字段
         rank_threshold: 高排名阈值，默认5
 
     Returns:
         权重分数（0-100之间的浮点数）
     """
-    ranks = news_data.get("ranks", [])
+    ranks = news_data.get("ranks")
     if not ranks:
         return 0.0
 
@@ -49,19 +52,13 @@ def calculate_news_weight(news_data: Dict, rank_threshold: int = 5) -> float:
     HOTNESS_WEIGHT = 0.1
 
     # 1. 排名权重：Σ(11 - min(rank, 10)) / 出现次数
-    rank_scores = []
-    for rank in ranks:
-        score = 11 - min(rank, 10)
-        rank_scores.append(score)
-
-    rank_weight = sum(rank_scores) / len(ranks) if ranks else 0
+    rank_weight = ranks.score_sum() / len(ranks)
 
     # 2. 频次权重：min(出现次数, 10) × 10
     frequency_weight = min(count, 10) * 10
 
     # 3. 热度加成：高排名次数 / 总出现次数 × 100
-    high_rank_count = sum(1 for rank in ranks if rank <= rank_threshold)
-    hotness_ratio = high_rank_count / len(ranks) if ranks else 0
+    hotness_ratio = ranks.within(rank_threshold) / len(ranks)
     hotness_weight = hotness_ratio * 100
 
     # 综合权重
@@ -177,7 +174,7 @@ class AnalyticsTools:
             date_range: 日期范围（trend和lifecycle模式），可选
                        - **格式**: {"start": "YYYY-MM-DD", "end": "YYYY-MM-DD"}
                        - **默认**: 不指定时默认分析最近7天
-            granularity: 时间粒度（trend模式），默认"day"（hour/day）
+            granularity: 时间粒度（trend和lifecycle模式），默认"day"（day/hour/snapshot）
             threshold: 热度突增倍数阈值（viral模式），默认3.0
             time_window: 检测时间窗口小时数（viral模式），默认24
             lookahead_hours: 预测未来小时数（predict模式），默认6
@@ -212,7 +209,8 @@ class AnalyticsTools:
             elif analysis_type == "lifecycle":
                 return self.analyze_topic_lifecycle(
                     topic=topic,
-                    date_range=date_range
+                    date_range=date_range,
+                    granularity=granularity
                 )
             elif analysis_type == "viral":
                 # viral模式不需要topic参数，使用通用检测
@@ -255,7 +253,10 @@ class AnalyticsTools:
             date_range: 日期范围（可选）
                        - **格式**: {"start": "YYYY-MM-DD", "end": "YYYY-MM-DD"}
                        - **默认**: 不指定时默认分析最近7天
-            granularity: 时间粒度，仅支持 day（天）
+            granularity: 时间粒度
+                       - day: 按天统计（默认）
+                       - hour: 按小时统计（基于爬取快照）
+                       - snapshot: 按每次爬取的快照统计
 
         Returns:
             趋势分析结果字典
@@ -288,13 +289,8 @@ class AnalyticsTools:
             # 验证参数
             topic = validate_keyword(topic)
 
-            # 验证粒度参数（只支持day）
-            if granularity != "day":
-                from ..utils.errors import InvalidParameterError
-                raise InvalidParameterError(
-                    f"不支持的粒度参数: {granularity}",
-                    suggestion="当前仅支持 'day' 粒度，因为底层数据按天聚合"
-                )
+            # 验证粒度参数
+            granularity = validate_granularity(granularity)
 
             # 处理日期范围（不指定时默认最近7天）
             if date_range:
@@ -307,40 +303,47 @@ class AnalyticsTools:
                 start_date = end_date - timedelta(days=6)
 
             # 收集趋势数据
-            trend_data = []
-            current_date = start_date
-
-            while current_date <= end_date:
-                try:
-                    all_titles, _, _ = self.data_service.parser.read_all_titles_for_date(
-                        date=current_date
-                    )
+            if granularity != "day":
+                # 按小时/快照统计（基于时间序列，不重新扫描原始快照）
+                trend_data = self.data_service.series.get_topic_series(
+                    topic, start_date, end_date, granularity
+                )
+            else:
+                trend_data = []
+                self.data_service.parser.preload_days(start_date, end_date)
+                current_date = start_date
+
+                while current_date <= end_date:
+                    try:
+                        all_titles, _, _ = self.data_service.parser.read_all_titles_for_date(
+                            date=current_date
+                        )
 
-                    # 统计该时间点的话题出现次数
-                    count = 0
-                    matched_titles = []
+                        # 统计该时间点的话题出现次数
+                        count = 0
+                        matched_titles = []
 
-                    for _, titles in all_titles.items():
-                        for title in titles.keys():
-                            if topic.lower() in title.lower():
-                                count += 1
-                                matched_titles.append(title)
+                        for _, titles in all_titles.items():
+                            for title in titles.keys():
+                                if topic.lower() in title.lower():
+                                    count += 1
+                                    matched_titles.append(title)
 
-                    trend_data.append({
-                        "date": current_date.strftime("%Y-%m-%d"),
-                        "count": count,
-                        "sample_titles": matched_titles[:3]  # 只保留前3个样本
-                    })
+                        trend_data.append({
+                            "date": current_date.strftime("%Y-%m-%d"),
+                            "count": count,
+                            "sample_titles": matched_titles[:3]  # 只保留前3个样本
+                        })
 
-                except DataNotFoundError:
-                    trend_data.append({
-                        "date": current_date.strftime("%Y-%m-%d"),
-                        "count": 0,
-                        "sample_titles": []
-                    })
+                    except DataNotFoundError:
+                        trend_data.append({
+                            "date": current_date.strftime("%Y-%m-%d"),
+                            "count": 0,
+                            "sample_titles": []
+                        })
 
-                # 按天增加时间
-                current_date += timedelta(days=1)
+                    # 按天增加时间
+                    current_date += timedelta(days=1)
 
             # 计算趋势指标
             counts = [item["count"] for item in trend_data]
@@ -440,41 +443,10 @@ class AnalyticsTools:
             else:
                 start_date = end_date = datetime.now()
 
-            # 收集各平台数据
-            platform_stats = defaultdict(lambda: {
-                "total_news": 0,
-                "topic_mentions": 0,
-                "unique_titles": set(),
-                "top_keywords": Counter()
-            })
-
-            # 遍历日期范围
-            current_date = start_date
-            while current_date <= end_date:
-                try:
-                    all_titles, id_to_name, _ = self.data_service.parser.read_all_titles_for_date(
-                        date=current_date
-                    )
-
-                    for platform_id, titles in all_titles.items():
-                        platform_name = id_to_name.get(platform_id, platform_id)
-
-                        for title in titles.keys():
-                            platform_stats[platform_name]["total_news"] += 1
-                            platform_stats[platform_name]["unique_titles"].add(title)
-
-                            # 如果指定了话题，统计包含话题的新闻
-                            if topic and topic.lower() in title.lower():
-                                platform_stats[platform_name]["topic_mentions"] += 1
-
-                            # 提取关键词（简单分词）
-                            keywords = self._extract_keywords(title)
-                            platform_stats[platform_name]["top_keywords"].update(keywords)
-
-                except DataNotFoundError:
-                    pass
-
-                current_date += timedelta(days=1)
+            # 按平台切片聚合（聚合立方按天增量维护，不再逐条遍历标题）
+            platform_stats = self.data_service.cube.platform_coverage(
+                start_date, end_date, topic=topic
+            )
 
             # 转换为可序列化的格式
             result_stats = {}
@@ -486,7 +458,7 @@ class AnalyticsTools:
                 result_stats[platform] = {
                     "total_news": stats["total_news"],
                     "topic_mentions": stats["topic_mentions"],
-                    "unique_titles": len(stats["unique_titles"]),
+                    "unique_titles": stats["unique_titles"],
                     "coverage_rate": round(coverage_rate, 2),
                     "top_keywords": [
                         {"keyword": k, "count": v}
@@ -560,27 +532,29 @@ class AnalyticsTools:
             # 读取今天的数据
             all_titles, _, _ = self.data_service.parser.read_all_titles_for_date()
 
-            # 关键词共现统计
+            # 关键词提取和两两共现统计交给计算服务（可多进程），按分片顺序合并
+            corpus = [
+                title
+                for titles in all_titles.values()
+                for title in titles.keys()
+            ]
+
             cooccurrence = Counter()
             keyword_titles = defaultdict(list)
+            title_keywords = {}
 
-            for platform_id, titles in all_titles.items():
-                for title in titles.keys():
-                    # 提取关键词
-                    keywords = self._extract_keywords(title)
+            index = 0
+            for shard_keywords, shard_pairs in get_compute().map_shards(cooccurrence_kernel, corpus):
+                cooccurrence.update(shard_pairs)
+                for keywords in shard_keywords:
+                    title = corpus[index]
+                    index += 1
+                    title_keywords[title] = keywords
 
                     # 记录每个关键词出现的标题
                     for kw in keywords:
                         keyword_titles[kw].append(title)
 
-                    # 计算两两共现
-                    if len(keywords) >= 2:
-                        for i, kw1 in enumerate(keywords):
-                            for kw2 in keywords[i+1:]:
-                                # 统一排序，避免重复
-                                pair = tuple(sorted([kw1, kw2]))
-                                cooccurrence[pair] += 1
-
             # 过滤低频共现
             filtered_pairs = [
                 (pair, count) for pair, count in cooccurrence.items()
@@ -596,7 +570,7 @@ class AnalyticsTools:
                 # 找出同时包含两个关键词的标题样本
                 titles_with_both = [
                     title for title in keyword_titles[kw1]
-                    if kw2 in self._extract_keywords(title)
+                    if kw2 in title_keywords[title]
                 ]
 
                 result_pairs.append({
@@ -693,6 +667,7 @@ class AnalyticsTools:
 
             # 收集新闻数据（支持多天）
             all_news_items = []
+            self.data_service.parser.preload_days(start_date, end_date)
             current_date = start_date
 
             while current_date <= end_date:
@@ -713,15 +688,15 @@ class AnalyticsTools:
                             news_item = {
                                 "platform": platform_name,
                                 "title": title,
-                                "ranks": info.get("ranks", []),
-                                "count": len(info.get("ranks", [])),
+                                "ranks": info.ranks,
+                                "count": len(info.ranks),
                                 "date": current_date.strftime("%Y-%m-%d")
                             }
 
                             # 条件性添加 URL 字段
                             if include_url:
-                                news_item["url"] = info.get("url", "")
-                                news_item["mobileUrl"] = info.get("mobileUrl", "")
+                                news_item["url"] = info.url
+                                news_item["mobileUrl"] = info.mobile_url
 
                             all_news_items.append(news_item)
 
@@ -748,8 +723,10 @@ class AnalyticsTools:
                 else:
                     # 合并 ranks（如果同一新闻在多天出现）
                     existing = unique_news[key]
-                    existing["ranks"].extend(item["ranks"])
-                    existing["count"] = len(existing["ranks"])
+                    merged_ranks = existing["ranks"].copy()
+                    merged_ranks.merge(item["ranks"])
+                    existing["ranks"] = merged_ranks
+                    existing["count"] = len(merged_ranks)
 
             deduplicated_news = list(unique_news.values())
 
@@ -956,33 +933,34 @@ class AnalyticsTools:
             # 读取数据
             all_titles, id_to_name, _ = self.data_service.parser.read_all_titles_for_date()
 
-            # 计算相似度
-            similar_items = []
-
-            for platform_id, titles in all_titles.items():
-                platform_name = id_to_name.get(platform_id, platform_id)
-
-                for title, info in titles.items():
-                    if title == reference_title:
-                        continue
+            # 按遍历顺序展开语料，相似度计算交给计算服务（可多进程）
+            rows = [
+                (platform_id, title, info)
+                for platform_id, titles in all_titles.items()
+                for title, info in titles.items()
+                if title != reference_title
+            ]
+            scored = get_compute().map_matches(
+                ratio_kernel, [row[1] for row in rows], (reference_title, threshold)
+            )
 
-                    # 计算相似度
-                    similarity = self._calculate_similarity(reference_title, title)
+            similar_items = []
 
-                    if similarity >= threshold:
-                        news_item = {
-                            "title": title,
-                            "platform": platform_id,
-                            "platform_name": platform_name,
-                            "similarity": round(similarity, 3),
-                            "rank": info["ranks"][0] if info["ranks"] else 0
-                        }
+            for index, similarity in scored:
+                platform_id, title, info = rows[index]
+                news_item = {
+                    "title": title,
+                    "platform": platform_id,
+                    "platform_name": id_to_name.get(platform_id, platform_id),
+                    "similarity": round(similarity, 3),
+                    "rank": info.ranks.first if info.ranks else 0
+                }
 
-                        # 条件性添加 URL 字段
-                        if include_url:
-                            news_item["url"] = info.get("url", "")
+                # 条件性添加 URL 字段
+                if include_url:
+                    news_item["url"] = info.url
 
-                        similar_items.append(news_item)
+                similar_items.append(news_item)
 
             # 按相似度排序
             similar_items.sort(key=lambda x: x["similarity"], reverse=True)
@@ -1084,9 +1062,9 @@ class AnalyticsTools:
 
                 for title, info in titles.items():
                     if entity in title:
-                        url = info.get("url", "")
-                        mobile_url = info.get("mobileUrl", "")
-                        ranks = info.get("ranks", [])
+                        url = info.url
+                        mobile_url = info.mobile_url
+                        ranks = info.ranks
                         count = len(ranks)
 
                         related_news.append({
@@ -1097,7 +1075,7 @@ class AnalyticsTools:
                             "mobileUrl": mobile_url,
                             "ranks": ranks,
                             "count": count,
-                            "rank": ranks[0] if ranks else 999
+                            "rank": ranks.first if ranks else 999
                         })
 
                         # 提取实体周边的关键词
@@ -1202,37 +1180,17 @@ class AnalyticsTools:
                     end_date = datetime.now()
                     start_date = end_date - timedelta(days=6)
 
-            # 收集数据
+            # 收集数据（按日期顺序合并日汇总）
             all_keywords = Counter()
             all_platforms_news = defaultdict(int)
-            all_titles_list = []
-
-            current_date = start_date
-            while current_date <= end_date:
-                try:
-                    all_titles, id_to_name, _ = self.data_service.parser.read_all_titles_for_date(
-                        date=current_date
-                    )
-
-                    for platform_id, titles in all_titles.items():
-                        platform_name = id_to_name.get(platform_id, platform_id)
-                        all_platforms_news[platform_name] += len(titles)
-
-                        for title in titles.keys():
-                            all_titles_list.append({
-                                "title": title,
-                                "platform": platform_name,
-                                "date": current_date.strftime("%Y-%m-%d")
-                            })
-
-                            # 提取关键词
-                            keywords = self._extract_keywords(title)
-                            all_keywords.update(keywords)
+            total_news = 0
 
-                except DataNotFoundError:
-                    pass
-
-                current_date += timedelta(days=1)
+            rollups = self.data_service.rollups.get_rollups(start_date, end_date)
+            for rollup in rollups:
+                for platform_id, count in rollup["platform_counts"].items():
+                    all_platforms_news[rollup["platform_names"][platform_id]] += count
+                total_news += rollup["total_news"]
+                all_keywords.update(rollup["keyword_counts"])
 
             # 生成报告
             report_title = f"{'每日' if report_type == 'daily' else '每周'}新闻热点摘要"
@@ -1248,7 +1206,7 @@ class AnalyticsTools:
 
 ## 📊 数据概览
 
-- **总新闻数**: {len(all_titles_list)}
+- **总新闻数**: {total_news}
 - **覆盖平台**: {len(all_platforms_news)}
 - **热门关键词数**: {len(all_keywords)}
 
@@ -1282,26 +1240,21 @@ class AnalyticsTools:
 
             # 确定性选取：按标题的权重排序，取前5条
             # 这样相同输入总是返回相同结果
-            if all_titles_list:
-                # 计算每条新闻的权重分数（基于关键词出现次数）
-                news_with_scores = []
-                for news in all_titles_list:
-                    # 简单权重：统计包含TOP关键词的次数
-                    score = 0
-                    title_lower = news['title'].lower()
-                    for keyword, count in all_keywords.most_common(10):
-                        if keyword.lower() in title_lower:
-                            score += count
-                    news_with_scores.append((news, score))
-
-                # 按权重降序排序，权重相同则按标题字母顺序（确保确定性）
-                news_with_scores.sort(key=lambda x: (-x[1], x[0]['title']))
-
-                # 取前5条
-                sample_news = [item[0] for item in news_with_scores[:5]]
-
-                for news in sample_news:
-                    markdown += f"- [{news['platform']}] {news['title']}\n"
+            if len(rollups) == 1:
+                # 单日报告的权重与日汇总一致，直接使用预先排好的精选标题
+                sample_news = rollups[0]["top_titles"][:5]
+            else:
+                # 多日报告需要按合并后的TOP关键词重新计算权重
+                entries = [
+                    (title, rollup["platform_names"][platform_id])
+                    for rollup in rollups
+                    for platform_id, titles in rollup["titles"].items()
+                    for title in titles
+                ]
+                sample_news = rank_titles_by_weight(entries, all_keywords, 5)
+
+            for news in sample_news:
+                markdown += f"- [{news['platform']}] {news['title']}\n"
 
             markdown += "\n---\n\n*本报告由 TrendRadar MCP 自动生成*\n"
 
@@ -1314,7 +1267,7 @@ class AnalyticsTools:
                 },
                 "markdown_report": markdown,
                 "statistics": {
-                    "total_news": len(all_titles_list),
+                    "total_news": total_news,
                     "platforms_count": len(all_platforms_news),
                     "keywords_count": len(all_keywords),
                     "top_keyword": all_keywords.most_common(1)[0] if all_keywords else None
@@ -1371,48 +1324,14 @@ class AnalyticsTools:
             else:
                 start_date = end_date = datetime.now()
 
-            # 统计各平台活跃度
-            platform_activity = defaultdict(lambda: {
-                "total_updates": 0,
-                "days_active": set(),
-                "news_count": 0,
-                "hourly_distribution": Counter()
-            })
-
-            # 遍历日期范围
-            current_date = start_date
-            while current_date <= end_date:
-                try:
-                    all_titles, id_to_name, timestamps = self.data_service.parser.read_all_titles_for_date(
-                        date=current_date
-                    )
-
-                    for platform_id, titles in all_titles.items():
-                        platform_name = id_to_name.get(platform_id, platform_id)
-
-                        platform_activity[platform_name]["news_count"] += len(titles)
-                        platform_activity[platform_name]["days_active"].add(current_date.strftime("%Y-%m-%d"))
-
-                        # 统计更新次数（基于文件数量）
-                        platform_activity[platform_name]["total_updates"] += len(timestamps)
-
-                        # 统计时间分布（基于文件名中的时间）
-                        for filename in timestamps.keys():
-                            # 解析文件名中的小时（格式：HHMM.txt）
-                            match = re.match(r'(\d{2})(\d{2})\.txt', filename)
-                            if match:
-                                hour = int(match.group(1))
-                                platform_activity[platform_name]["hourly_distribution"][hour] += 1
-
-                except DataNotFoundError:
-                    pass
-
-                current_date += timedelta(days=1)
+            # 统计各平台活跃度（按平台 × 日期 × 小时切片聚合）
+            # total_updates 为平台实际出现的快照数，时间分布按快照文件名中的小时统计
+            platform_activity = self.data_service.cube.platform_activity(start_date, end_date)
 
             # 转换为可序列化的格式
             result_activity = {}
             for platform, stats in platform_activity.items():
-                days_count = len(stats["days_active"])
+                days_count = stats["days_active"]
                 avg_news_per_day = stats["news_count"] / days_count if days_count > 0 else 0
 
                 # 找出最活跃的时间段
@@ -1465,7 +1384,8 @@ class AnalyticsTools:
     def analyze_topic_lifecycle(
         self,
         topic: str,
-        date_range: Optional[Dict[str, str]] = None
+        date_range: Optional[Dict[str, str]] = None,
+        granularity: str = "day"
     ) -> Dict:
         """
         话题生命周期分析 - 追踪话题从出现到消失的完整周期
@@ -1475,6 +1395,8 @@ class AnalyticsTools:
             date_range: 日期范围（可选）
                        - **格式**: {"start": "YYYY-MM-DD", "end": "YYYY-MM-DD"}
                        - **默认**: 不指定时默认分析最近7天
+            granularity: 时间粒度（day/hour/snapshot），默认 day；
+                        hour/snapshot 下 active_days 等统计按时间段计算
 
         Returns:
             话题生命周期分析结果
@@ -1496,6 +1418,7 @@ class AnalyticsTools:
         try:
             # 参数验证
             topic = validate_keyword(topic)
+            granularity = validate_granularity(granularity)
 
             # 处理日期范围（不指定时默认最近7天）
             if date_range:
@@ -1508,36 +1431,47 @@ class AnalyticsTools:
                 start_date = end_date - timedelta(days=6)
 
             # 收集话题历史数据
-            lifecycle_data = []
-            current_date = start_date
-            while current_date <= end_date:
-                try:
-                    all_titles, _, _ = self.data_service.parser.read_all_titles_for_date(
-                        date=current_date
+            if granularity != "day":
+                # 按小时/快照统计（基于时间序列，不重新扫描原始快照）
+                lifecycle_data = [
+                    {"date": item["date"], "count": item["count"]}
+                    for item in self.data_service.series.get_topic_series(
+                        topic, start_date, end_date, granularity
                     )
+                ]
+            else:
+                lifecycle_data = []
+                self.data_service.parser.preload_days(start_date, end_date)
+                current_date = start_date
+                while current_date <= end_date:
+                    try:
+                        all_titles, _, _ = self.data_service.parser.read_all_titles_for_date(
+                            date=current_date
+                        )
 
-                    # 统计该日的话题出现次数
-                    count = 0
-                    for _, titles in all_titles.items():
-                        for title in titles.keys():
-                            if topic.lower() in title.lower():
-                                count += 1
+                        # 统计该日的话题出现次数
+                        count = 0
+                        for _, titles in all_titles.items():
+                            for title in titles.keys():
+                                if topic.lower() in title.lower():
+                                    count += 1
 
-                    lifecycle_data.append({
-                        "date": current_date.strftime("%Y-%m-%d"),
-                        "count": count
-                    })
+                        lifecycle_data.append({
+                            "date": current_date.strftime("%Y-%m-%d"),
+                            "count": count
+                        })
 
-                except DataNotFoundError:
-                    lifecycle_data.append({
-                        "date": current_date.strftime("%Y-%m-%d"),
-                        "count": 0
-                    })
+                    except DataNotFoundError:
+                        lifecycle_data.append({
+                            "date": current_date.strftime("%Y-%m-%d"),
+                            "count": 0
+                        })
 
-                current_date += timedelta(days=1)
+                    current_date += timedelta(days=1)
 
-            # 计算分析天数
+            # 计算分析天数（按天统计时与时间段数相同）
             total_days = (end_date - start_date).days + 1
+            total_periods = len(lifecycle_data)
 
             # 分析生命周期阶段
             counts = [item["count"] for item in lifecycle_data]
@@ -1563,8 +1497,8 @@ class AnalyticsTools:
             avg_count = sum(non_zero_counts) / len(non_zero_counts) if non_zero_counts else 0
 
             # 判断生命周期阶段
-            recent_counts = counts[-3:]  # 最近3天
-            early_counts = counts[:3]    # 前3天
+            recent_counts = counts[-3:]  # 最近3个时间段
+            early_counts = counts[:3]    # 前3个时间段
 
             if sum(recent_counts) > sum(early_counts):
                 lifecycle_stage = "上升期"
@@ -1580,7 +1514,7 @@ class AnalyticsTools:
 
             if active_days <= 2 and max_count > avg_count * 2:
                 topic_type = "昙花一现"
-            elif active_days >= total_days * 0.6:
+            elif active_days >= total_periods * 0.6:
                 topic_type = "持续热点"
             else:
                 topic_type = "周期性热点"
@@ -1593,6 +1527,7 @@ class AnalyticsTools:
                     "end": end_date.strftime("%Y-%m-%d"),
                     "total_days": total_days
                 },
+                "granularity": granularity,
                 "lifecycle_data": lifecycle_data,
                 "analysis": {
                     "first_appearance": first_appearance,
@@ -1662,14 +1597,12 @@ class AnalyticsTools:
             # 读取当前和之前的数据
             current_all_titles, _, _ = self.data_service.parser.read_all_titles_for_date()
 
-            # 读取昨天的数据作为基准
+            # 读取昨天的日汇总作为基准
             yesterday = datetime.now() - timedelta(days=1)
             try:
-                previous_all_titles, _, _ = self.data_service.parser.read_all_titles_for_date(
-                    date=yesterday
-                )
+                previous_keywords = self.data_service.rollups.get_day_rollup(yesterday)["keyword_counts"]
             except DataNotFoundError:
-                previous_all_titles = {}
+                previous_keywords = {}
 
             # 统计当前的关键词频率
             current_keywords = Counter()
@@ -1683,14 +1616,6 @@ class AnalyticsTools:
                     for kw in keywords:
                         current_keyword_titles[kw].append(title)
 
-            # 统计之前的关键词频率
-            previous_keywords = Counter()
-
-            for _, titles in previous_all_titles.items():
-                for title in titles.keys():
-                    keywords = self._extract_keywords(title)
-                    previous_keywords.update(keywords)
-
             # 检测异常热度
             viral_topics = []
 
@@ -1802,16 +1727,7 @@ class AnalyticsTools:
                 date = datetime.now() - timedelta(days=days_ago)
 
                 try:
-                    all_titles, _, _ = self.data_service.parser.read_all_titles_for_date(
-                        date=date
-                    )
-
-                    # 统计关键词
-                    keywords_count = Counter()
-                    for _, titles in all_titles.items():
-                        for title in titles.keys():
-                            keywords = self._extract_keywords(title)
-                            keywords_count.update(keywords)
+                    keywords_count = self.data_service.rollups.get_day_rollup(date)["keyword_counts"]
 
                     # 记录每个关键词的历史数据
                     for keyword, count in keywords_count.items():
@@ -1920,33 +1836,18 @@ class AnalyticsTools:
 
     # ==================== 辅助方法 ====================
 
-    def _extract_keywords(self, title: str, min_length: int = 2) -> List[str]:
+    def _extract_keywords(self, title: str, min_length: int = 2) -> Tuple[str, ...]:
         """
-        从标题中提取关键词（简单实现）
+        从标题中提取关键词（简单实现，结果按标题缓存）
 
         Args:
             title: 标题文本
             min_length: 最小关键词长度
 
         Returns:
-            关键词列表
+            关键词元组
         """
-        # 移除URL和特殊字符
-        title = re.sub(r'http[s]?://\S+', '', title)
-        title = re.sub(r'[^\w\s]', ' ', title)
-
-        # 简单分词（按空格和常见分隔符）
-        words = re.split(r'[\s，。！？、]+', title)
-
-        # 过滤停用词和短词
-        stopwords = {'的', '了', '在', '是', '我', '有', '和', '就', '不', '人', '都', '一', '一个', '上', '也', '很', '到', '说', '要', '去', '你', '会', '着', '没有', '看', '好', '自己', '这'}
-
-        keywords = [
-            word.strip() for word in words
-            if word.strip() and len(word.strip()) >= min_length and word.strip() not in stopwords
-        ]
-
-        return keywords
+        return extract_title_keywords(title, min_length)
 
     def _calculate_similarity(self, text1: str, text2: str) -> float:
         """
@@ -1960,7 +1861,7 @@ class AnalyticsTools:
             相似度分数（0-1之间）
         """
         # 使用 SequenceMatcher 计算相似度
-        return SequenceMatcher(None, text1, text2).ratio()
+        return sequence_ratio(text1, text2)
 
     def _find_unique_topics(self, platform_stats: Dict) -> Dict[str, List[str]]:
         """
@@ -4,13 +4,14 @@
 提供模糊搜索、链接查询、历史相关新闻检索等高级搜索功能。
 """
 
-import re
 from collections import Counter
 from datetime import datetime, timedelta
-from difflib import SequenceMatcher
 from typing import Dict, List, Optional, Tuple
 
+from ..services.compute_service import fuzzy_kernel, get_compute, related_kernel
 from ..services.data_service import DataService
+from ..utils.keywords import SEARCH_STOPWORDS, extract_search_keywords
+from ..utils.similarity import fuzzy_match, keyword_overlap, text_similarity
 from ..utils.validators import validate_keyword, validate_limit
 from ..utils.errors import MCPError, InvalidParameterError, DataNotFoundError
 
@@ -27,13 +28,7 @@ class SearchTools:
         """
         self.data_service = DataService(project_root)
         # 中文停用词列表
-        self.stopwords = {
-            '的', '了', '在', '是', '我', '有', '和', '就', '不', '人', '都', '一',
-            '一个', '上', '也', '很', '到', '说', '要', '去', '你', '会', '着', '没有',
-            '看', '好', '自己', '这', '那', '来', '被', '与', '为', '对', '将', '从',
-            '以', '及', '等', '但', '或', '而', '于', '中', '由', '可', '可以', '已',
-            '已经', '还', '更', '最', '再', '因为', '所以', '如果', '虽然', '然而'
-        }
+        self.stopwords = SEARCH_STOPWORDS
 
     def search_news_unified(
         self,
@@ -122,6 +117,7 @@ class SearchTools:
 
             # 收集所有匹配的新闻
             all_matches = []
+            self.data_service.parser.preload_days(start_date, end_date)
             current_date = start_date
 
             while current_date <= end_date:
@@ -274,15 +270,15 @@ class SearchTools:
                         "platform_name": platform_name,
                         "date": current_date.strftime("%Y-%m-%d"),
                         "similarity_score": 1.0,  # 精确匹配，相似度为1
-                        "ranks": info.get("ranks", []),
-                        "count": len(info.get("ranks", [])),
-                        "rank": info["ranks"][0] if info["ranks"] else 999
+                        "ranks": info.ranks,
+                        "count": len(info.ranks),
+                        "rank": info.ranks.first if info.ranks else 999
                     }
 
                     # 条件性添加 URL 字段
                     if include_url:
-                        news_item["url"] = info.get("url", "")
-                        news_item["mobileUrl"] = info.get("mobileUrl", "")
+                        news_item["url"] = info.url
+                        news_item["mobileUrl"] = info.mobile_url
 
                     matches.append(news_item)
 
@@ -312,31 +308,35 @@ class SearchTools:
         """
         matches = []
 
-        for platform_id, titles in all_titles.items():
-            platform_name = id_to_name.get(platform_id, platform_id)
-
-            for title, info in titles.items():
-                # 模糊匹配
-                is_match, similarity = self._fuzzy_match(query, title, threshold)
-
-                if is_match:
-                    news_item = {
-                        "title": title,
-                        "platform": platform_id,
-                        "platform_name": platform_name,
-                        "date": current_date.strftime("%Y-%m-%d"),
-                        "similarity_score": round(similarity, 4),
-                        "ranks": info.get("ranks", []),
-                        "count": len(info.get("ranks", [])),
-                        "rank": info["ranks"][0] if info["ranks"] else 999
-                    }
+        # 按遍历顺序展开语料，模糊匹配交给计算服务（可多进程）
+        rows = [
+            (platform_id, title, info)
+            for platform_id, titles in all_titles.items()
+            for title, info in titles.items()
+        ]
+        scored = get_compute().map_matches(
+            fuzzy_kernel, [row[1] for row in rows], (query, threshold)
+        )
+
+        for index, similarity in scored:
+            platform_id, title, info = rows[index]
+            news_item = {
+                "title": title,
+                "platform": platform_id,
+                "platform_name": id_to_name.get(platform_id, platform_id),
+                "date": current_date.strftime("%Y-%m-%d"),
+                "similarity_score": round(similarity, 4),
+                "ranks": info.ranks,
+                "count": len(info.ranks),
+                "rank": info.ranks.first if info.ranks else 999
+            }
 
-                    # 条件性添加 URL 字段
-                    if include_url:
-                        news_item["url"] = info.get("url", "")
-                        news_item["mobileUrl"] = info.get("mobileUrl", "")
+            # 条件性添加 URL 字段
+            if include_url:
+                news_item["url"] = info.url
+                news_item["mobileUrl"] = info.mobile_url
 
-                    matches.append(news_item)
+            matches.append(news_item)
 
         return matches
 
@@ -374,15 +374,15 @@ class SearchTools:
                         "platform_name": platform_name,
                         "date": current_date.strftime("%Y-%m-%d"),
                         "similarity_score": 1.0,
-                        "ranks": info.get("ranks", []),
-                        "count": len(info.get("ranks", [])),
-                        "rank": info["ranks"][0] if info["ranks"] else 999
+                        "ranks": info.ranks,
+                        "count": len(info.ranks),
+                        "rank": info.ranks.first if info.ranks else 999
                     }
 
                     # 条件性添加 URL 字段
                     if include_url:
-                        news_item["url"] = info.get("url", "")
-                        news_item["mobileUrl"] = info.get("mobileUrl", "")
+                        news_item["url"] = info.url
+                        news_item["mobileUrl"] = info.mobile_url
 
                     matches.append(news_item)
 
@@ -399,8 +399,7 @@ class SearchTools:
         Returns:
             相似度分数 (0-1之间)
         """
-        # 使用 difflib.SequenceMatcher 计算序列相似度
-        return SequenceMatcher(None, text1.lower(), text2.lower()).ratio()
+        return text_similarity(text1, text2)
 
     def _fuzzy_match(self, query: str, text: str, threshold: float = 0.3) -> Tuple[bool, float]:
         """
@@ -414,56 +413,20 @@ class SearchTools:
         Returns:
             (是否匹配, 相似度分数)
         """
-        # 直接包含判断
-        if query.lower() in text.lower():
-            return True, 1.0
-
-        # 计算整体相似度
-        similarity = self._calculate_similarity(query, text)
-        if similarity >= threshold:
-            return True, similarity
-
-        # 分词后的部分匹配
-        query_words = set(self._extract_keywords(query))
-        text_words = set(self._extract_keywords(text))
-
-        if not query_words or not text_words:
-            return False, 0.0
+        return fuzzy_match(query, text, threshold)
 
-        # 计算关键词重合度
-        common_words = query_words & text_words
-        keyword_overlap = len(common_words) / len(query_words)
-
-        if keyword_overlap >= 0.5:  # 50%的关键词重合
-            return True, keyword_overlap
-
-        return False, similarity
-
-    def _extract_keywords(self, text: str, min_length: int = 2) -> List[str]:
+    def _extract_keywords(self, text: str, min_length: int = 2) -> Tuple[str, ...]:
         """
-        从文本中提取关键词
+        从文本中提取关键词（结果按文本缓存）
 
         Args:
             text: 输入文本
             min_length: 最小词长
 
         Returns:
-            关键词列表
+            关键词元组
         """
-        # 移除URL和特殊字符
-        text = re.sub(r'http[s]?://\S+', '', text)
-        text = re.sub(r'\[.*?\]', '', text)  # 移除方括号内容
-
-        # 使用正则表达式分词（中文和英文）
-        words = re.findall(r'[\w]+', text)
-
-        # 过滤停用词和短词
-        keywords = [
-            word for word in words
-            if word and len(word) >= min_length and word not in self.stopwords
-        ]
-
-        return keywords
+        return extract_search_keywords(text, min_length, self.stopwords)
 
     def _calculate_keyword_overlap(self, keywords1: List[str], keywords2: List[str]) -> float:
         """
@@ -476,20 +439,7 @@ class SearchTools:
         Returns:
             重合度分数 (0-1之间)
         """
-        if not keywords1 or not keywords2:
-            return 0.0
-
-        set1 = set(keywords1)
-        set2 = set(keywords2)
-
-        # Jaccard 相似度
-        intersection = len(set1 & set2)
-        union = len(set1 | set2)
-
-        if union == 0:
-            return 0.0
-
-        return intersection / union
+        return keyword_overlap(keywords1, keywords2)
 
     def search_related_news_history(
         self,
@@ -564,7 +514,7 @@ class SearchTools:
                 )
 
             # 提取参考文本的关键词
-            reference_keywords = self._extract_keywords(reference_text)
+            reference_keywords = list(self._extract_keywords(reference_text))
 
             if not reference_keywords:
                 raise InvalidParameterError(
@@ -572,8 +522,9 @@ class SearchTools:
                     suggestion="请提供更详细的文本内容"
                 )
 
-            # 收集所有相关新闻
-            all_related_news = []
+            # 收集整个日期范围内的标题（保持 日期 → 平台 → 标题 的遍历顺序）
+            rows = []
+            self.data_service.parser.preload_days(search_start, search_end)
             current_date = search_start
 
             while current_date <= search_end:
@@ -581,45 +532,11 @@ class SearchTools:
                     # 读取该日期的数据
                     all_titles, id_to_name, _ = self.data_service.parser.read_all_titles_for_date(current_date)
 
-                    # 搜索相关新闻
+                    date_str = current_date.strftime("%Y-%m-%d")
                     for platform_id, titles in all_titles.items():
                         platform_name = id_to_name.get(platform_id, platform_id)
-
                         for title, info in titles.items():
-                            # 计算标题相似度
-                            title_similarity = self._calculate_similarity(reference_text, title)
-
-                            # 提取标题关键词
-                            title_keywords = self._extract_keywords(title)
-
-                            # 计算关键词重合度
-                            keyword_overlap = self._calculate_keyword_overlap(
-                                reference_keywords,
-                                title_keywords
-                            )
-
-                            # 综合相似度 (70% 关键词重合 + 30% 文本相似度)
-                            combined_score = keyword_overlap * 0.7 + title_similarity * 0.3
-
-                            if combined_score >= threshold:
-                                news_item = {
-                                    "title": title,
-                                    "platform": platform_id,
-                                    "platform_name": platform_name,
-                                    "date": current_date.strftime("%Y-%m-%d"),
-                                    "similarity_score": round(combined_score, 4),
-                                    "keyword_overlap": round(keyword_overlap, 4),
-                                    "text_similarity": round(title_similarity, 4),
-                                    "common_keywords": list(set(reference_keywords) & set(title_keywords)),
-                                    "rank": info["ranks"][0] if info["ranks"] else 0
-                                }
-
-                                # 条件性添加 URL 字段
-                                if include_url:
-                                    news_item["url"] = info.get("url", "")
-                                    news_item["mobileUrl"] = info.get("mobileUrl", "")
-
-                                all_related_news.append(news_item)
+                            rows.append((date_str, platform_id, platform_name, title, info))
 
                 except DataNotFoundError:
                     # 该日期没有数据，继续下一天
@@ -631,6 +548,38 @@ class SearchTools:
                 # 移动到下一天
                 current_date += timedelta(days=1)
 
+            # 综合相似度 (70% 关键词重合 + 30% 文本相似度) 交给计算服务（可多进程）
+            scored = get_compute().map_matches(
+                related_kernel,
+                [row[3] for row in rows],
+                (reference_text, reference_keywords, threshold)
+            )
+
+            # 搜索相关新闻
+            all_related_news = []
+            for index, combined_score, overlap, title_similarity in scored:
+                date_str, platform_id, platform_name, title, info = rows[index]
+                title_keywords = self._extract_keywords(title)
+
+                news_item = {
+                    "title": title,
+                    "platform": platform_id,
+                    "platform_name": platform_name,
+                    "date": date_str,
+                    "similarity_score": round(combined_score, 4),
+                    "keyword_overlap": round(overlap, 4),
+                    "text_similarity": round(title_similarity, 4),
+                    "common_keywords": list(set(reference_keywords) & set(title_keywords)),
+                    "rank": info.ranks.first if info.ranks else 0
+                }
+
+                # 条件性添加 URL 字段
+                if include_url:
+                    news_item["url"] = info.url
+                    news_item["mobileUrl"] = info.mobile_url
+
+                all_related_news.append(news_item)
+
             if not all_related_news:
                 return {
                     "success": True,
@@ -7,7 +7,12 @@
 from pathlib import Path
 from typing import Dict, List, Optional
 
+from trendradar_core import build_api_url, clean_title, resolve_api_url, update_latest_pointer
+
+from ..services.config_service import get_config_service
 from ..services.data_service import DataService
+from ..services.metrics_service import get_metrics
+from ..services.warmup_service import get_warmup
 from ..utils.validators import validate_platforms
 from ..utils.errors import MCPError, CrawlTaskError
 
@@ -48,6 +53,8 @@ class SystemManagementTools:
 
             return {
                 **status,
+                "warmup": get_warmup().get_status(),
+                "metrics": get_metrics().summary(),
                 "success": True
             }
 
@@ -93,22 +100,19 @@ class SystemManagementTools:
             import requests
             from datetime import datetime
             import pytz
-            import yaml
 
             # 参数验证
             platforms = validate_platforms(platforms)
 
-            # 加载配置文件
-            config_path = self.project_root / "config" / "config.yaml"
-            if not config_path.exists():
+            # 读取配置（由配置服务缓存，文件变化时自动重新加载）
+            config_service = get_config_service(self.project_root)
+            snapshot = config_service.snapshot()
+            if snapshot.config is None:
                 raise CrawlTaskError(
-                    "配置文件不存在",
-                    suggestion=f"请确保配置文件存在: {config_path}"
+                    snapshot.config_error.message,
+                    suggestion=f"请确保配置文件存在且格式正确: {config_service.config_path}"
                 )
-
-            # 读取配置
-            with open(config_path, "r", encoding="utf-8") as f:
-                config_data = yaml.safe_load(f)
+            config_data = snapshot.config
 
             # 获取平台配置
             all_platforms = config_data.get("platforms", [])
@@ -129,8 +133,10 @@ class SystemManagementTools:
             else:
                 target_platforms = all_platforms
 
-            # 获取请求间隔
-            request_interval = config_data.get("crawler", {}).get("request_interval", 100)
+            # 获取请求间隔和接口地址
+            crawler_config = config_data.get("crawler", {})
+            request_interval = crawler_config.get("request_interval", 100)
+            api_url = resolve_api_url(crawler_config.get("api_url"))
 
             # 构建平台ID列表
             ids = []
@@ -157,7 +163,7 @@ class SystemManagementTools:
                 id_to_name[id_value] = name
 
                 # 构建请求URL
-                url = f"https://newsnow.busiyi.world/api/s?id={id_value}&latest"
+                url = build_api_url(api_url, id_value)
 
                 headers = {
                     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
@@ -260,18 +266,6 @@ class SystemManagementTools:
             # 如果需要持久化，调用保存逻辑
             if save_to_local:
                 try:
-                    import re
-
-                    # 辅助函数：清理标题
-                    def clean_title(title: str) -> str:
-                        """清理标题中的特殊字符"""
-                        if not isinstance(title, str):
-                            title = str(title)
-                        cleaned_title = title.replace("\n", " ").replace("\r", " ")
-                        cleaned_title = re.sub(r"\s+", " ", cleaned_title)
-                        cleaned_title = cleaned_title.strip()
-                        return cleaned_title
-
                     # 辅助函数：创建目录
                     def ensure_directory_exists(directory: str):
                         """确保目录存在"""
@@ -334,6 +328,14 @@ class SystemManagementTools:
                             for id_value in failed_ids:
                                 f.write(f"{id_value}\n")
 
+                    # 更新最新快照指针
+                    update_latest_pointer(
+                        txt_dir,
+                        txt_file_path.name,
+                        list(results.keys()),
+                        now.strftime("%Y-%m-%d %H:%M:%S")
+                    )
+
                     # 保存 html 文件（简化版）
                     html_content = self._generate_simple_html(results, id_to_name, failed_ids, now)
                     with open(html_file_path, "w", encoding="utf-8") as f:
@@ -0,0 +1,111 @@
+"""
+关键词提取工具
+
+提供分析工具和检索工具共用的标题关键词提取函数。
+均为无状态的模块级函数，可在计算进程中直接调用。
+
+同一标题会在多天、多个工具中被反复分词，提取结果按 (标题, 参数) 缓存，
+每个唯一标题在进程内只做一次正则分词。结果以元组返回，调用方不能修改。
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, Tuple
+
+
+# 分析工具使用的停用词
+ANALYTICS_STOPWORDS: FrozenSet[str] = frozenset({
+    '的', '了', '在', '是', '我', '有', '和', '就', '不', '人', '都', '一',
+    '一个', '上', '也', '很', '到', '说', '要', '去', '你', '会', '着', '没有',
+    '看', '好', '自己', '这'
+})
+
+# 检索工具使用的停用词（更完整的中文停用词列表）
+SEARCH_STOPWORDS: FrozenSet[str] = frozenset({
+    '的', '了', '在', '是', '我', '有', '和', '就', '不', '人', '都', '一',
+    '一个', '上', '也', '很', '到', '说', '要', '去', '你', '会', '着', '没有',
+    '看', '好', '自己', '这', '那', '来', '被', '与', '为', '对', '将', '从',
+    '以', '及', '等', '但', '或', '而', '于', '中', '由', '可', '可以', '已',
+    '已经', '还', '更', '最', '再', '因为', '所以', '如果', '虽然', '然而'
+})
+
+# 关键词缓存容量（唯一标题数，约为一个月的热榜标题量）
+KEYWORD_CACHE_SIZE = 131072
+
+
+@lru_cache(maxsize=KEYWORD_CACHE_SIZE)
+def extract_title_keywords(title: str, min_length: int = 2) -> Tuple[str, ...]:
+    """
+    从标题中提取关键词（分析工具使用的简单实现）
+
+    Args:
+        title: 标题文本
+        min_length: 最小关键词长度
+
+    Returns:
+        关键词元组
+    """
+    # 移除URL和特殊字符
+    title = re.sub(r'http[s]?://\S+', '', title)
+    title = re.sub(r'[^\w\s]', ' ', title)
+
+    # 简单分词（按空格和常见分隔符）
+    words = re.split(r'[\s，。！？、]+', title)
+
+    # 过滤停用词和短词
+    return tuple(
+        word.strip() for word in words
+        if word.strip() and len(word.strip()) >= min_length and word.strip() not in ANALYTICS_STOPWORDS
+    )
+
+
+@lru_cache(maxsize=KEYWORD_CACHE_SIZE)
+def extract_search_keywords(
+    text: str,
+    min_length: int = 2,
+    stopwords: FrozenSet[str] = SEARCH_STOPWORDS
+) -> Tuple[str, ...]:
+    """
+    从文本中提取关键词（检索工具使用的实现）
+
+    Args:
+        text: 输入文本
+        min_length: 最小词长
+        stopwords: 停用词集合
+
+    Returns:
+        关键词元组
+    """
+    # 移除URL和特殊字符
+    text = re.sub(r'http[s]?://\S+', '', text)
+    text = re.sub(r'\[.*?\]', '', text)  # 移除方括号内容
+
+    # 使用正则表达式分词（中文和英文）
+    words = re.findall(r'[\w]+', text)
+
+    # 过滤停用词和短词
+    return tuple(
+        word for word in words
+        if word and len(word) >= min_length and word not in stopwords
+    )
+
+
+def get_keyword_cache_stats() -> Dict[str, Dict[str, int]]:
+    """
+    获取关键词缓存统计信息
+
+    Returns:
+        各提取函数的缓存命中/未命中/条目数
+    """
+    stats = {}
+    for name, func in (
+        ("title_keywords", extract_title_keywords),
+        ("search_keywords", extract_search_keywords),
+    ):
+        info = func.cache_info()
+        stats[name] = {
+            "hits": info.hits,
+            "misses": info.misses,
+            "entries": info.currsize,
+        }
+    return stats
@@ -0,0 +1,59 @@
+"""
+新闻条目
+
+解析后的每条新闻只保存排名、链接两类数据。一个月的历史数据有数十万条，
+用普通字典（外加一个排名列表）保存时内存开销很大，这里使用紧凑表示：
+
+- __slots__ 去掉每个对象的 __dict__
+- 排名不保存完整列表，而是固定大小的排名统计（RankStats），合并为 O(1)
+- 平台ID和链接通过 sys.intern 驻留，同一字符串只保存一份
+
+只在生成 JSON 输出时才转换为字典。
+"""
+
+from typing import Dict, Iterable, Optional
+
+from trendradar_core import RankStats, intern_text
+
+
+class NewsItem:
+    """新闻条目（排名统计 + 链接）"""
+
+    __slots__ = ("ranks", "url", "mobile_url")
+
+    def __init__(
+        self,
+        ranks: Optional[Iterable[int]] = None,
+        url: str = "",
+        mobile_url: str = ""
+    ):
+        """
+        初始化新闻条目
+
+        Args:
+            ranks: 排名序列
+            url: 链接
+            mobile_url: 移动端链接
+        """
+        self.ranks = RankStats(ranks) if ranks is not None else RankStats()
+        self.url = intern_text(url)
+        self.mobile_url = intern_text(mobile_url)
+
+    def copy(self) -> "NewsItem":
+        """复制条目（排名统计独立，链接共享）"""
+        item = NewsItem.__new__(NewsItem)
+        item.ranks = self.ranks.copy()
+        item.url = self.url
+        item.mobile_url = self.mobile_url
+        return item
+
+    def to_dict(self) -> Dict:
+        """转换为字典（JSON 输出边界使用）"""
+        return {
+            "ranks": self.ranks.to_dict(),
+            "url": self.url,
+            "mobileUrl": self.mobile_url,
+        }
+
+    def __repr__(self) -> str:
+        return f"NewsItem(ranks={self.ranks!r}, url={self.url!r}, mobile_url={self.mobile_url!r})"
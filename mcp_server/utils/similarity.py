@@ -0,0 +1,344 @@
+"""
+文本相似度工具
+
+提供分析工具和检索工具共用的标题相似度计算函数。
+均为无状态的模块级函数，可在计算进程中直接调用。
+
+SequenceMatcher.ratio() 的计算量随标题长度平方增长，批量比较时先用
+字符计数索引求出相似度上界（与 SequenceMatcher.quick_ratio 相同的界），
+上界达不到阈值的标题直接跳过，只对候选标题计算精确相似度。
+"""
+
+from collections import Counter, OrderedDict
+from difflib import SequenceMatcher
+from threading import Lock
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from .keywords import extract_search_keywords
+
+
+def sequence_ratio(text1: str, text2: str) -> float:
+    """
+    计算两个文本的序列相似度（区分大小写）
+
+    Args:
+        text1: 文本1
+        text2: 文本2
+
+    Returns:
+        相似度分数（0-1之间）
+    """
+    return SequenceMatcher(None, text1, text2).ratio()
+
+
+def text_similarity(text1: str, text2: str) -> float:
+    """
+    计算两个文本的相似度（忽略大小写）
+
+    Args:
+        text1: 文本1
+        text2: 文本2
+
+    Returns:
+        相似度分数 (0-1之间)
+    """
+    return SequenceMatcher(None, text1.lower(), text2.lower()).ratio()
+
+
+def keyword_overlap(keywords1: Sequence[str], keywords2: Sequence[str]) -> float:
+    """
+    计算两个关键词列表的重合度（Jaccard 相似度）
+
+    Args:
+        keywords1: 关键词列表1
+        keywords2: 关键词列表2
+
+    Returns:
+        重合度分数 (0-1之间)
+    """
+    if not keywords1 or not keywords2:
+        return 0.0
+
+    set1 = set(keywords1)
+    set2 = set(keywords2)
+
+    intersection = len(set1 & set2)
+    union = len(set1 | set2)
+
+    if union == 0:
+        return 0.0
+
+    return intersection / union
+
+
+def fuzzy_match(query: str, text: str, threshold: float = 0.3) -> Tuple[bool, float]:
+    """
+    模糊匹配函数
+
+    Args:
+        query: 查询文本
+        text: 待匹配文本
+        threshold: 匹配阈值
+
+    Returns:
+        (是否匹配, 相似度分数)
+    """
+    # 直接包含判断
+    if query.lower() in text.lower():
+        return True, 1.0
+
+    # 计算整体相似度
+    similarity = text_similarity(query, text)
+    if similarity >= threshold:
+        return True, similarity
+
+    # 分词后的部分匹配
+    query_words = set(extract_search_keywords(query))
+    text_words = set(extract_search_keywords(text))
+
+    if not query_words or not text_words:
+        return False, 0.0
+
+    # 计算关键词重合度
+    common_words = query_words & text_words
+    overlap = len(common_words) / len(query_words)
+
+    if overlap >= 0.5:  # 50%的关键词重合
+        return True, overlap
+
+    return False, similarity
+
+
+class TitleIndex:
+    """
+    标题字符计数倒排索引
+
+    对任意查询 q 和标题 t，SequenceMatcher(None, q, t).ratio() 的匹配字符数
+    不超过两者字符多重集的交集大小 Σ min(count_q(c), count_t(c))，因此
+
+        ratio(q, t) <= 2 * Σ min(count_q(c), count_t(c)) / (len(q) + len(t))
+
+    该上界与 ratio() 使用相同的浮点运算，比较阈值时不会因舍入产生误判。
+    """
+
+    def __init__(self, titles: Sequence[str], lower: bool = False):
+        """
+        构建索引
+
+        Args:
+            titles: 标题列表
+            lower: 是否按小写形式建立索引（对应 text_similarity）
+        """
+        self.lower = lower
+        self.lengths: List[int] = []
+        self.postings: Dict[str, List[Tuple[int, int]]] = {}
+
+        for index, title in enumerate(titles):
+            if lower:
+                title = title.lower()
+            self.lengths.append(len(title))
+            for char, count in Counter(title).items():
+                posting = self.postings.get(char)
+                if posting is None:
+                    self.postings[char] = [(index, count)]
+                else:
+                    posting.append((index, count))
+
+    def upper_bounds(self, query: str) -> Dict[int, float]:
+        """
+        计算查询与各标题相似度的上界
+
+        Args:
+            query: 查询文本（lower=True 时会自动转为小写）
+
+        Returns:
+            {标题下标: 相似度上界}，未出现的标题与查询没有公共字符，相似度为 0
+        """
+        if self.lower:
+            query = query.lower()
+        query_length = len(query)
+
+        # 累计每个标题与查询的字符多重集交集大小
+        common: Dict[int, int] = {}
+        for char, query_count in Counter(query).items():
+            for index, count in self.postings.get(char, ()):
+                common[index] = common.get(index, 0) + (count if count < query_count else query_count)
+
+        lengths = self.lengths
+        return {
+            index: 2.0 * matches / (query_length + lengths[index])
+            for index, matches in common.items()
+        }
+
+    def candidates(self, query: str, threshold: float) -> Optional[Set[int]]:
+        """
+        找出相似度上界达到阈值的标题
+
+        Args:
+            query: 查询文本（lower=True 时会自动转为小写）
+            threshold: 相似度阈值
+
+        Returns:
+            候选标题下标集合；阈值不大于 0 时返回 None，表示全部标题都是候选
+        """
+        if threshold <= 0:
+            return None
+
+        return {
+            index for index, bound in self.upper_bounds(query).items()
+            if bound >= threshold
+        }
+
+
+# 最近使用的标题索引（按语料内容缓存，同一天的语料只建一次索引）
+_INDEX_CACHE_SIZE = 8
+_index_cache: "OrderedDict[Tuple[Tuple[str, ...], bool], TitleIndex]" = OrderedDict()
+_index_lock = Lock()
+
+
+def get_title_index(titles: Sequence[str], lower: bool = False) -> TitleIndex:
+    """
+    获取标题语料的字符计数索引（带缓存）
+
+    Args:
+        titles: 标题列表
+        lower: 是否按小写形式建立索引
+
+    Returns:
+        标题索引
+    """
+    key = (tuple(titles), lower)
+
+    with _index_lock:
+        index = _index_cache.get(key)
+        if index is not None:
+            _index_cache.move_to_end(key)
+            return index
+
+    index = TitleIndex(key[0], lower)
+
+    with _index_lock:
+        _index_cache[key] = index
+        while len(_index_cache) > _INDEX_CACHE_SIZE:
+            _index_cache.popitem(last=False)
+
+    return index
+
+
+def ratio_matches(
+    reference: str,
+    titles: Sequence[str],
+    threshold: float,
+    offset: int = 0
+) -> List[Tuple[int, float]]:
+    """
+    批量计算序列相似度（区分大小写），返回达到阈值的标题
+
+    Args:
+        reference: 参考标题
+        titles: 标题列表
+        threshold: 相似度阈值
+        offset: 返回下标的偏移量
+
+    Returns:
+        [(下标, 相似度)]，按标题顺序排列
+    """
+    candidates = get_title_index(titles).candidates(reference, threshold)
+    indexes = range(len(titles)) if candidates is None else sorted(candidates)
+
+    matches = []
+    for i in indexes:
+        similarity = sequence_ratio(reference, titles[i])
+        if similarity >= threshold:
+            matches.append((offset + i, similarity))
+    return matches
+
+
+def fuzzy_matches(
+    query: str,
+    titles: Sequence[str],
+    threshold: float,
+    offset: int = 0
+) -> List[Tuple[int, float]]:
+    """
+    批量模糊匹配，结果与逐条调用 fuzzy_match 一致
+
+    上界达不到阈值的标题跳过整体相似度计算，仍会检查包含关系和关键词重合度。
+
+    Args:
+        query: 查询文本
+        titles: 标题列表
+        threshold: 匹配阈值
+        offset: 返回下标的偏移量
+
+    Returns:
+        [(下标, 相似度)]，仅包含匹配的标题，按标题顺序排列
+    """
+    query_lower = query.lower()
+    query_words = set(extract_search_keywords(query))
+    candidates = get_title_index(titles, lower=True).candidates(query, threshold)
+
+    matches = []
+    for i, title in enumerate(titles):
+        # 直接包含判断
+        if query_lower in title.lower():
+            matches.append((offset + i, 1.0))
+            continue
+
+        # 计算整体相似度（上界达到阈值时）
+        if candidates is None or i in candidates:
+            similarity = text_similarity(query, title)
+            if similarity >= threshold:
+                matches.append((offset + i, similarity))
+                continue
+
+        # 分词后的部分匹配
+        if not query_words:
+            continue
+        text_words = set(extract_search_keywords(title))
+        if not text_words:
+            continue
+
+        overlap = len(query_words & text_words) / len(query_words)
+        if overlap >= 0.5:  # 50%的关键词重合
+            matches.append((offset + i, overlap))
+
+    return matches
+
+
+def related_matches(
+    reference_text: str,
+    reference_keywords: List[str],
+    titles: Sequence[str],
+    threshold: float,
+    offset: int = 0
+) -> List[Tuple[int, float, float, float]]:
+    """
+    批量计算综合相关度（70% 关键词重合 + 30% 文本相似度），返回达到阈值的标题
+
+    先用关键词重合度和文本相似度上界估算综合分数的上界，
+    达不到阈值的标题不再计算精确文本相似度。
+
+    Args:
+        reference_text: 参考文本
+        reference_keywords: 参考文本的关键词
+        titles: 标题列表
+        threshold: 相关性阈值
+        offset: 返回下标的偏移量
+
+    Returns:
+        [(下标, 综合分数, 关键词重合度, 文本相似度)]，按标题顺序排列
+    """
+    bounds = get_title_index(titles, lower=True).upper_bounds(reference_text)
+
+    matches = []
+    for i, title in enumerate(titles):
+        overlap = keyword_overlap(reference_keywords, extract_search_keywords(title))
+        if overlap * 0.7 + bounds.get(i, 0.0) * 0.3 < threshold:
+            continue
+
+        title_similarity = text_similarity(reference_text, title)
+        combined_score = overlap * 0.7 + title_similarity * 0.3
+        if combined_score >= threshold:
+            matches.append((offset + i, combined_score, overlap, title_similarity))
+    return matches
@@ -6,11 +6,10 @@
 
 from datetime import datetime
 from typing import List, Optional
-import os
-import yaml
 
 from .errors import InvalidParameterError
 from .date_parser import DateParser
+from ..services.config_service import get_config_service
 
 
 def get_supported_platforms() -> List[str]:
@@ -22,22 +21,18 @@ def get_supported_platforms() -> List[str]:
 
     Note:
         - 读取失败时返回空列表，允许所有平台通过（降级策略）
-        - 平台列表来自 config/config.yaml 中的 platforms 配置
+        - 平台列表来自 config/config.yaml 中的 platforms 配置（由配置服务缓存，文件变化时自动重新加载）
     """
-    try:
-        # 获取 config.yaml 路径（相对于当前文件）
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        config_path = os.path.join(current_dir, "..", "..", "config", "config.yaml")
-        config_path = os.path.normpath(config_path)
+    return list(_platform_snapshot().platform_order)
+
 
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
-            platforms = config.get('platforms', [])
-            return [p['id'] for p in platforms if 'id' in p]
-    except Exception as e:
-        # 降级方案：返回空列表，允许所有平台
-        print(f"警告：无法加载平台配置 ({config_path}): {e}")
-        return []
+def _platform_snapshot():
+    """获取当前配置快照，配置加载失败时打印警告"""
+    snapshot = get_config_service().snapshot()
+    if snapshot.config is None:
+        # 降级方案：平台列表为空，允许所有平台
+        print(f"警告：无法加载平台配置: {snapshot.config_error.message}")
+    return snapshot
 
 
 def validate_platforms(platforms: Optional[List[str]]) -> List[str]:
@@ -58,30 +53,30 @@ def validate_platforms(platforms: Optional[List[str]]) -> List[str]:
         - 会验证平台ID是否在 config.yaml 的 platforms 配置中
         - 配置加载失败时，允许所有平台通过（降级策略）
     """
-    supported_platforms = get_supported_platforms()
+    snapshot = _platform_snapshot()
 
     if platforms is None:
         # 返回配置文件中的平台列表（用户的默认配置）
-        return supported_platforms if supported_platforms else []
+        return list(snapshot.platform_order)
 
     if not isinstance(platforms, list):
         raise InvalidParameterError("platforms 参数必须是列表类型")
 
     if not platforms:
         # 空列表时，返回配置文件中的平台列表
-        return supported_platforms if supported_platforms else []
+        return list(snapshot.platform_order)
 
-    # 如果配置加载失败（supported_platforms为空），允许所有平台通过
-    if not supported_platforms:
+    # 如果配置加载失败（平台列表为空），允许所有平台通过
+    if not snapshot.platform_ids:
         print("警告：平台配置未加载，跳过平台验证")
         return platforms
 
     # 验证每个平台是否在配置中
-    invalid_platforms = [p for p in platforms if p not in supported_platforms]
+    invalid_platforms = [p for p in platforms if p not in snapshot.platform_ids]
     if invalid_platforms:
         raise InvalidParameterError(
             f"不支持的平台: {', '.join(invalid_platforms)}",
-            suggestion=f"支持的平台（来自config.yaml）: {', '.join(supported_platforms)}"
+            suggestion=f"支持的平台（来自config.yaml）: {', '.join(snapshot.platform_order)}"
         )
 
     return platforms
@@ -289,6 +284,33 @@ def validate_mode(mode: Optional[str], valid_modes: List[str], default: str) ->
     return mode
 
 
+def validate_granularity(granularity: Optional[str]) -> str:
+    """
+    验证时间粒度参数
+
+    Args:
+        granularity: 时间粒度（day/hour/snapshot）
+
+    Returns:
+        验证后的时间粒度，默认 day
+
+    Raises:
+        InvalidParameterError: 粒度无效
+    """
+    if granularity is None:
+        return "day"
+
+    valid_granularities = ["day", "hour", "snapshot"]
+
+    if granularity not in valid_granularities:
+        raise InvalidParameterError(
+            f"不支持的粒度参数: {granularity}",
+            suggestion=f"支持的粒度: {', '.join(valid_granularities)}（hour/snapshot 按爬取快照统计）"
+        )
+
+    return granularity
+
+
 def validate_config_section(section: Optional[str]) -> str:
     """
     验证配置节参数
@@ -0,0 +1,70 @@
+"""
+TrendRadar 公共模块
+
+爬虫（main.py）和 MCP 服务器共用的数据格式代码：
+- 快照 txt 文件的流式解析、最新快照指针
+- newsnow 接口地址
+- 按阶段性能分析（cProfile / tracemalloc）
+- 排名统计（RankStats）
+- 标题清理、字符串驻留
+"""
+
+from .newsnow import API_URL_ENV, DEFAULT_API_URL, build_api_url, resolve_api_url
+from .profiling import (
+    DEFAULT_SAMPLE_INTERVAL,
+    PROFILE_MODES,
+    PROFILES_DIR_NAME,
+    ProfileSession,
+    Profiler,
+)
+from .ranks import RANK_HISTOGRAM_SIZE, RankStats
+from .snapshot import (
+    FAILED_SECTION_MARKER,
+    LATEST_POINTER_FILE,
+    SnapshotRecord,
+    build_snapshot,
+    iter_snapshot_lines,
+    iter_snapshot_records,
+    parse_snapshot,
+    parse_title_line,
+    read_failed_ids,
+    read_latest_pointer,
+    read_snapshot_records,
+    read_snapshot_text_records,
+    update_latest_pointer,
+)
+from .text import clean_title, intern_text
+
+__all__ = [
+    # newsnow
+    "API_URL_ENV",
+    "DEFAULT_API_URL",
+    "build_api_url",
+    "resolve_api_url",
+    # profiling
+    "DEFAULT_SAMPLE_INTERVAL",
+    "PROFILE_MODES",
+    "PROFILES_DIR_NAME",
+    "ProfileSession",
+    "Profiler",
+    # ranks
+    "RANK_HISTOGRAM_SIZE",
+    "RankStats",
+    # snapshot
+    "FAILED_SECTION_MARKER",
+    "LATEST_POINTER_FILE",
+    "SnapshotRecord",
+    "build_snapshot",
+    "iter_snapshot_lines",
+    "iter_snapshot_records",
+    "parse_snapshot",
+    "parse_title_line",
+    "read_failed_ids",
+    "read_latest_pointer",
+    "read_snapshot_records",
+    "read_snapshot_text_records",
+    "update_latest_pointer",
+    # text
+    "clean_title",
+    "intern_text",
+]
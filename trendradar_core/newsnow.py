@@ -0,0 +1,44 @@
+"""
+newsnow 接口地址
+
+爬虫和 MCP 的 trigger_crawl 都通过 newsnow 接口获取榜单数据。接口地址可以
+通过环境变量 CRAWLER_API_URL 或 config.yaml 中的 crawler.api_url 覆盖，
+用于离线压测（指向本地模拟服务器，见 benchmarks/mock_newsnow.py）或自建的 newsnow 服务。
+"""
+
+import os
+from typing import Optional
+
+
+DEFAULT_API_URL = "https://newsnow.busiyi.world/api/s"
+
+# 覆盖接口地址的环境变量（优先于配置文件）
+API_URL_ENV = "CRAWLER_API_URL"
+
+
+def resolve_api_url(configured: Optional[str] = None) -> str:
+    """
+    确定 newsnow 接口地址
+
+    Args:
+        configured: 配置文件中的 crawler.api_url
+
+    Returns:
+        接口地址（环境变量 > 配置文件 > 默认地址）
+    """
+    api_url = os.environ.get(API_URL_ENV, "").strip() or (configured or "").strip()
+    return api_url.rstrip("?") or DEFAULT_API_URL
+
+
+def build_api_url(api_url: str, platform_id: str) -> str:
+    """
+    构建获取某个平台最新榜单的请求地址
+
+    Args:
+        api_url: 接口地址（resolve_api_url 的结果）
+        platform_id: 平台ID
+
+    Returns:
+        请求地址
+    """
+    return f"{api_url}?id={platform_id}&latest"
@@ -0,0 +1,376 @@
+"""
+按阶段性能分析
+
+爬虫（main.py --profile）和 MCP 服务器（--profile）共用：一次运行或一次工具调用
+作为一个分析会话，会话内的每个阶段单独统计，结果写入 output/.profiles/<时间>-<名称>/：
+
+- cpu 模式：
+    <阶段>.pstats     cProfile 统计（python -m pstats / snakeviz 查看）
+    <阶段>.collapsed  调用栈采样的折叠栈（flamegraph.pl / speedscope 直接生成火焰图）
+- sample 模式：只做调用栈采样，只输出 <阶段>.collapsed
+- mem 模式：
+    <阶段>.txt        阶段内新分配且未释放的内存，按代码行汇总
+    <阶段>.collapsed  同上，按调用栈汇总，权重为字节数
+- all.pstats / all.collapsed：所有阶段合并，火焰图的第一层为阶段名
+
+阶段可以嵌套，只有最外层的阶段单独统计（内层阶段计入外层）。阶段按线程分别跟踪，
+其他线程（如爬取流水线的后台线程）中的阶段也会被统计：cpu 模式下 cProfile 只分析
+调用 start() 的线程，其他线程的阶段只做调用栈采样；mem 模式的 tracemalloc 是进程级的，
+只统计调用 start() 的线程中的阶段。
+
+sample_rate 小于 1 时按概率只分析一部分运行或调用，未被选中的调用没有额外开销。
+各模式的开销：sample 只有后台线程定时读取调用栈，开销很小，适合在生产环境长期开启；
+cpu 模式的 cProfile 会跟踪每次函数调用，函数调用密集的阶段（如频率词匹配）会慢 2~3 倍；
+mem 模式会记录每次内存分配的调用栈，分配密集的阶段会慢一个数量级，适合排查问题时临时使用。cProfile、pstats、tracemalloc 在真正开始分析时才导入。
+Python 3.12 起 cProfile 也是进程级的，cpu 和 mem 模式同一时间只分析一个会话。
+"""
+
+import random
+import re
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+
+PROFILE_MODES = ("cpu", "mem", "sample")
+
+# 分析结果目录（output 下）
+PROFILES_DIR_NAME = ".profiles"
+
+# 调用栈采样间隔（秒）
+DEFAULT_SAMPLE_INTERVAL = 0.005
+
+# 折叠栈的最大深度
+MAX_STACK_DEPTH = 128
+
+# tracemalloc 为每次分配保存的栈深度（越深开销越大）
+TRACEMALLOC_FRAMES = 16
+
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^\w.-]+")
+
+
+def _collapsed_label(text: str) -> str:
+    """折叠栈中的一帧（分号是层级分隔符，空格是计数分隔符，都需要替换）"""
+    return text.replace(";", ",").replace(" ", "_")
+
+
+def _frame_label(filename: str, name: str, lineno: int) -> str:
+    """函数帧：函数名(文件名:行号)"""
+    return _collapsed_label(f"{name}({Path(filename).name}:{lineno})")
+
+
+def _stage_filename(stage: str) -> str:
+    """阶段名转换为文件名"""
+    return _UNSAFE_FILENAME_CHARS.sub("_", stage) or "stage"
+
+
+class StackSampler:
+    """按固定间隔采样处于某个阶段中的线程的调用栈，按阶段汇总为折叠栈计数"""
+
+    def __init__(self, interval: float = DEFAULT_SAMPLE_INTERVAL):
+        self.interval = interval
+        # {线程ID: 当前阶段}
+        self.stages: Dict[int, str] = {}
+        self.stacks: Dict[str, Counter] = {}
+        self._labels: Dict = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def enter(self, thread_id: int, stage: str) -> None:
+        """线程进入阶段"""
+        self.stages[thread_id] = stage
+
+    def leave(self, thread_id: int) -> None:
+        """线程离开阶段"""
+        self.stages.pop(thread_id, None)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            if not self.stages:
+                continue
+            frames = sys._current_frames()
+            for thread_id, stage in list(self.stages.items()):
+                frame = frames.get(thread_id)
+                if frame is None:
+                    continue
+
+                codes = []
+                while frame is not None and len(codes) < MAX_STACK_DEPTH:
+                    codes.append(frame.f_code)
+                    frame = frame.f_back
+                del frame
+
+                self.stacks.setdefault(stage, Counter())[tuple(reversed(codes))] += 1
+            del frames
+
+    def collapsed(self) -> Dict[str, Counter]:
+        """{阶段: {折叠栈: 采样次数}}"""
+        result = {}
+        for stage, counts in self.stacks.items():
+            collapsed = result[stage] = Counter()
+            for codes, count in counts.items():
+                collapsed[";".join(self._label(code) for code in codes)] += count
+        return result
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = self._labels[code] = _frame_label(code.co_filename, code.co_name, code.co_firstlineno)
+        return label
+
+
+class ProfileSession:
+    """
+    一次运行或一次工具调用的性能分析
+
+    start / finish 在被分析的线程中调用；stage 可以在任意线程中调用（见模块说明）。
+    """
+
+    def __init__(
+        self,
+        mode: str,
+        output_dir: Path,
+        name: str,
+        interval: float = DEFAULT_SAMPLE_INTERVAL,
+        on_finish: Optional[Callable[[], None]] = None,
+    ):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"不支持的分析模式: {mode}（可选 {', '.join(PROFILE_MODES)}）")
+        self.mode = mode
+        self.name = name
+        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        self.path = Path(output_dir) / f"{timestamp}-{_stage_filename(name)}"
+        self.interval = interval
+        self._on_finish = on_finish
+
+        self._owner: Optional[int] = None
+        # 每个线程当前所在的最外层阶段
+        self._local = threading.local()
+        self._order_lock = threading.Lock()
+        self._stage_order: List[str] = []
+        self._profiles: Dict = {}
+        self._sampler: Optional[StackSampler] = None
+        self._started_tracemalloc = False
+        # mem 模式：{阶段: {调用栈元组: 字节数}}
+        self._allocations: Dict[str, Counter] = {}
+
+    def start(self) -> None:
+        """开始分析（cpu / sample 模式启动调用栈采样线程，mem 模式启动 tracemalloc）"""
+        self._owner = threading.get_ident()
+        if self.mode != "mem":
+            self._sampler = StackSampler(self.interval)
+            self._sampler.start()
+        else:
+            import tracemalloc
+
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(TRACEMALLOC_FRAMES)
+                self._started_tracemalloc = True
+
+    @contextmanager
+    def stage(self, name: str):
+        """统计 with 块，计入指定阶段（同一线程内嵌套时计入最外层阶段）"""
+        thread_id = threading.get_ident()
+        if getattr(self._local, "current", None) is not None or (
+            self.mode == "mem" and thread_id != self._owner
+        ):
+            yield
+            return
+
+        self._local.current = name
+        with self._order_lock:
+            if name not in self._stage_order:
+                self._stage_order.append(name)
+        try:
+            if self.mode == "mem":
+                with self._mem_stage(name):
+                    yield
+            else:
+                with self._cpu_stage(name, thread_id):
+                    yield
+        finally:
+            self._local.current = None
+
+    @contextmanager
+    def _cpu_stage(self, name: str, thread_id: int):
+        profile = None
+        if self.mode == "cpu" and thread_id == self._owner:
+            profile = self._profiles.get(name)
+            if profile is None:
+                import cProfile
+
+                profile = self._profiles[name] = cProfile.Profile()
+
+        self._sampler.enter(thread_id, name)
+        enabled = False
+        if profile is not None:
+            try:
+                profile.enable()
+                enabled = True
+            except ValueError:
+                # Python 3.12+ 同一时间只能有一个 cProfile（已被其他分析工具占用），只做调用栈采样
+                pass
+        try:
+            yield
+        finally:
+            if enabled:
+                profile.disable()
+            self._sampler.leave(thread_id)
+
+    @contextmanager
+    def _mem_stage(self, name: str):
+        import tracemalloc
+
+        # 阶段开始时清空已记录的分配，结束时的快照即为阶段内分配且未释放的内存
+        tracemalloc.clear_traces()
+        try:
+            yield
+        finally:
+            snapshot = tracemalloc.take_snapshot()
+            ignored = (tracemalloc.__file__, __file__)
+            allocations = self._allocations.setdefault(name, Counter())
+            for stat in snapshot.statistics("traceback"):
+                stack = tuple((frame.filename, frame.lineno) for frame in stat.traceback)
+                if stack and stack[-1][0] not in ignored:
+                    allocations[stack] += stat.size
+
+    def finish(self) -> Path:
+        """
+        结束分析并写入结果文件
+
+        Returns:
+            结果目录
+        """
+        try:
+            if self._sampler is not None:
+                self._sampler.stop()
+            if self._started_tracemalloc:
+                import tracemalloc
+
+                tracemalloc.stop()
+
+            self.path.mkdir(parents=True, exist_ok=True)
+            if self.mode == "mem":
+                self._write_mem()
+            else:
+                self._write_cpu()
+        finally:
+            if self._on_finish is not None:
+                self._on_finish()
+        return self.path
+
+    def _write_cpu(self) -> None:
+        import pstats
+
+        combined = None
+        for stage in self._stage_order:
+            profile = self._profiles.get(stage)
+            if profile is None:
+                continue
+            profile.create_stats()
+            if not profile.stats:
+                # 从未成功启用的 cProfile 没有统计，pstats 无法加载
+                continue
+            filename = _stage_filename(stage)
+            profile.dump_stats(str(self.path / f"{filename}.pstats"))
+            if combined is None:
+                combined = pstats.Stats(profile)
+            else:
+                combined.add(profile)
+        if combined is not None:
+            combined.dump_stats(str(self.path / "all.pstats"))
+
+        stacks = self._sampler.collapsed() if self._sampler is not None else {}
+        self._write_collapsed(stacks)
+
+    def _write_mem(self) -> None:
+        stacks: Dict[str, Counter] = {}
+        for stage in self._stage_order:
+            allocations = self._allocations.get(stage, Counter())
+            collapsed = stacks[stage] = Counter()
+            by_line: Counter = Counter()
+            for stack, size in allocations.items():
+                labels = (_collapsed_label(f"{Path(f).name}:{n}") for f, n in stack)
+                collapsed[";".join(labels)] += size
+                by_line[stack[-1]] += size
+
+            total = sum(by_line.values())
+            lines = [f"# {stage}: {total / 1024:.1f} KiB 新分配且未释放"]
+            for (filename, lineno), size in by_line.most_common():
+                lines.append(f"{size / 1024:12.1f} KiB  {filename}:{lineno}")
+            (self.path / f"{_stage_filename(stage)}.txt").write_text(
+                "\n".join(lines) + "\n", encoding="utf-8"
+            )
+        self._write_collapsed(stacks)
+
+    def _write_collapsed(self, stacks: Dict[str, Counter]) -> None:
+        """每个阶段一个折叠栈文件，另外合并为 all.collapsed（阶段名作为根帧）"""
+        combined = []
+        for stage in self._stage_order:
+            counts = stacks.get(stage, Counter())
+            lines = [f"{stack} {count}" for stack, count in counts.most_common()]
+            root = _collapsed_label(stage)
+            combined.extend(f"{root};{line}" for line in lines)
+            (self.path / f"{_stage_filename(stage)}.collapsed").write_text(
+                "".join(line + "\n" for line in lines), encoding="utf-8"
+            )
+        (self.path / "all.collapsed").write_text(
+            "".join(line + "\n" for line in combined), encoding="utf-8"
+        )
+
+
+class Profiler:
+    """
+    性能分析配置：按采样率决定是否分析某次运行或调用
+
+    mem 模式的 tracemalloc 和 Python 3.12+ 的 cProfile 都是进程级的，cpu 和 mem 模式
+    同一时间只分析一个会话（并发的其他调用不分析；mem 模式下它们在会话期间的内存分配
+    也会被计入）。sample 模式的会话可以并发。
+    """
+
+    def __init__(
+        self,
+        mode: str,
+        output_dir: Path,
+        sample_rate: float = 1.0,
+        interval: float = DEFAULT_SAMPLE_INTERVAL,
+    ):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"不支持的分析模式: {mode}（可选 {', '.join(PROFILE_MODES)}）")
+        if not 0 < sample_rate <= 1:
+            raise ValueError(f"采样率应在 (0, 1] 之间: {sample_rate}")
+        self.mode = mode
+        self.output_dir = Path(output_dir)
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self._lock = threading.Lock()
+
+    def session(self, name: str) -> Optional[ProfileSession]:
+        """
+        按采样率创建分析会话
+
+        Args:
+            name: 会话名称（运行或工具名，用于结果目录名）
+
+        Returns:
+            分析会话，未被采样时返回 None
+        """
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return None
+        exclusive = self.mode != "sample"
+        if exclusive and not self._lock.acquire(blocking=False):
+            return None
+
+        on_finish = self._lock.release if exclusive else None
+        return ProfileSession(self.mode, self.output_dir, name, self.interval, on_finish)
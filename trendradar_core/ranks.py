@@ -0,0 +1,185 @@
+"""
+排名统计
+
+同一标题在一天内会出现在几十个快照中，保存完整的排名列表既占内存，
+合并时去重又是 O(n²)。这里用按排名计数的统计代替排名列表（大小只取决于
+出现过的最大排名），权重计算和排名显示所需的数据都可以从统计中直接得到。
+"""
+
+from array import array
+from typing import Dict, Iterable, Optional, Tuple
+
+
+# 排名直方图的初始大小（每个排名一个桶，出现更大的排名时按需扩展）
+RANK_HISTOGRAM_SIZE = 10
+
+
+class RankStats:
+    """
+    排名统计
+
+    记录首次排名、最小/最大排名、排名总和、出现次数，以及排名直方图。
+    直方图每个排名一个桶（长度不小于出现过的最大排名），权重计算所需的
+    min(rank, 10) 分布和任意阈值内的出现次数都可以精确计算；单次出现时不分配直方图。
+    """
+
+    __slots__ = ("first", "min", "max", "total", "count", "histogram")
+
+    def __init__(self, ranks: Iterable[int] = ()):
+        """
+        初始化排名统计
+
+        Args:
+            ranks: 排名序列
+        """
+        self.first = 0
+        self.min = 0
+        self.max = 0
+        self.total = 0
+        self.count = 0
+        self.histogram = None
+        for rank in ranks:
+            self.add(rank)
+
+    @staticmethod
+    def _bucket(rank: int) -> int:
+        return max(1, rank) - 1
+
+    def _ensure_histogram(self, size: int = 0) -> array:
+        """分配直方图（从单次出现升级为多次出现时），并保证至少有 size 个桶"""
+        histogram = self.histogram
+        if histogram is None:
+            histogram = self.histogram = array(
+                "I", bytes(4 * max(RANK_HISTOGRAM_SIZE, size, self._bucket(self.max) + 1))
+            )
+            if self.count:
+                histogram[self._bucket(self.min)] = self.count
+        elif len(histogram) < size:
+            histogram.extend(array("I", bytes(4 * (size - len(histogram)))))
+        return histogram
+
+    def add(self, rank: int) -> None:
+        """
+        记录一次出现
+
+        Args:
+            rank: 排名
+        """
+        if self.count == 0:
+            self.first = self.min = self.max = rank
+        else:
+            bucket = self._bucket(rank)
+            self._ensure_histogram(bucket + 1)[bucket] += 1
+            if rank < self.min:
+                self.min = rank
+            if rank > self.max:
+                self.max = rank
+        self.total += rank
+        self.count += 1
+
+    def merge(self, other: "RankStats") -> None:
+        """
+        合并另一份统计（other 视为在本统计之后出现）
+
+        Args:
+            other: 排名统计
+        """
+        if not other.count:
+            return
+        if not self.count:
+            self.first = other.first
+            self.min = other.min
+            self.max = other.max
+            self.total = other.total
+            self.count = other.count
+            self.histogram = array("I", other.histogram) if other.histogram is not None else None
+            return
+
+        if other.histogram is None:
+            bucket = self._bucket(other.min)
+            self._ensure_histogram(bucket + 1)[bucket] += other.count
+        else:
+            histogram = self._ensure_histogram(len(other.histogram))
+            for index, value in enumerate(other.histogram):
+                histogram[index] += value
+
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.total += other.total
+        self.count += other.count
+
+    def copy(self) -> "RankStats":
+        """复制统计"""
+        stats = RankStats()
+        stats.merge(self)
+        return stats
+
+    def state(self) -> Tuple[int, int, int, int, int, Optional[array]]:
+        """导出统计状态（用于持久化）"""
+        return self.first, self.min, self.max, self.total, self.count, self.histogram
+
+    @classmethod
+    def from_state(cls, state: Tuple[int, int, int, int, int, Optional[array]]) -> "RankStats":
+        """
+        从 state() 导出的状态恢复统计
+
+        Args:
+            state: 统计状态
+
+        Returns:
+            排名统计
+        """
+        stats = cls.__new__(cls)
+        stats.first, stats.min, stats.max, stats.total, stats.count, stats.histogram = state
+        return stats
+
+    @property
+    def avg(self) -> float:
+        """平均排名"""
+        return self.total / self.count if self.count else 0
+
+    def score_sum(self) -> int:
+        """排名得分总和：Σ(11 - min(rank, 10))"""
+        if self.histogram is None:
+            return (11 - min(self.min, 10)) * self.count
+        return sum(
+            (11 - min(index + 1, 10)) * value
+            for index, value in enumerate(self.histogram)
+        )
+
+    def within(self, threshold: int) -> int:
+        """
+        排名不超过阈值的出现次数
+
+        Args:
+            threshold: 排名阈值
+
+        Returns:
+            出现次数
+        """
+        if self.max <= threshold:
+            return self.count
+        if self.min > threshold:
+            return 0
+        # 走到这里说明出现过两种以上排名，直方图一定存在
+        return sum(self.histogram[:threshold])
+
+    def __len__(self) -> int:
+        return self.count
+
+    def to_dict(self) -> Dict:
+        """转换为字典（JSON 输出边界使用）"""
+        return {
+            "first": self.first,
+            "min": self.min,
+            "max": self.max,
+            "avg": round(self.avg, 2),
+            "count": self.count,
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"RankStats(first={self.first}, min={self.min}, max={self.max}, "
+            f"total={self.total}, count={self.count})"
+        )
+
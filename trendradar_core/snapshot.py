@@ -0,0 +1,369 @@
+"""
+快照 txt 文件解析
+
+快照文件由爬虫写入 output/<日期>/txt/HH时MM分.txt，格式为：
+
+    平台ID | 平台名称
+    1. 标题 [URL:链接] [MOBILE:移动端链接]
+    2. 标题
+    <空行>
+    平台ID
+    ...
+    <空行>
+    ==== 以下ID请求失败 ====
+    平台ID
+
+每天的 txt 目录下另有最新快照指针 latest.json（见 update_latest_pointer），
+记录最新写入的快照和每个平台最近一次成功爬取所在的快照。
+
+解析按行流式进行：小文件直接逐行读取，大文件通过 mmap 逐行扫描，
+不会一次性把整个文件读入内存再切分。每行标题只做一次 partition
+和两次 rpartition，记录在迭代时逐条产生。
+"""
+
+import io
+import json
+import mmap
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from .text import clean_title, intern_text
+
+
+# 请求失败的平台列表从这一行开始，直到下一个空行
+FAILED_SECTION_MARKER = "==== 以下ID请求失败 ===="
+
+# 最新快照指针文件（位于 output/<日期>/txt/ 下，由爬虫和 MCP 的 trigger_crawl 在保存快照时更新）
+LATEST_POINTER_FILE = "latest.json"
+
+# 超过此大小的文件使用 mmap 扫描
+MMAP_THRESHOLD = 1024 * 1024
+
+
+class SnapshotRecord(NamedTuple):
+    """快照中的一条标题"""
+
+    section: int
+    source_id: str
+    source_name: str
+    title: str
+    rank: int
+    url: str
+    mobile_url: str
+
+
+@contextmanager
+def _open_lines(file_path: Union[str, Path]) -> Iterator[Iterable[str]]:
+    """
+    打开快照文件用于逐行读取（行内容保留行尾换行符）
+
+    Args:
+        file_path: 快照文件路径
+
+    Yields:
+        可迭代的行序列
+    """
+    if os.path.getsize(file_path) >= MMAP_THRESHOLD:
+        with open(file_path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                yield (raw.decode("utf-8") for raw in iter(mm.readline, b""))
+        return
+
+    with open(file_path, "r", encoding="utf-8") as f:
+        yield f
+
+
+def iter_snapshot_lines(file_path: Union[str, Path]) -> Iterator[str]:
+    """
+    逐行读取快照文件（去掉行尾换行符）
+
+    Args:
+        file_path: 快照文件路径
+
+    Yields:
+        行内容
+    """
+    with _open_lines(file_path) as lines:
+        for line in lines:
+            yield line.rstrip("\r\n")
+
+
+def parse_title_line(line: str) -> Tuple[str, Optional[int], str, str]:
+    """
+    解析一行标题："排名. 标题 [URL:链接] [MOBILE:移动端链接]"
+
+    Args:
+        line: 已去掉首尾空白的行
+
+    Returns:
+        (title, rank, url, mobile_url)，没有排名时 rank 为 None
+    """
+    rank = None
+    head, sep, rest = line.partition(". ")
+    if sep and head.isdecimal():
+        rank = int(head)
+        line = rest
+
+    mobile_url = ""
+    if " [MOBILE:" in line:
+        line, _, mobile_part = line.rpartition(" [MOBILE:")
+        if mobile_part.endswith("]"):
+            mobile_url = mobile_part[:-1]
+
+    url = ""
+    if " [URL:" in line:
+        line, _, url_part = line.rpartition(" [URL:")
+        if url_part.endswith("]"):
+            url = url_part[:-1]
+
+    return clean_title(line.strip()), rank, url, mobile_url
+
+
+def _scan(file_path: Union[str, Path]) -> Iterator[Tuple]:
+    """扫描快照文件，逐条产生 (section, source_id, source_name, title, rank, url, mobile_url)"""
+    with _open_lines(file_path) as lines:
+        yield from _scan_lines(lines)
+
+
+def _scan_lines(lines: Iterable[str]) -> Iterator[Tuple]:
+    """
+    扫描快照内容（行保留行尾换行符），逐条产生 (section, source_id, source_name, title, rank, url, mobile_url)
+
+    与 parse_title_line 的解析规则相同，但内联在循环中以避免逐行的函数调用开销。
+    """
+    section = 0
+    source_id = None
+    source_name = ""
+    skipping = False
+
+    for line in lines:
+        if line == "\n" or line == "\r\n":
+            # 空行：段落结束（只含空格的行不结束段落）
+            source_id = None
+            skipping = False
+            continue
+
+        if skipping:
+            continue
+
+        line = line.strip()
+        if not line:
+            continue
+
+        if FAILED_SECTION_MARKER in line:
+            skipping = True
+            continue
+
+        if source_id is None:
+            section += 1
+            if " | " in line:
+                id_part, _, name_part = line.partition(" | ")
+                source_id = intern_text(id_part.strip())
+                source_name = name_part.strip()
+            else:
+                source_id = intern_text(line)
+                source_name = source_id
+            continue
+
+        rank = 1
+        head, sep, rest = line.partition(". ")
+        if sep and head.isdecimal():
+            rank = int(head)
+            line = rest
+
+        mobile_url = ""
+        if " [MOBILE:" in line:
+            line, _, mobile_part = line.rpartition(" [MOBILE:")
+            if mobile_part.endswith("]"):
+                mobile_url = mobile_part[:-1]
+
+        url = ""
+        if " [URL:" in line:
+            line, _, url_part = line.rpartition(" [URL:")
+            if url_part.endswith("]"):
+                url = url_part[:-1]
+
+        yield section, source_id, source_name, clean_title(line), rank, url, mobile_url
+
+
+def iter_snapshot_records(file_path: Union[str, Path]) -> Iterator[SnapshotRecord]:
+    """
+    流式解析快照文件
+
+    空行分隔平台段落，段落的第一行是 "平台ID | 平台名称" 或 "平台ID"，
+    其余非空行是标题。失败平台列表中的内容会被跳过。没有排名的标题按排名1处理。
+
+    Args:
+        file_path: 快照文件路径
+
+    Yields:
+        SnapshotRecord，section 为平台段落序号（同一文件中同一平台出现多个段落时，以后一个为准）
+    """
+    return map(SnapshotRecord._make, _scan(file_path))
+
+
+def read_snapshot_records(file_path: Union[str, Path]) -> List[Tuple]:
+    """
+    读取快照文件的全部记录（普通元组，便于在工作进程中解析后传回）
+
+    Args:
+        file_path: 快照文件路径
+
+    Returns:
+        [(section, source_id, source_name, title, rank, url, mobile_url), ...]
+    """
+    return list(_scan(file_path))
+
+
+def read_snapshot_text_records(text: str) -> List[Tuple]:
+    """
+    解析快照内容（尚未写入文件的段落，如爬取时逐个平台写入的快照）
+
+    Args:
+        text: 快照文本，规则与快照文件相同
+
+    Returns:
+        [(section, source_id, source_name, title, rank, url, mobile_url), ...]
+    """
+    return list(_scan_lines(io.StringIO(text, newline=None)))
+
+
+def read_failed_ids(file_path: Union[str, Path]) -> List[str]:
+    """
+    读取快照文件末尾的请求失败平台列表
+
+    Args:
+        file_path: 快照文件路径
+
+    Returns:
+        请求失败的平台ID列表（按文件中的顺序）
+    """
+    failed_ids = []
+    in_section = False
+    for line in iter_snapshot_lines(file_path):
+        if FAILED_SECTION_MARKER in line:
+            in_section = True
+            continue
+        if in_section:
+            if not line.strip():
+                break
+            failed_ids.append(line.strip())
+    return failed_ids
+
+
+def build_snapshot(
+    records: Iterable[Tuple],
+    item_factory: Callable[[Tuple[int], str, str], object]
+) -> Tuple[Dict[str, Dict[str, object]], Dict[str, str]]:
+    """
+    将快照记录按平台分组为标题字典
+
+    Args:
+        records: 快照记录（iter_snapshot_records / read_snapshot_records 的结果）
+        item_factory: 条目构造函数，参数为 (ranks, url, mobile_url)
+
+    Returns:
+        (titles_by_id, id_to_name) 元组
+        - titles_by_id: {platform_id: {title: item}}
+        - id_to_name: {platform_id: platform_name}
+    """
+    titles_by_id = {}
+    id_to_name = {}
+    current_section = 0
+    titles = None
+
+    for section, source_id, source_name, title, rank, url, mobile_url in records:
+        if section != current_section:
+            current_section = section
+            # 在其他进程中解析的记录需要重新驻留平台ID
+            source_id = intern_text(source_id)
+            titles = titles_by_id[source_id] = {}
+            id_to_name[source_id] = source_name
+
+        titles[title] = item_factory((rank,), url, mobile_url)
+
+    return titles_by_id, id_to_name
+
+
+def parse_snapshot(
+    file_path: Union[str, Path],
+    item_factory: Callable[[Tuple[int], str, str], object]
+) -> Tuple[Dict[str, Dict[str, object]], Dict[str, str]]:
+    """
+    解析快照文件为按平台分组的标题字典
+
+    Args:
+        file_path: 快照文件路径
+        item_factory: 条目构造函数，参数为 (ranks, url, mobile_url)
+
+    Returns:
+        (titles_by_id, id_to_name) 元组
+        - titles_by_id: {platform_id: {title: item}}
+        - id_to_name: {platform_id: platform_name}
+    """
+    return build_snapshot(_scan(file_path), item_factory)
+
+
+def read_latest_pointer(txt_dir: Union[str, Path]) -> Optional[Dict]:
+    """
+    读取当天的最新快照指针
+
+    Args:
+        txt_dir: 当天的 txt 目录
+
+    Returns:
+        指针字典 {snapshot, platforms, updated_at}，不存在或格式错误时返回 None
+    """
+    try:
+        with open(Path(txt_dir) / LATEST_POINTER_FILE, "r", encoding="utf-8") as f:
+            pointer = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(pointer, dict) or not isinstance(pointer.get("platforms"), dict):
+        return None
+    return pointer
+
+
+def update_latest_pointer(
+    txt_dir: Union[str, Path],
+    snapshot_name: str,
+    platform_ids: List[str],
+    updated_at: str
+) -> None:
+    """
+    更新当天的最新快照指针
+
+    指针记录最新写入的快照文件，以及每个平台最近一次成功爬取所在的快照，
+    这样只爬取部分平台的手动任务不会让其他平台的最新数据“消失”。
+
+    Args:
+        txt_dir: 当天的 txt 目录
+        snapshot_name: 快照文件名，如 "12时30分.txt"
+        platform_ids: 本次快照中包含的平台ID列表
+        updated_at: 更新时间字符串
+
+    Raises:
+        OSError: 写入失败
+    """
+    pointer_path = Path(txt_dir) / LATEST_POINTER_FILE
+
+    pointer = read_latest_pointer(txt_dir)
+    platforms = pointer["platforms"] if pointer is not None else {}
+
+    for platform_id in platform_ids:
+        platforms[platform_id] = snapshot_name
+
+    pointer = {
+        "snapshot": snapshot_name,
+        "platforms": platforms,
+        "updated_at": updated_at,
+    }
+
+    # 先写临时文件再替换，避免读取方看到写了一半的指针
+    tmp_path = pointer_path.with_name(f".{LATEST_POINTER_FILE}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(pointer, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, pointer_path)
@@ -0,0 +1,41 @@
+"""
+文本工具
+"""
+
+import re
+import sys
+
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def clean_title(title: str) -> str:
+    """
+    清理标题：合并连续空白为一个空格并去掉首尾空白
+
+    Args:
+        title: 原始标题
+
+    Returns:
+        清理后的标题
+    """
+    if not isinstance(title, str):
+        title = str(title)
+    # 绝大多数标题不含多余空白，跳过替换
+    # （空格以外的空白字符都不是可打印字符，isprintable() 为 False 时才需要检查）
+    if "  " in title or not title.isprintable():
+        title = _WHITESPACE.sub(" ", title)
+    return title.strip()
+
+
+def intern_text(text: str) -> str:
+    """
+    驻留字符串（空字符串直接返回），相同的平台ID和链接只保存一份
+
+    Args:
+        text: 字符串
+
+    Returns:
+        驻留后的字符串
+    """
+    return sys.intern(text) if text else ""